@@ -1,6 +1,11 @@
+from functools import lru_cache
+from typing import Optional
+
 from django.contrib import admin, messages
+from django.contrib.admin.utils import quote
+from django.db.models import prefetch_related_objects
 from django.http import HttpResponseRedirect
-from django.urls import reverse
+from django.urls import NoReverseMatch, reverse
 from django.utils import timezone
 from django.utils.html import format_html
 
@@ -21,6 +26,7 @@ from .models import (
     FAQ,
     Report,
     MediaLibrary,
+    MediaVariant,
     Comment,
 )
 
@@ -134,80 +140,175 @@ class FAQAdmin(admin.ModelAdmin):
     list_per_page = 25
 
 
-@admin.register(Report)
-class ReportAdmin(admin.ModelAdmin):
+OBJECT_ID_PLACEHOLDER = "__object_id__"
+
+
+@lru_cache(maxsize=None)
+def get_change_url_pattern(app_label: str, model_name: str) -> Optional[str]:
     """
-    The Admin View for the Report Model, including a link to the referenced object in the admin.
+    Return the admin change URL of a model with a placeholder for the object id.
+
+    The URL is reversed once per model and process, so changelists can build a link
+    for every row without resolving the URLconf each time.
+
+    Args:
+        app_label (str): The app label of the model.
+        model_name (str): The lowercase model name.
+
+    Returns:
+        Optional[str]: The URL containing OBJECT_ID_PLACEHOLDER, or None if the model is
+            not registered in the admin.
     """
+    try:
+        return reverse(
+            f"admin:{app_label}_{model_name}_change", args=[OBJECT_ID_PLACEHOLDER]
+        )
+    except NoReverseMatch:
+        return None
 
-    readonly_fields = ["content_object_link"]
-    list_display = ["reporter", "content_object_link", "created"]
-    list_filter = ["content_type"]
-    sortable_by = ["created"]
 
+class ContentObjectLinkMixin:
+    """
+    Show a link to the admin page of each row's generic `content_object`.
+
+    The content objects of a changelist page are prefetched with one query per content
+    type instead of one query per row. Rows whose content type has no model anymore,
+    e.g. of an uninstalled app, are left out, as their objects can't be loaded.
+    """
+
+    def get_changelist_instance(self, request):
+        """
+        Prefetch the content objects the links of the page point to.
+        """
+        changelist = super().get_changelist_instance(request)
+        prefetch_related_objects(
+            [
+                row
+                for row in changelist.result_list
+                if row.content_type.model_class() is not None
+            ],
+            "content_object",
+        )
+        return changelist
+
+    @admin.display(description="Object Link")
     def content_object_link(self, obj):
         """
         Returns an HTML link to the admin page for the content_object, if it exists.
 
         Args:
-            obj: The Report instance.
+            obj: The instance with a content_object.
 
         Returns:
             SafeString: An HTML string that represents a link to the content_object's admin page.
         """
+        if obj.content_type.model_class() is None:
+            return "Object does not exist"
         content_object = obj.content_object
         if not content_object:
             return "Object does not exist"
 
-        # Get the admin URL for the content_object
-        app_label = content_object._meta.app_label
-        model_name = content_object._meta.model_name
-        view_name = f"admin:{app_label}_{model_name}_change"
-        link_url = reverse(view_name, args=[content_object.pk])
+        pattern = get_change_url_pattern(
+            content_object._meta.app_label, content_object._meta.model_name
+        )
+        if pattern is None:
+            return str(content_object)
 
+        link_url = pattern.replace(OBJECT_ID_PLACEHOLDER, quote(str(content_object.pk)))
         return format_html('<a href="{}">{}</a>', link_url, str(content_object))
 
-    content_object_link.short_description = "Object Link"
-
 
-@admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+@admin.register(Report)
+class ReportAdmin(ContentObjectLinkMixin, admin.ModelAdmin):
     """
-    The Admin view for the comment model
+    The Admin View for the Report Model, including a link to the referenced object in the admin.
     """
 
     readonly_fields = ["content_object_link"]
-    list_display = ["user", "content_object_link", "created"]
+    list_display = ["reporter", "content_object_link", "created"]
+    list_filter = ["content_type"]
+    list_select_related = ["reporter"]
+    sortable_by = ["created"]
+    actions = ["deactivate_targets", "dismiss_reports"]
 
-    def content_object_link(self, obj):
+    @admin.action(description="Deactivate the reported objects")
+    def deactivate_targets(self, request, queryset):
         """
-        Returns an HTML link to the admin page for the content_object, if it exists.
-
-        Args:
-            obj: The Comment instance.
+        Deactivate the objects of the selected reports with one UPDATE per model.
+        """
+        count = queryset.deactivate_targets()
+        self.message_user(request, f"Deactivated {count} objects.", messages.SUCCESS)
 
-        Returns:
-            SafeString: An HTML string that represents a link to the content_object's admin page.
+    @admin.action(description="Dismiss the selected reports")
+    def dismiss_reports(self, request, queryset):
         """
-        content_object = obj.content_object
-        if not content_object:
-            return "Object does not exist"
+        Delete the selected reports, removing them from their objects' reports_count.
+        """
+        count = queryset.dismiss()
+        self.message_user(request, f"Dismissed {count} reports.", messages.SUCCESS)
 
-        # Get the admin URL for the content_object
-        app_label = content_object._meta.app_label
-        model_name = content_object._meta.model_name
-        view_name = f"admin:{app_label}_{model_name}_change"
-        link_url = reverse(view_name, args=[content_object.pk])
 
-        return format_html('<a href="{}">{}</a>', link_url, str(content_object))
+@admin.register(Comment)
+class CommentAdmin(ContentObjectLinkMixin, admin.ModelAdmin):
+    """
+    The Admin view for the comment model
+    """
 
-    content_object_link.short_description = "Object Link"
+    readonly_fields = ["content_object_link", "moderated_at"]
+    list_display = ["user", "content_object_link", "reports_count", "created"]
+    list_select_related = ["user"]
+    actions = ["deactivate_comments", "activate_comments"]
+
+    def save_model(self, request, obj, form, change):
+        """
+        Save the comment, recording the moderation decision when it is reactivated so
+        the reports filed so far don't deactivate it again.
+        """
+        if change and obj.active and "active" in form.changed_data:
+            obj.moderated_at = timezone.now()
+        super().save_model(request, obj, form, change)
+
+    @admin.action(description="Deactivate the selected comments")
+    def deactivate_comments(self, request, queryset):
+        """
+        Deactivate the selected comments with a single UPDATE.
+        """
+        count = queryset.filter(active=True).update(active=False)
+        self.message_user(request, f"Deactivated {count} comments.", messages.SUCCESS)
+
+    @admin.action(description="Reactivate the selected comments")
+    def activate_comments(self, request, queryset):
+        """
+        Reactivate the selected comments with a single UPDATE, see
+        ReportableObject.activate.
+        """
+        count = queryset.filter(active=False).update(
+            active=True, moderated_at=timezone.now()
+        )
+        self.message_user(request, f"Reactivated {count} comments.", messages.SUCCESS)
 
 
 @admin.register(MediaLibrary)
 class MediaLibraryAdmin(admin.ModelAdmin):
     """The admin view for the media library"""
 
-    list_display = ["id", "file", "content_type", "created"]
+    list_display = [
+        "id",
+        "file",
+        "file_width",
+        "file_height",
+        "file_size",
+        "content_type",
+        "created",
+    ]
     list_filter = ["content_type", "created"]
     search_fields = ["file"]
+
+
+@admin.register(MediaVariant)
+class MediaVariantAdmin(admin.ModelAdmin):
+    """The admin view for the resized variants of media files"""
+
+    list_display = ["source", "name", "format", "width", "height", "size"]
+    list_filter = ["name", "format"]
+    search_fields = ["source"]
@@ -0,0 +1,367 @@
+import hashlib
+import math
+import random
+import time
+import uuid
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Iterable, List, Optional, Set, Tuple, Type, Union
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache, caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpRequest, HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+# A cached entry is stored as (value, seconds it took to compute, unix time it expires at)
+Entry = Tuple[Any, float, float]
+
+# Values that depend on tracked models are invalidated by version, so they can be kept long
+CACHE_DEPENDENT_TIMEOUT = 60 * 60 * 24 * 7
+
+# Models whose saves and deletes bump their cache version, see track_models
+_tracked_models: Set[Type[models.Model]] = set()
+
+
+def get_or_set(
+    key: str,
+    default: Callable[[], Any],
+    timeout: Union[int, Callable[[Any], int]],
+    *,
+    local: bool = True,
+    depends_on: Iterable[Type[models.Model]] = (),
+) -> Any:
+    """
+    Get a value from the cache, computing and storing it if it is missing.
+
+    Protects expensive values from cache stampedes in two ways:
+
+    - Only the process holding a short lock in the shared cache recomputes a missing value,
+      the others wait for it to appear instead of all hitting the database at once.
+    - Values are recomputed early with a probability that grows as their expiry gets closer
+      and with how long they took to compute (XFetch), so a popular key is usually
+      refreshed by a single request before it ever expires. CACHE_EARLY_REFRESH_BETA sets
+      how eagerly, 0 disables early refreshes.
+
+    Processes waiting for the lock holder give up after CACHE_LOCK_WAIT_TIMEOUT seconds and
+    compute the value themselves, so a slow computation never blocks a worker for long.
+
+    With `local`, values are also kept in the per-process "local" cache for at most
+    CACHE_LOCAL_TIMEOUT seconds, so hot keys do not need a round trip to the shared cache.
+
+    With `depends_on`, the current cache version of each model is added to the key, so
+    saving or deleting a row of any of them makes the next call recompute the value. Such
+    values can use long timeouts without ever being served stale.
+
+    Args:
+        key (str): The cache key.
+        default (Callable[[], Any]): Computes the value when it is missing or due a refresh.
+        timeout (Union[int, Callable[[Any], int]]): How many seconds the value is kept in
+            the shared cache, or a function returning it for the computed value, e.g. to
+            keep empty results for less time.
+        local (bool): Whether to also keep the value in the per-process cache.
+        depends_on (Iterable[Type[Model]]): Models the value is built from. They must be
+            registered with track_models.
+
+    Returns:
+        Any: The cached or freshly computed value.
+    """
+    depends_on = list(depends_on)
+    if depends_on:
+        key = ":".join([key, *get_versions(depends_on)])
+
+    local_cache = caches["local"] if local else None
+
+    entry = local_cache.get(key) if local_cache else None
+    if entry is None:
+        entry = cache.get(key)
+        if entry is not None and local_cache:
+            _set_local(local_cache, key, entry)
+
+    if entry is not None:
+        value, delta, expiry = entry
+        if _should_refresh_early(delta, expiry) and _acquire_lock(key):
+            return _recompute(key, default, timeout, local_cache)
+        return value
+
+    if _acquire_lock(key):
+        return _recompute(key, default, timeout, local_cache)
+
+    entry = _wait_for(key)
+    if entry is not None:
+        return entry[0]
+    # The process holding the lock is taking too long, compute the value here instead
+    return default()
+
+
+def delete(key: str) -> None:
+    """
+    Delete a key set by get_or_set from the shared cache and this process's local cache.
+
+    Other processes keep serving their local copy for up to CACHE_LOCAL_TIMEOUT seconds.
+
+    Args:
+        key (str): The cache key.
+    """
+    cache.delete(key)
+    caches["local"].delete(key)
+
+
+def track_models(*tracked_models: Type[models.Model]) -> None:
+    """
+    Bump the cache version of each model whenever one of its rows is saved or deleted.
+
+    Called when the models are defined, so every process, including the ones that only
+    write, keeps the versions up to date. Bulk operations that skip model signals, such as
+    QuerySet.update(), must call bump_version themselves.
+
+    Args:
+        *tracked_models (Type[Model]): The models to track.
+    """
+    for model in tracked_models:
+        label = model._meta.label_lower
+        post_save.connect(
+            _schedule_bump, sender=model, dispatch_uid=f"cache_version_save_{label}"
+        )
+        post_delete.connect(
+            _schedule_bump, sender=model, dispatch_uid=f"cache_version_delete_{label}"
+        )
+        _tracked_models.add(model)
+
+
+def version_key(model: Type[models.Model]) -> str:
+    """
+    Return the cache key holding the current cache version of a model.
+    """
+    return f"cache:version:{model._meta.label_lower}"
+
+
+def bump_version(model: Type[models.Model]) -> None:
+    """
+    Give a model a new cache version, invalidating every value that depends on it.
+
+    Args:
+        model (Type[Model]): The model whose rows changed.
+    """
+    cache.set(version_key(model), uuid.uuid4().hex, None)
+
+
+def get_versions(dependencies: List[Type[models.Model]]) -> List[str]:
+    """
+    Return the current cache version of each model, creating the missing ones.
+
+    Args:
+        dependencies (List[Type[Model]]): Models registered with track_models.
+
+    Returns:
+        List[str]: The version tokens, in the same order as the models.
+
+    Raises:
+        ImproperlyConfigured: If a model is not tracked, as its version would never change.
+    """
+    untracked = [model for model in dependencies if model not in _tracked_models]
+    if untracked:
+        raise ImproperlyConfigured(
+            f"{untracked[0]._meta.label} must be registered with track_models "
+            "before values can depend on it."
+        )
+
+    keys = [version_key(model) for model in dependencies]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Another process may create the version at the same time, so keep whichever won
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def _schedule_bump(sender: Type[models.Model], **kwargs) -> None:
+    """
+    Bump the sender's version once the current transaction commits, so no other process
+    can cache the old rows under the new version.
+    """
+    transaction.on_commit(lambda: bump_version(sender))
+
+
+def cache_anonymous_page(
+    *depends_on: Type[models.Model],
+    last_modified: Optional[Callable[[], Optional[datetime]]] = None,
+):
+    """
+    Decorator caching the full response of a view for anonymous visitors.
+
+    Cached pages are served without running the view, with an ETag and, when
+    `last_modified` is given, a Last-Modified header, so repeat visits with
+    If-None-Match or If-Modified-Since get a 304. The key includes the cache version of
+    every model in `depends_on`, which must be registered with track_models, so saving
+    one of them in the admin purges the page.
+
+    Authenticated users, HTMX requests, requests with a query string or pending messages
+    and responses that are not a plain 200 or that use a CSRF token are never cached.
+
+    Args:
+        *depends_on (Type[Model]): The models whose rows are shown on the page, including
+            the ones shown by the layout.
+        last_modified (Optional[Callable[[], Optional[datetime]]]): Returns when the page
+            content last changed. Only called when the page is rendered.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+            if not _is_cacheable_request(request):
+                return view_func(request, *args, **kwargs)
+
+            key = _page_key(request, depends_on)
+            entry = cache.get(key)
+            if entry is None:
+                response = view_func(request, *args, **kwargs)
+                if not _is_cacheable_response(request, response):
+                    return response
+
+                modified = last_modified() if last_modified else None
+                entry = {
+                    "content": response.content,
+                    "content_type": response["Content-Type"],
+                    "etag": quote_etag(
+                        hashlib.md5(response.content, usedforsecurity=False).hexdigest()
+                    ),
+                    "last_modified": int(modified.timestamp()) if modified else None,
+                }
+                cache.set(key, entry, settings.PAGE_CACHE_TIMEOUT)
+
+            response = HttpResponse(
+                entry["content"], content_type=entry["content_type"]
+            )
+            response["ETag"] = entry["etag"]
+            if entry["last_modified"] is not None:
+                response["Last-Modified"] = http_date(entry["last_modified"])
+            return get_conditional_response(
+                request,
+                etag=entry["etag"],
+                last_modified=entry["last_modified"],
+                response=response,
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def _is_cacheable_request(request: HttpRequest) -> bool:
+    """
+    Check whether a request may be answered with a shared, cached page.
+    """
+    return (
+        request.method in ("GET", "HEAD")
+        and not request.user.is_authenticated
+        and not getattr(request, "htmx", False)
+        # Every distinct query string would get its own entry, so arbitrary ones could
+        # fill the cache. Cached pages don't read their query string anyway.
+        and not request.GET
+        and not get_messages(request)
+    )
+
+
+def _is_cacheable_response(request: HttpRequest, response: HttpResponse) -> bool:
+    """
+    Check whether a rendered response is the same for every anonymous visitor.
+    """
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        # Set when the page rendered a CSRF token, which is unique per visitor
+        and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+    )
+
+
+def _page_key(request: HttpRequest, depends_on: Iterable[Type[models.Model]]) -> str:
+    """
+    Return the cache key of a page for the current model versions.
+    """
+    parts = [
+        request.path,
+        str(settings.VERSION),
+        str(translation.get_language()),
+        *get_versions(list(depends_on)),
+    ]
+    digest = hashlib.md5(":".join(parts).encode(), usedforsecurity=False).hexdigest()
+    return f"page:{digest}"
+
+
+def _lock_key(key: str) -> str:
+    """
+    Return the key of the lock guarding the recomputation of a cache key.
+    """
+    return f"{key}:lock"
+
+
+def _acquire_lock(key: str) -> bool:
+    """
+    Try to take the recomputation lock of a key in the shared cache.
+    """
+    return cache.add(_lock_key(key), True, settings.CACHE_LOCK_TIMEOUT)
+
+
+def _recompute(
+    key: str,
+    default: Callable[[], Any],
+    timeout: Union[int, Callable[[Any], int]],
+    local_cache,
+) -> Any:
+    """
+    Compute and store a value, then release the lock. Must be called while holding it.
+    """
+    try:
+        start = time.monotonic()
+        value = default()
+        if callable(timeout):
+            timeout = timeout(value)
+        entry = (value, time.monotonic() - start, time.time() + timeout)
+        cache.set(key, entry, timeout)
+        if local_cache:
+            _set_local(local_cache, key, entry)
+        return value
+    finally:
+        cache.delete(_lock_key(key))
+
+
+def _set_local(local_cache, key: str, entry: Entry) -> None:
+    """
+    Store an entry in the local cache without outliving its expiry in the shared cache.
+    """
+    remaining = entry[2] - time.time()
+    local_timeout = min(settings.CACHE_LOCAL_TIMEOUT, remaining)
+    if local_timeout > 0:
+        local_cache.set(key, entry, local_timeout)
+
+
+def _should_refresh_early(delta: float, expiry: float) -> bool:
+    """
+    Decide whether to recompute a value before it expires, using the XFetch algorithm.
+    """
+    beta = settings.CACHE_EARLY_REFRESH_BETA
+    # 1 - random() is in (0, 1], so the log is always defined and never positive
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expiry
+
+
+def _wait_for(key: str) -> Optional[Entry]:
+    """
+    Poll the shared cache for a value another process is computing, for at most
+    CACHE_LOCK_WAIT_TIMEOUT seconds.
+    """
+    wait = min(settings.CACHE_LOCK_WAIT_TIMEOUT, settings.CACHE_LOCK_TIMEOUT)
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
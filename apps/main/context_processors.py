@@ -1,5 +1,12 @@
+from apps.main.models import Notification
+
+
 def notifications(request):
-    """A context processor that provides the user's notifications to all templates."""
+    """A context processor that provides the user's unread notifications to all templates."""
     if request.user.is_authenticated:
-        return {"notifications": request.user.notifications.filter(is_read=False)}
+        summary = Notification.objects.get_unread_summary(request.user.pk)
+        return {
+            "notifications": summary["items"],
+            "unread_notification_count": summary["count"],
+        }
     return {}
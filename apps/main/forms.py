@@ -1,5 +1,7 @@
-from django_ckeditor_5.widgets import CKEditor5Widget as CKEditorWidget
+from django_ckeditor_5.widgets import CKEditor5Widget
 from django import forms
+from django.conf import settings
+from django.urls import reverse
 from django.core.validators import MinLengthValidator, EmailValidator
 from django_recaptcha.fields import ReCaptchaField
 from django_recaptcha.widgets import ReCaptchaV2Invisible
@@ -13,6 +15,35 @@ from .models import (
     Contact,
     FAQ,
 )
+from .uploads import DIRECT_UPLOAD_CONTENT_TYPES
+
+
+class CKEditorWidget(CKEditor5Widget):
+    """
+    The CKEditor 5 widget, uploading images straight to object storage when
+    CKEDITOR_DIRECT_UPLOADS is enabled.
+    """
+
+    @property
+    def media(self) -> forms.Media:
+        """
+        The editor's assets, with the direct upload adapter when it is enabled.
+
+        Built from the editor's Media definition, as the media property of widgets is
+        generated by their metaclass.
+        """
+        media = forms.Media(CKEditor5Widget.Media)
+        if settings.CKEDITOR_DIRECT_UPLOADS:
+            media += forms.Media(js=["js/ckeditor_direct_upload.js"])
+        return media
+
+    def get_context(self, name, value, attrs) -> dict:
+        context = super().get_context(name, value, attrs)
+        if settings.CKEDITOR_DIRECT_UPLOADS:
+            context["widget"]["attrs"]["data-direct-upload-url"] = reverse(
+                "ckeditor_upload_presign"
+            )
+        return context
 
 
 class NotificationAdminForm(forms.ModelForm):
@@ -144,3 +175,41 @@ class ReportForm(forms.Form):
         required=True,
         label="Reason for reporting",
     )
+
+
+class DirectUploadForm(forms.Form):
+    """
+    Form for the file a browser asks to upload straight to object storage.
+
+    Attributes:
+        name (CharField): The name of the file on the user's device.
+        content_type (CharField): The MIME type of the file, one of
+            DIRECT_UPLOAD_CONTENT_TYPES.
+        size (IntegerField): The size of the file in bytes.
+    """
+
+    name = forms.CharField(max_length=255)
+    content_type = forms.CharField(max_length=100)
+    size = forms.IntegerField(min_value=1)
+
+    def clean_content_type(self) -> str:
+        """
+        Only accept raster images.
+        """
+        content_type = self.cleaned_data["content_type"]
+        if content_type not in DIRECT_UPLOAD_CONTENT_TYPES:
+            raise forms.ValidationError(
+                "Only JPEG, PNG, GIF, WebP and AVIF images can be uploaded."
+            )
+        return content_type
+
+    def clean_size(self) -> int:
+        """
+        Reject files larger than DIRECT_UPLOAD_MAX_SIZE.
+        """
+        size = self.cleaned_data["size"]
+        if size > settings.DIRECT_UPLOAD_MAX_SIZE:
+            raise forms.ValidationError(
+                f"Files can be at most {settings.DIRECT_UPLOAD_MAX_SIZE} bytes."
+            )
+        return size
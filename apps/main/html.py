@@ -0,0 +1,101 @@
+import re
+from typing import List, Optional
+
+import nh3
+
+# Attributes CKEditor adds for image styles, tables and alignment, on top of nh3's defaults
+ALLOWED_ATTRIBUTES = {
+    **nh3.ALLOWED_ATTRIBUTES,
+    "*": {"class"},
+    "img": {*nh3.ALLOWED_ATTRIBUTES.get("img", set()), "width", "height", "srcset"},
+    "a": {*nh3.ALLOWED_ATTRIBUTES.get("a", set()), "target"},
+}
+
+# Whitespace is significant inside these tags, so it is kept as is
+PRESERVED_BLOCK = re.compile(r"(<(pre|textarea)\b.*?</\2>)", re.IGNORECASE | re.DOTALL)
+WHITESPACE = re.compile(r"\s+")
+
+
+def sanitize_html(html: str) -> str:
+    """
+    Remove scripts, event handlers and any markup CKEditor does not produce.
+
+    Args:
+        html (str): Untrusted HTML, e.g. from a CKEditor field.
+
+    Returns:
+        str: HTML that is safe to output without escaping.
+    """
+    return nh3.clean(html, attributes=ALLOWED_ATTRIBUTES)
+
+
+def minify_html(html: str) -> str:
+    """
+    Collapse runs of whitespace to a single space, except inside <pre> and <textarea>.
+
+    Args:
+        html (str): The HTML to minify.
+
+    Returns:
+        str: The minified HTML, which renders the same.
+    """
+    parts = PRESERVED_BLOCK.split(html)
+    # split() returns the text around each match, the match and its tag name group
+    minified = []
+    for index in range(0, len(parts), 3):
+        minified.append(WHITESPACE.sub(" ", parts[index]))
+        if index + 1 < len(parts):
+            minified.append(parts[index + 1])
+    return "".join(minified).strip()
+
+
+def render_html(html: str) -> str:
+    """
+    Sanitize and minify HTML so it can be stored and output as is.
+
+    Args:
+        html (str): Untrusted HTML.
+
+    Returns:
+        str: The sanitized, minified HTML.
+    """
+    return minify_html(sanitize_html(html or ""))
+
+
+class RenderedHTMLMixin:
+    """
+    A mixin that stores a sanitized, minified copy of HTML fields when the model is saved.
+
+    Every field listed in `html_fields` needs a `<field>_html` companion field, which
+    templates output with `|safe` instead of the raw field, so pages never sanitize on
+    each request. Bulk operations that skip save(), such as bulk_create(), must call
+    render_html_fields first, and update() must set the copies with render_html.
+    """
+
+    html_fields: List[str] = []
+
+    def save(self, *args, **kwargs) -> None:
+        """
+        Render the HTML fields being saved, then save the model instance.
+        """
+        update_fields = kwargs.get("update_fields")
+        fields = self.html_fields
+        if update_fields is not None:
+            fields = [field for field in fields if field in update_fields]
+            kwargs["update_fields"] = {
+                *update_fields,
+                *(f"{field}_html" for field in fields),
+            }
+
+        self.render_html_fields(fields)
+        super().save(*args, **kwargs)
+
+    def render_html_fields(self, fields: Optional[List[str]] = None) -> None:
+        """
+        Store the sanitized, minified copy of HTML fields on the instance.
+
+        Args:
+            fields (Optional[List[str]]): The fields to render. Defaults to html_fields.
+        """
+        for field in self.html_fields if fields is None else fields:
+            setattr(self, f"{field}_html", render_html(getattr(self, field)))
@@ -0,0 +1,147 @@
+import hashlib
+from typing import IO, Any, Dict, List, Optional
+
+from django.db.models.fields.files import FieldFile
+from PIL import Image, UnidentifiedImageError
+
+# Suffixes of the companion fields of every field in ImageMetadataMixin.image_metadata_fields
+METADATA_KEYS = ("width", "height", "size", "mime_type", "hash")
+CHUNK_SIZE = 64 * 1024
+
+
+def read_image_metadata(file: IO[bytes]) -> Dict[str, Any]:
+    """
+    Read the dimensions, byte size, MIME type and SHA-256 hash of an image.
+
+    The content is hashed in chunks, so large files are never loaded in memory at once,
+    and Pillow only parses the header to find the dimensions.
+
+    Args:
+        file (IO[bytes]): The image, opened in binary mode.
+
+    Returns:
+        Dict[str, Any]: The metadata, keyed by METADATA_KEYS. The dimensions and MIME
+            type are None if Pillow can't identify the image.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    file.seek(0)
+    for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+        digest.update(chunk)
+        size += len(chunk)
+
+    file.seek(0)
+    try:
+        with Image.open(file) as image:
+            (width, height), mime_type = image.size, Image.MIME.get(image.format)
+    except UnidentifiedImageError:
+        width = height = mime_type = None
+    file.seek(0)
+
+    return {
+        "width": width,
+        "height": height,
+        "size": size,
+        "mime_type": mime_type,
+        "hash": digest.hexdigest(),
+    }
+
+
+def is_committed(file: FieldFile) -> bool:
+    """
+    Check whether a file field holds a file already in storage, rather than a new upload
+    that is sent to storage when the instance is saved.
+
+    Django keeps this in the private `_committed` flag its FileField sets on assignment.
+    """
+    return getattr(file, "_committed", True)
+
+
+class ImageMetadataMixin:
+    """
+    A mixin that stores the metadata of image fields when a new file is saved, so their
+    dimensions, size, type and hash never have to be read back from storage.
+
+    Every field listed in `image_metadata_fields` needs a `<field>_<key>` companion field
+    for each key of METADATA_KEYS. Rows saved before the companions existed are filled
+    by the backfill_image_metadata command.
+    """
+
+    image_metadata_fields: List[str] = []
+
+    def save(self, *args, **kwargs) -> None:
+        """
+        Store the metadata of the image fields being saved, then save the model instance.
+        """
+        update_fields = kwargs.get("update_fields")
+        fields = self.image_metadata_fields
+        if update_fields is not None:
+            fields = [field for field in fields if field in update_fields]
+
+        changed = []
+        for field in fields:
+            metadata = self.read_new_image_metadata(field)
+            if metadata is not None:
+                self.set_image_metadata(field, metadata)
+                changed.append(field)
+
+        if update_fields is not None:
+            kwargs["update_fields"] = {
+                *update_fields,
+                *(f"{field}_{key}" for field in changed for key in METADATA_KEYS),
+            }
+
+        super().save(*args, **kwargs)
+
+    def read_new_image_metadata(self, field: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the metadata of an image field if its file changed.
+
+        New uploads are read before they are sent to storage. Files that are already
+        stored are only read when a new row is created without their metadata, e.g. a
+        MediaLibrary entry for a model that doesn't keep it.
+
+        Args:
+            field (str): The image field name.
+
+        Returns:
+            Optional[Dict[str, Any]]: The metadata, or None if the file didn't change.
+        """
+        if field not in self.__dict__:
+            # Deferred and never loaded, so it can't have changed
+            return None
+
+        file = getattr(self, field)
+        if not file:
+            return dict.fromkeys(METADATA_KEYS)
+        if not is_committed(file):
+            # Left open, as the upload is read again when it is sent to storage
+            return read_image_metadata(file)
+        if not self._state.adding or getattr(self, f"{field}_hash") is not None:
+            return None
+
+        with file.open("rb"):
+            return read_image_metadata(file)
+
+    def get_image_metadata(self, field: str) -> Dict[str, Any]:
+        """
+        Get the stored metadata of an image field.
+
+        Args:
+            field (str): The image field name.
+
+        Returns:
+            Dict[str, Any]: The metadata, keyed by METADATA_KEYS.
+        """
+        return {key: getattr(self, f"{field}_{key}") for key in METADATA_KEYS}
+
+    def set_image_metadata(self, field: str, metadata: Dict[str, Any]) -> None:
+        """
+        Set the companion fields of an image field, without saving.
+
+        Args:
+            field (str): The image field name.
+            metadata (Dict[str, Any]): The metadata, keyed by METADATA_KEYS.
+        """
+        for key in METADATA_KEYS:
+            setattr(self, f"{field}_{key}", metadata[key])
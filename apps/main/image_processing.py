@@ -0,0 +1,42 @@
+import io
+from typing import Tuple
+
+from PIL import Image, ImageOps
+
+# Pillow encoder and MIME type of each variant format
+FORMATS = {
+    "avif": ("AVIF", "image/avif"),
+    "webp": ("WEBP", "image/webp"),
+}
+
+
+def resize_image(
+    data: bytes, width: int, image_format: str, quality: int
+) -> Tuple[bytes, int, int]:
+    """
+    Shrink an image to at most `width` pixels wide and encode it in another format.
+
+    Runs in the worker processes of the image variant pipeline, so this module must only
+    depend on Pillow and never import Django models.
+
+    Args:
+        data (bytes): The original image.
+        width (int): The largest width of the result. Images are never upscaled.
+        image_format (str): A key of FORMATS.
+        quality (int): The encoder quality, from 0 to 100.
+
+    Returns:
+        Tuple[bytes, int, int]: The encoded image, its width and its height.
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        # Apply the EXIF orientation, as the variants are saved without EXIF data
+        image = ImageOps.exif_transpose(original)
+
+    if image.width > width:
+        height = max(1, round(image.height * width / image.width))
+        image = image.resize((width, height), Image.Resampling.LANCZOS)
+    image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+    output = io.BytesIO()
+    image.save(output, format=FORMATS[image_format][0], quality=quality)
+    return output.getvalue(), image.width, image.height
@@ -0,0 +1,159 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand
+from django.db import models
+from PIL import UnidentifiedImageError
+
+from apps.main.image_metadata import METADATA_KEYS, read_image_metadata
+from apps.main.models import MediaLibrary, SocialMediaLink
+
+
+def get_targets() -> List[Tuple[Type[models.Model], str]]:
+    """
+    Return the models and image fields whose metadata is backfilled.
+    """
+    return [
+        (MediaLibrary, "file"),
+        (SocialMediaLink, "image"),
+        (get_user_model(), "avatar"),
+    ]
+
+
+class Command(BaseCommand):
+    """Command to store the metadata of images uploaded before it was captured"""
+
+    help = """Reads every stored image without metadata and saves its dimensions, byte
+    size, MIME type and hash. Rows are processed in batches, the files of each batch
+    are read from storage in parallel and saved with a single bulk update."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.logger = logging.getLogger("management")
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments to the parser.
+        """
+        parser.add_argument(
+            "-b",
+            "--batch-size",
+            type=int,
+            help="How many rows to read and update at once",
+            default=500,
+        )
+        parser.add_argument(
+            "-w",
+            "--workers",
+            type=int,
+            help="How many files to read from storage at the same time",
+            default=8,
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        Handle the management command.
+        """
+        with ThreadPoolExecutor(max_workers=kwargs["workers"]) as executor:
+            for model, field in get_targets():
+                updated, failed = self.backfill(
+                    executor, model, field, kwargs["batch_size"]
+                )
+                self.logger.info(
+                    "Stored the metadata of %s %s images, %s could not be read",
+                    updated,
+                    model._meta.label,
+                    failed,
+                )
+
+    def backfill(
+        self,
+        executor: ThreadPoolExecutor,
+        model: Type[models.Model],
+        field: str,
+        batch_size: int,
+    ) -> Tuple[int, int]:
+        """
+        Store the metadata of every image of a field that doesn't have it yet.
+
+        Args:
+            executor (ThreadPoolExecutor): Reads the files of a batch in parallel.
+            model (Type[Model]): The model of the image field.
+            field (str): The image field name.
+            batch_size (int): How many rows to process at once.
+
+        Returns:
+            Tuple[int, int]: How many rows were updated and how many files couldn't be read.
+        """
+        # A plain queryset, so rows hidden by the default manager are included too
+        queryset = (
+            models.QuerySet(model)
+            .filter(**{f"{field}_hash__isnull": True})
+            .exclude(**{f"{field}__isnull": True})
+            .exclude(**{field: ""})
+            .only("pk", field)
+            .order_by("pk")
+        )
+        update_fields = [f"{field}_{key}" for key in METADATA_KEYS]
+
+        updated = failed = 0
+        last_pk = None
+        while True:
+            # Paginate by primary key, as rows whose file can't be read keep matching
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            batch = list(batch[:batch_size])
+            if not batch:
+                return updated, failed
+            last_pk = batch[-1].pk
+
+            readable = self.read_batch(executor, batch, field)
+            models.QuerySet(model).bulk_update(readable, update_fields)
+            updated += len(readable)
+            failed += len(batch) - len(readable)
+
+    def read_batch(
+        self, executor: ThreadPoolExecutor, batch: List[models.Model], field: str
+    ) -> List[models.Model]:
+        """
+        Read the metadata of a batch of images in parallel and set it on their rows.
+
+        Args:
+            executor (ThreadPoolExecutor): Reads the files in parallel.
+            batch (List[Model]): The rows holding the images.
+            field (str): The image field name.
+
+        Returns:
+            List[Model]: The rows whose file could be read.
+        """
+        readable = []
+        for obj, metadata in zip(
+            batch, executor.map(lambda obj: self.read(obj, field), batch)
+        ):
+            if metadata is None:
+                continue
+            for key, value in metadata.items():
+                setattr(obj, f"{field}_{key}", value)
+            readable.append(obj)
+        return readable
+
+    def read(self, obj: models.Model, field: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the metadata of a stored image.
+
+        Args:
+            obj (Model): The row holding the image.
+            field (str): The image field name.
+
+        Returns:
+            Optional[Dict[str, Any]]: The metadata, or None if the file couldn't be read.
+        """
+        file = getattr(obj, field)
+        try:
+            with file.open("rb"):
+                return read_image_metadata(file)
+        except (OSError, UnidentifiedImageError):
+            # Missing or unreadable files are logged and skipped
+            self.logger.exception("Could not read %s", file.name)
+            return None
@@ -0,0 +1,159 @@
+import logging
+import sys
+from typing import List, Tuple, Union
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import BaseCommand
+from django.db import connection, models, transaction
+
+from apps.main.models import Comment, MediaLibrary, Report
+
+WARNING_ON_LIVE_SERVER = (
+    "Running the `explain_generic_indexes` command on a live server."
+)
+
+
+class Command(BaseCommand):
+    """Command to compare query plans of the generic relation lookups with and without their indexes"""
+
+    help = """Seeds Report, Comment and MediaLibrary rows inside a transaction, prints the
+    EXPLAIN ANALYZE output of their (content_type, object_id) lookups without and with
+    the composite indexes or unique constraints, then rolls everything back."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.logger = logging.getLogger("management")
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments to the parser.
+        """
+        parser.add_argument(
+            "-r",
+            "--rows",
+            type=int,
+            help="How many rows to seed into each table",
+            default=1_000_000,
+        )
+        parser.add_argument(
+            "-p",
+            "--per-object",
+            type=int,
+            help="How many rows share the same object_id",
+            default=10,
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        Handle the management command.
+        """
+        if not settings.DEBUG:
+            self.logger.error(WARNING_ON_LIVE_SERVER)
+            sys.exit(1)
+
+        with transaction.atomic():
+            content_type = ContentType.objects.get_for_model(Comment)
+            # Each report of an object needs its own reporter
+            users = [
+                get_user_model().objects.create(
+                    username=f"explain_generic_indexes_{number}",
+                    email=f"explain_generic_indexes_{number}@example.com",
+                )
+                for number in range(kwargs["per_object"])
+            ]
+            self.seed(content_type, users, kwargs["rows"], kwargs["per_object"])
+
+            for model, index, queryset in self.get_cases(content_type):
+                self.stdout.write(f"\n== {model._meta.label}: {index.name}")
+
+                savepoint = transaction.savepoint()
+                with connection.schema_editor() as editor:
+                    if isinstance(index, models.Index):
+                        editor.remove_index(model, index)
+                    else:
+                        editor.remove_constraint(model, index)
+                self.stdout.write("-- without index")
+                self.stdout.write(queryset.explain(analyze=True))
+                transaction.savepoint_rollback(savepoint)
+
+                self.stdout.write("-- with index")
+                self.stdout.write(queryset.explain(analyze=True))
+
+            transaction.set_rollback(True)
+
+    def seed(
+        self, content_type: ContentType, users: list, rows: int, per_object: int
+    ) -> None:
+        """
+        Insert the benchmark rows with generate_series and refresh the planner statistics.
+        """
+        objects = max(rows // per_object, 1)
+        user_ids = [user.pk for user in users]
+        statements = [
+            (
+                Report,
+                """
+                INSERT INTO {table} (created, modified, content_type_id, reporter_id, object_id, reason)
+                SELECT now(), now(), %s, (%s::bigint[])[g %% %s + 1], g / %s, ''
+                FROM generate_series(1, %s) g
+                """,
+                [content_type.pk, user_ids, per_object, per_object, rows],
+            ),
+            (
+                Comment,
+                """
+                INSERT INTO {table} (created, modified, active, reports_count, content, content_type_id, user_id, object_id)
+                SELECT now() - g * interval '1 second', now(), true, 0, '', %s, %s, g %% %s
+                FROM generate_series(1, %s) g
+                """,
+                [content_type.pk, user_ids[0], objects, rows],
+            ),
+            (
+                MediaLibrary,
+                """
+                INSERT INTO {table} (created, modified, content_type_id, object_id, file)
+                SELECT now(), now(), %s, g %% %s, 'media_library/' || g || '.jpg'
+                FROM generate_series(1, %s) g
+                """,
+                [content_type.pk, objects, rows],
+            ),
+        ]
+
+        with connection.cursor() as cursor:
+            for model, statement, params in statements:
+                table = connection.ops.quote_name(model._meta.db_table)
+                cursor.execute(statement.format(table=table), params)
+                cursor.execute(f"ANALYZE {table}")
+        # Run the deferred foreign key checks now, as tables with pending ones can't be
+        # altered to drop a constraint
+        connection.check_constraints()
+
+    def get_cases(
+        self, content_type: ContentType
+    ) -> List[
+        Tuple[
+            type[models.Model],
+            Union[models.Index, models.UniqueConstraint],
+            models.QuerySet,
+        ]
+    ]:
+        """
+        Return each model with the composite index or unique constraint covering its
+        generic relation, and the lookup it is meant for.
+        """
+        lookup = {"content_type": content_type, "object_id": 1}
+        querysets = {
+            Report: Report.objects.filter(**lookup),
+            Comment: Comment.objects.filter(**lookup).order_by("-created")[:20],
+            MediaLibrary: MediaLibrary.objects.filter(**lookup).values_list(
+                "file", flat=True
+            ),
+        }
+        return [
+            (model, index, queryset)
+            for model, queryset in querysets.items()
+            for index in [*model._meta.indexes, *model._meta.constraints]
+            if "object_id" in getattr(index, "fields", ())
+        ]
@@ -0,0 +1,41 @@
+import logging
+
+from django.core.management import BaseCommand
+
+from apps.main.models import MediaLibrary, MediaVariant
+from apps.main.tasks import queue_image_variants
+
+
+class Command(BaseCommand):
+    """Command to queue the variant generation of images uploaded before the pipeline"""
+
+    help = """Queues the generate_image_variants task for every MediaLibrary image without
+    variants, or for every image with --all, e.g. after adding a size or format."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.logger = logging.getLogger("management")
+
+    def add_arguments(self, parser):
+        """
+        Add command line arguments to the parser.
+        """
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Also queue images that already have variants",
+        )
+
+    def handle(self, *args, **kwargs):
+        """
+        Handle the management command.
+        """
+        sources = MediaLibrary.objects.values_list("file", flat=True).distinct()
+        if not kwargs["all"]:
+            sources = sources.exclude(file__in=MediaVariant.objects.values("source"))
+
+        count = 0
+        for source in sources.order_by("file").iterator():
+            queue_image_variants(source)
+            count += 1
+        self.logger.info("Queued the variants of %s images", count)
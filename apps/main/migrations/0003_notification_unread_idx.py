@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-18 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("main", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("is_read", False)),
+                fields=["user", "-created_at"],
+                name="notification_unread_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 6.0 on 2026-10-18 11:26
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_reports_count(apps, schema_editor):
+    """
+    Set reports_count on existing comments from the reports filed against them.
+    """
+    Comment = apps.get_model("main", "Comment")
+    Report = apps.get_model("main", "Report")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+
+    content_type = ContentType.objects.filter(app_label="main", model="comment").first()
+    if content_type is None:
+        return
+
+    counts = (
+        Report.objects.filter(content_type=content_type, object_id=OuterRef("pk"))
+        .values("object_id")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Comment.objects.update(
+        reports_count=Coalesce(Subquery(counts), 0, output_field=models.IntegerField())
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("main", "0003_notification_unread_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="reports_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_reports_count, migrations.RunPython.noop),
+    ]
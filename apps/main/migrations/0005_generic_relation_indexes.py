@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-18 11:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("main", "0004_comment_reports_count"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(
+                fields=["content_type", "object_id"], name="report_object_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="medialibrary",
+            index=models.Index(
+                fields=["content_type", "object_id"],
+                include=("file",),
+                name="medialibrary_object_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["content_type", "object_id", "-created"],
+                name="comment_object_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-18 13:04
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("main", "0005_generic_relation_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="faq",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-18 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("main", "0006_faq_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="termsandconditions",
+            index=models.Index(fields=["-created_at"], name="terms_created_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="privacypolicy",
+            index=models.Index(fields=["-created_at"], name="privacy_created_at_idx"),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 6.0 on 2026-10-18 14:12
+
+from django.db import migrations, models
+
+from apps.main.html import render_html
+
+RENDERED_FIELDS = {
+    "TermsAndConditions": ["terms"],
+    "PrivacyPolicy": ["policy"],
+    "FAQ": ["question", "answer"],
+    "Notification": ["message"],
+}
+BATCH_SIZE = 1000
+
+
+def backfill_rendered_html(apps, schema_editor):
+    """
+    Render the HTML copies of existing rows, in batches.
+    """
+    for model_name, fields in RENDERED_FIELDS.items():
+        model = apps.get_model("main", model_name)
+        targets = [f"{field}_html" for field in fields]
+        batch = []
+        for obj in model.objects.only("pk", *fields).iterator(chunk_size=BATCH_SIZE):
+            for field, target in zip(fields, targets):
+                setattr(obj, target, render_html(getattr(obj, field)))
+            batch.append(obj)
+            if len(batch) == BATCH_SIZE:
+                model.objects.bulk_update(batch, targets)
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, targets)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("main", "0007_terms_privacy_created_at_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="termsandconditions",
+            name="terms_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="privacypolicy",
+            name="policy_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="faq",
+            name="question_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="faq",
+            name="answer_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="message_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunPython(backfill_rendered_html, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 6.0 on 2026-10-18 14:47
+
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def remove_duplicate_reports(apps, schema_editor):
+    """
+    Keep only the oldest report of each reporter on each object, then recount the
+    reports of comments.
+    """
+    Comment = apps.get_model("main", "Comment")
+    Report = apps.get_model("main", "Report")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+
+    duplicates = (
+        Report.objects.values("content_type", "object_id", "reporter")
+        .annotate(first_id=Min("id"), count=Count("id"))
+        .filter(count__gt=1)
+    )
+    for row in duplicates.iterator():
+        Report.objects.filter(
+            content_type=row["content_type"],
+            object_id=row["object_id"],
+            reporter=row["reporter"],
+        ).exclude(id=row["first_id"]).delete()
+
+    content_type = ContentType.objects.filter(app_label="main", model="comment").first()
+    if content_type is None:
+        return
+
+    counts = (
+        Report.objects.filter(content_type=content_type, object_id=OuterRef("pk"))
+        .values("object_id")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Comment.objects.update(
+        reports_count=Coalesce(Subquery(counts), 0, output_field=models.IntegerField())
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("main", "0008_rendered_html_fields"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_reports, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="report",
+            constraint=models.UniqueConstraint(
+                fields=["content_type", "object_id", "reporter"],
+                name="unique_report_per_reporter",
+            ),
+        ),
+    ]
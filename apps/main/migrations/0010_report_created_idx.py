@@ -0,0 +1,16 @@
+# Generated by Django 6.0 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("main", "0009_unique_report_per_reporter"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(fields=["created"], name="report_created_idx"),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 6.0 on 2026-10-18 16:05
+
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("main", "0010_report_created_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaVariant",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+                (
+                    "modified",
+                    model_utils.fields.AutoLastModifiedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="modified",
+                    ),
+                ),
+                ("source", models.CharField(max_length=255)),
+                ("name", models.CharField(max_length=50)),
+                ("format", models.CharField(max_length=10)),
+                (
+                    "file",
+                    models.FileField(max_length=255, upload_to="media_variants/"),
+                ),
+                ("width", models.PositiveIntegerField()),
+                ("height", models.PositiveIntegerField()),
+                ("size", models.PositiveIntegerField()),
+            ],
+            options={
+                "verbose_name": "Media Variant",
+                "verbose_name_plural": "Media Variants",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("source", "name", "format"),
+                        name="unique_media_variant",
+                    )
+                ],
+            },
+        ),
+    ]
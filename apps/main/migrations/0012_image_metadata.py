@@ -0,0 +1,70 @@
+# Generated by Django 6.0 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("main", "0011_mediavariant"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="medialibrary",
+            name="file_width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="medialibrary",
+            name="file_height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="medialibrary",
+            name="file_size",
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="medialibrary",
+            name="file_mime_type",
+            field=models.CharField(
+                blank=True, editable=False, max_length=100, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="medialibrary",
+            name="file_hash",
+            field=models.CharField(
+                blank=True, editable=False, max_length=64, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="socialmedialink",
+            name="image_width",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="socialmedialink",
+            name="image_height",
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="socialmedialink",
+            name="image_size",
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="socialmedialink",
+            name="image_mime_type",
+            field=models.CharField(
+                blank=True, editable=False, max_length=100, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="socialmedialink",
+            name="image_hash",
+            field=models.CharField(
+                blank=True, editable=False, max_length=64, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-18 17:10
+
+import apps.main.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("main", "0012_image_metadata"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="medialibrary",
+            name="file",
+            field=models.ImageField(upload_to=apps.main.models.media_library_upload_to),
+        ),
+        migrations.AddField(
+            model_name="medialibrary",
+            name="ref_count",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="medialibrary",
+            index=models.Index(fields=["file_hash"], name="medialibrary_file_hash_idx"),
+        ),
+    ]
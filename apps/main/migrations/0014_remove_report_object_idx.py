@@ -0,0 +1,16 @@
+# Generated by Django 6.0 on 2026-10-18 19:02
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("main", "0013_medialibrary_deduplication"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="report",
+            name="report_object_idx",
+        ),
+    ]
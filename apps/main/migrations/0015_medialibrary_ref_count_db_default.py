@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("main", "0014_remove_report_object_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="medialibrary",
+            name="ref_count",
+            field=models.PositiveIntegerField(db_default=1, default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 6.0 on 2026-10-18 21:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("main", "0015_medialibrary_ref_count_db_default"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="medialibrary",
+            name="ref_count",
+        ),
+    ]
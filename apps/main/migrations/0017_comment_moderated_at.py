@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("main", "0016_remove_medialibrary_ref_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="moderated_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
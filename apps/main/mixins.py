@@ -1,8 +1,10 @@
-from typing import List, Set
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
 
+from apps.main.image_metadata import ImageMetadataMixin
 from apps.main.models import MediaLibrary
 
 
@@ -13,20 +15,123 @@ class CreateMediaLibraryMixin:
     By default, it will iterate over all ImageFields on the model and create a
     corresponding MediaLibrary entry. Optionally, you can define `ml_include_list` to
     choose which fields to be used or `ml_exclude_list` to specify fields to be ignored.
+
+    Only image fields whose file changed since the instance was loaded or last saved are
+    synced, so saves that don't touch an image, such as updating `last_login`, skip the
+    MediaLibrary queries entirely.
     """
 
     ml_include_list: List[str] = []
     ml_exclude_list: List[str] = []
 
+    @classmethod
+    def from_db(cls, db, field_names, values, *args, **kwargs):
+        """
+        Load the instance and remember its file names to detect changed images on save.
+        """
+        instance = super().from_db(db, field_names, values, *args, **kwargs)
+        instance.remember_media_library_files(
+            name for name in cls.get_image_field_names() if name in instance.__dict__
+        )
+        return instance
+
     def save(self, *args, **kwargs) -> None:
         """
-        Save the model instance and create MediaLibrary entries for associated image fields.
+        Save the model instance and create MediaLibrary entries for changed image fields.
         """
+        changed_fields = self.get_changed_media_library_fields(
+            kwargs.get("update_fields")
+        )
+
         # Perform the save first to ensure the instance has a primary key
         super().save(*args, **kwargs)
 
+        if not changed_fields:
+            return
+
         # Create MediaLibrary entries for image fields
-        self.create_media_library_entries()
+        self.create_media_library_entries(changed_fields)
+        self.remember_media_library_files(changed_fields)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def get_image_field_names(cls) -> Tuple[str, ...]:
+        """
+        Get the names of all ImageFields on the model, computed once per class.
+
+        Returns:
+            Tuple[str, ...]: The image field names.
+        """
+        return tuple(
+            field.name
+            for field in cls._meta.get_fields()
+            if isinstance(field, models.ImageField)
+        )
+
+    def get_media_library_fields(self) -> List[str]:
+        """
+        Get the image fields to sync, after applying `ml_include_list` and `ml_exclude_list`.
+
+        Returns:
+            List[str]: The field names.
+        """
+        return [
+            name
+            for name in self.get_image_field_names()
+            if name not in self.ml_exclude_list
+            and (not self.ml_include_list or name in self.ml_include_list)
+        ]
+
+    def get_media_library_file_name(self, name: str) -> Optional[str]:
+        """
+        Get the file name an image field currently holds, without loading deferred fields.
+
+        Args:
+            name (str): The image field name.
+
+        Returns:
+            Optional[str]: The file name, or None if the field is empty.
+        """
+        value = self.__dict__.get(name)
+        return getattr(value, "name", value) or None
+
+    def remember_media_library_files(self, names: Iterable[str]) -> None:
+        """
+        Remember the file names image fields currently hold, to detect later changes.
+
+        Args:
+            names (Iterable[str]): The image field names.
+        """
+        files = self.__dict__.setdefault("_media_library_files", {})
+        for name in names:
+            files[name] = self.get_media_library_file_name(name)
+
+    def get_changed_media_library_fields(
+        self, update_fields: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Get the image fields whose file changed since the instance was loaded or saved.
+
+        Fields of new instances always count as changed, deferred fields that were never
+        loaded never do.
+
+        Args:
+            update_fields (Optional[List[str]]): The fields being saved, if not all of them.
+
+        Returns:
+            List[str]: The changed field names.
+        """
+        files: Dict[str, Optional[str]] = self.__dict__.get("_media_library_files", {})
+        return [
+            name
+            for name in self.get_media_library_fields()
+            if (update_fields is None or name in update_fields)
+            and name in self.__dict__
+            and (
+                name not in files
+                or files[name] != self.get_media_library_file_name(name)
+            )
+        ]
 
     def get_content_type_and_object_id(self) -> (ContentType, int):
         """
@@ -58,31 +163,29 @@ class CreateMediaLibraryMixin:
         )
         return existing_files
 
-    def create_media_library_entries(self) -> None:
+    def create_media_library_entries(
+        self, field_names: Optional[List[str]] = None
+    ) -> None:
         """
-        Create MediaLibrary entries for all relevant ImageFields on the model.
-        """
-        content_type, object_id = self.get_content_type_and_object_id()
-        existing_files = self.get_existing_files(content_type, object_id)
-
-        for field in self._meta.get_fields():
-            # Only process ImageFields
-            if not isinstance(field, models.ImageField):
-                continue
+        Create MediaLibrary entries for the relevant ImageFields on the model.
 
-            # Skip fields in the exclude list
-            if field.name in self.ml_exclude_list:
-                continue
+        Args:
+            field_names (Optional[List[str]]): The image fields to sync. Defaults to all
+                fields allowed by `ml_include_list` and `ml_exclude_list`.
+        """
+        if field_names is None:
+            field_names = self.get_media_library_fields()
 
-            # If the include list is defined and the field is not in it, skip
-            if self.ml_include_list and field.name not in self.ml_include_list:
-                continue
+        # Skip if no file is present
+        field_names = [name for name in field_names if getattr(self, name)]
+        if not field_names:
+            return
 
-            file_field = getattr(self, field.name)
+        content_type, object_id = self.get_content_type_and_object_id()
+        existing_files = self.get_existing_files(content_type, object_id)
 
-            # Skip if no file is present
-            if not file_field:
-                continue
+        for name in field_names:
+            file_field = getattr(self, name)
 
             # Skip if the file is already in the existing files
             if file_field.name in existing_files:
@@ -93,5 +196,27 @@ class CreateMediaLibraryMixin:
 
             # Create the MediaLibrary object
             MediaLibrary.objects.create(
-                file=file_field, content_type=content_type, object_id=object_id
+                file=file_field,
+                content_type=content_type,
+                object_id=object_id,
+                **self.get_media_library_metadata(name),
             )
+
+    def get_media_library_metadata(self, name: str) -> Dict[str, Any]:
+        """
+        Get the stored metadata of an image field as MediaLibrary fields, so the entry
+        doesn't read the file back from storage to find it.
+
+        Args:
+            name (str): The image field name.
+
+        Returns:
+            Dict[str, Any]: The `file_*` metadata fields, empty if the model doesn't keep
+                metadata for the field.
+        """
+        if not isinstance(self, ImageMetadataMixin):
+            return {}
+        if name not in self.image_metadata_fields:
+            return {}
+        metadata = self.get_image_metadata(name)
+        return {f"file_{key}": value for key, value in metadata.items()}
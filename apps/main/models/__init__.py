@@ -0,0 +1,55 @@
+from apps.main.cache import track_models
+from apps.main.models.comments import Comment, CommentQuerySet
+from apps.main.models.content import (
+    FAQ,
+    Contact,
+    CurrentVersionManager,
+    PrivacyPolicy,
+    SocialMediaLink,
+    TermsAndConditions,
+)
+from apps.main.models.media import (
+    MEDIA_LIBRARY_UPLOAD_DIRECTORY,
+    MediaLibrary,
+    MediaLibraryManager,
+    MediaVariant,
+    media_library_upload_to,
+)
+from apps.main.models.notifications import (
+    Notification,
+    NotificationManager,
+    NotificationQuerySet,
+)
+from apps.main.models.reports import (
+    Report,
+    ReportableObject,
+    ReportQuerySet,
+    decrement_reports_count,
+)
+
+# Saving or deleting these bumps their cache version, so cached pages and values built
+# from them are purged
+track_models(FAQ, PrivacyPolicy, SocialMediaLink, TermsAndConditions)
+
+__all__ = [
+    "FAQ",
+    "MEDIA_LIBRARY_UPLOAD_DIRECTORY",
+    "Comment",
+    "CommentQuerySet",
+    "Contact",
+    "CurrentVersionManager",
+    "MediaLibrary",
+    "MediaLibraryManager",
+    "MediaVariant",
+    "Notification",
+    "NotificationManager",
+    "NotificationQuerySet",
+    "PrivacyPolicy",
+    "Report",
+    "ReportQuerySet",
+    "ReportableObject",
+    "SocialMediaLink",
+    "TermsAndConditions",
+    "decrement_reports_count",
+    "media_library_upload_to",
+]
@@ -0,0 +1,154 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, Optional, Sequence, Tuple
+
+import auto_prefetch
+
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from model_utils.models import TimeStampedModel
+
+from apps.main.models.reports import ReportableObject
+
+
+class CommentQuerySet(auto_prefetch.QuerySet):
+    """
+    A custom queryset for the Comment model.
+    """
+
+    def for_objects(self, objects: Iterable[models.Model]) -> "CommentQuerySet":
+        """
+        Filter the comments attached to any of the given objects, which may be of mixed models.
+
+        Args:
+            objects (Iterable[Model]): The objects whose comments to return.
+
+        Returns:
+            CommentQuerySet: The comments of those objects.
+        """
+        object_ids = defaultdict(set)
+        for obj in objects:
+            object_ids[obj.__class__].add(obj.pk)
+
+        content_types = ContentType.objects.get_for_models(*object_ids)
+        condition = Q(pk__in=[])
+        for model, ids in object_ids.items():
+            condition |= Q(content_type=content_types[model], object_id__in=ids)
+        return self.filter(condition)
+
+    def before(self, cursor: Optional[Tuple[datetime, int]]) -> "CommentQuerySet":
+        """
+        Filter the comments older than a (created, id) keyset cursor.
+
+        Args:
+            cursor (Optional[Tuple[datetime, int]]): The created time and id of the last
+                comment already shown. None returns the queryset unchanged.
+
+        Returns:
+            CommentQuerySet: The comments that come after the cursor, newest first.
+        """
+        if cursor is None:
+            return self
+        created, pk = cursor
+        return self.filter(Q(created__lt=created) | Q(created=created, pk__lt=pk))
+
+    def prefetch_for(
+        self,
+        objects: Sequence[models.Model],
+        limit: Optional[int] = None,
+        before: Optional[Tuple[datetime, int]] = None,
+        to_attr: str = "comment_list",
+    ) -> Sequence[models.Model]:
+        """
+        Load the comments of many objects in one query and attach them to each object.
+
+        Comments come newest first with their users preloaded. With a limit, only the
+        newest `limit` comments of every object are loaded, using a window function, and
+        `<to_attr>_cursor` is set to the cursor to pass as `before` for the next page,
+        or None when the object has no more comments.
+
+        Args:
+            objects (Sequence[Model]): The objects to load comments for, e.g. a page of posts.
+            limit (Optional[int]): The maximum number of comments to attach per object.
+            before (Optional[Tuple[datetime, int]]): Only load comments older than this cursor.
+            to_attr (str): The attribute the list of comments is stored in on each object.
+
+        Returns:
+            Sequence[Model]: The same objects, for chaining.
+        """
+        comments = defaultdict(list)
+        if objects:
+            queryset = (
+                self.for_objects(objects)
+                .before(before)
+                .select_related("user")
+                .order_by("content_type_id", "object_id", "-created", "-pk")
+            )
+            if limit is not None:
+                # Fetch one extra comment per object to know whether another page exists
+                queryset = queryset.annotate(
+                    position=Window(
+                        RowNumber(),
+                        partition_by=[F("content_type_id"), F("object_id")],
+                        order_by=[F("created").desc(), F("pk").desc()],
+                    )
+                ).filter(position__lte=limit + 1)
+
+            for comment in queryset:
+                comments[(comment.content_type_id, comment.object_id)].append(comment)
+
+        content_types = ContentType.objects.get_for_models(
+            *{obj.__class__ for obj in objects}
+        )
+        for obj in objects:
+            key = (content_types[obj.__class__].pk, obj.pk)
+            object_comments = comments.get(key, [])
+            cursor = None
+            if limit is not None and len(object_comments) > limit:
+                object_comments = object_comments[:limit]
+                cursor = (object_comments[-1].created, object_comments[-1].pk)
+            setattr(obj, to_attr, object_comments)
+            setattr(obj, f"{to_attr}_cursor", cursor)
+        return objects
+
+
+class Comment(TimeStampedModel, auto_prefetch.Model, ReportableObject):
+    """
+    Represents a comment in the system.
+    """
+
+    content = models.CharField(max_length=1000, default="", verbose_name="Content")
+    user = auto_prefetch.ForeignKey(
+        "users.User",
+        on_delete=models.CASCADE,
+        related_name="comments",
+        verbose_name="User",
+    )
+
+    content_type = auto_prefetch.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey("content_type", "object_id")
+
+    objects = auto_prefetch.Manager.from_queryset(CommentQuerySet)()
+
+    def __str__(self):
+        return f"Comment {self.id} by {self.user.username}"
+
+    class Meta(auto_prefetch.Model.Meta):
+        verbose_name = "Comment"
+        verbose_name_plural = "Comments"
+        ordering = ["-created"]
+        indexes = [
+            models.Index(
+                fields=["content_type", "object_id", "-created"],
+                name="comment_object_created_idx",
+            ),
+        ]
+
+    @property
+    def content_display(self):
+        """Displays the content if the comment is active."""
+        return self.content if self.active else "[This comment has been removed]"
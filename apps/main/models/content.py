@@ -0,0 +1,178 @@
+from datetime import datetime
+from typing import Optional
+
+from django_lifecycle import (
+    LifecycleModel,
+    hook,
+    BEFORE_CREATE,
+)
+
+from django.db import models
+
+from apps.main.cache import CACHE_DEPENDENT_TIMEOUT, get_or_set
+from apps.main.consts import ContactStatus
+from apps.main.html import RenderedHTMLMixin
+from apps.main.image_metadata import ImageMetadataMixin
+from apps.main.tasks import notify_by_slack
+
+
+class CurrentVersionManager(models.Manager):
+    """
+    A manager for documents where only the newest version is in effect.
+    """
+
+    def current(self) -> Optional[models.Model]:
+        """
+        Return the version in effect, i.e. the most recently created one.
+
+        The result is cached in the shared and per-process caches under the model's cache
+        version, which changes whenever a version is created, edited or deleted, so this
+        is safe to call on every request without touching the database.
+
+        Returns:
+            Optional[Model]: The current version, or None if none was created yet.
+        """
+        return get_or_set(
+            f"current_version:{self.model._meta.label_lower}",
+            lambda: self.order_by("-created_at", "-pk").first(),
+            CACHE_DEPENDENT_TIMEOUT,
+            depends_on=[self.model],
+        )
+
+    def last_modified(self) -> Optional[datetime]:
+        """
+        Return when the version in effect was created, for conditional requests.
+
+        Returns:
+            Optional[datetime]: The creation time of the current version, or None if none
+                was created yet.
+        """
+        current = self.current()
+        return current.created_at if current else None
+
+
+class TermsAndConditions(RenderedHTMLMixin, models.Model):
+    """
+    Model for the Terms and Conditions
+    """
+
+    terms = models.TextField()
+    terms_html = models.TextField(blank=True, default="", editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = CurrentVersionManager()
+
+    html_fields = ["terms"]
+
+    def __str__(self):
+        return f"Terms And Conditions created at {self.created_at}"
+
+    class Meta:
+        verbose_name = "Terms and Conditions"
+        verbose_name_plural = "Terms and Conditions"
+        indexes = [
+            models.Index(fields=["-created_at"], name="terms_created_at_idx"),
+        ]
+
+
+class PrivacyPolicy(RenderedHTMLMixin, models.Model):
+    """
+    Model for the Privacy Policy
+    """
+
+    policy = models.TextField()
+    policy_html = models.TextField(blank=True, default="", editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = CurrentVersionManager()
+
+    html_fields = ["policy"]
+
+    def __str__(self):
+        return f"Privacy Policy created at {self.created_at}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at"], name="privacy_created_at_idx"),
+        ]
+
+
+class Contact(LifecycleModel):
+    """
+    Model representing a user's contact request.
+    """
+
+    name = models.CharField(max_length=255)
+    email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+    contact_date = models.DateTimeField(auto_now_add=True)
+    status = models.CharField(max_length=15, default=ContactStatus.PENDING.value)
+    resolved_date = models.DateTimeField(null=True, blank=True)
+    type = models.CharField(max_length=50)
+    admin_notes = models.TextField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the model.
+        """
+        return f"{self.name} - {self.subject}"
+
+    class Meta:
+        ordering = ["-contact_date"]
+        verbose_name = "Contact Request"
+        verbose_name_plural = "Contact Requests"
+
+    @hook(BEFORE_CREATE)
+    def notify_admin(self):
+        """
+        Send email notification to admin when a new contact is created.
+        """
+        notify_by_slack(f"Contact request made with {self.subject}")
+
+
+class SocialMediaLink(ImageMetadataMixin, models.Model):
+    """
+    Model to store social media links for the organization.
+    """
+
+    platform_name = models.CharField(max_length=100)
+    profile_url = models.URLField()
+    image = models.ImageField(upload_to="social_media_images/")
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_size = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    image_mime_type = models.CharField(
+        max_length=100, null=True, blank=True, editable=False
+    )
+    image_hash = models.CharField(max_length=64, null=True, blank=True, editable=False)
+
+    image_metadata_fields = ["image"]
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.platform_name} link"
+
+
+class FAQ(RenderedHTMLMixin, models.Model):
+    """
+    Model for the FAQ
+    """
+
+    question = models.TextField()
+    answer = models.TextField()
+    question_html = models.TextField(blank=True, default="", editable=False)
+    answer_html = models.TextField(blank=True, default="", editable=False)
+    # variable for faqs that should just show up in the module
+    module = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    html_fields = ["question", "answer"]
+
+    def __str__(self):
+        return self.question
+
+    class Meta:
+        verbose_name = "FAQ"
+        verbose_name_plural = "FAQs"
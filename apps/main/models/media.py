@@ -0,0 +1,261 @@
+import os
+from typing import Optional
+
+from django_lifecycle import (
+    LifecycleModelMixin,
+    hook,
+    AFTER_CREATE,
+    AFTER_DELETE,
+)
+
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+from model_utils.models import TimeStampedModel
+
+from apps.main.image_metadata import ImageMetadataMixin, read_image_metadata
+from apps.main.tasks import queue_image_variants
+from apps.main.variants import delete_variants
+
+
+MEDIA_LIBRARY_UPLOAD_DIRECTORY = "media_library/"
+
+
+def media_library_upload_to(instance: "MediaLibrary", filename: str) -> str:
+    """
+    Store files uploaded to the media library under their content hash, so identical
+    uploads share a single object in storage.
+
+    Args:
+        instance (MediaLibrary): The entry being saved, whose file_hash is already set.
+        filename (str): The name of the uploaded file.
+
+    Returns:
+        str: The storage name, e.g. "media_library/<sha256>.jpg".
+    """
+    if not instance.file_hash:
+        return f"{MEDIA_LIBRARY_UPLOAD_DIRECTORY}{filename}"
+    extension = os.path.splitext(filename)[1].lower()
+    return f"{MEDIA_LIBRARY_UPLOAD_DIRECTORY}{instance.file_hash}{extension}"
+
+
+class MediaLibraryManager(models.Manager):
+    """
+    A custom manager for the MediaLibrary model.
+    """
+
+    def store_upload(
+        self,
+        file,
+        content_type: ContentType,
+        object_id: int,
+        file_hash: Optional[str] = None,
+    ) -> "MediaLibrary":
+        """
+        Store an uploaded file, unless the object already has an identical file.
+
+        A repeated upload returns the existing entry and its stored file, so pasting the
+        same image again costs no storage.
+
+        Args:
+            file (UploadedFile): The uploaded file.
+            content_type (ContentType): The content type of the object it belongs to.
+            object_id (int): The primary key of the object it belongs to.
+            file_hash (Optional[str]): The SHA-256 of the file if it is already known,
+                e.g. from HashingUploadHandler.
+
+        Returns:
+            MediaLibrary: The new or reused entry.
+        """
+        if file_hash is None:
+            file_hash = read_image_metadata(file)["hash"]
+
+        existing = self.reuse(file_hash, content_type, object_id)
+        if existing is not None:
+            return existing
+        return self.create(file=file, content_type=content_type, object_id=object_id)
+
+    def register_upload(
+        self, name: str, content_type: ContentType, object_id: int
+    ) -> Optional["MediaLibrary"]:
+        """
+        Record a file a browser uploaded straight to storage, see create_direct_upload.
+
+        The file is read from storage once to find its metadata. If the object already
+        has an identical file, that entry is reused and the new copy deleted. Recording
+        the same upload again returns its entry.
+
+        Args:
+            name (str): The storage name the file was uploaded to.
+            content_type (ContentType): The content type of the object it belongs to.
+            object_id (int): The primary key of the object it belongs to.
+
+        Returns:
+            Optional[MediaLibrary]: The new or reused entry, or None if the file isn't an
+                image, in which case it is deleted.
+        """
+        storage = self.model._meta.get_field("file").storage
+        with storage.open(name) as file:
+            metadata = read_image_metadata(file)
+
+        if not (metadata["mime_type"] or "").startswith("image/"):
+            storage.delete(name)
+            return None
+
+        recorded = self.filter(file_hash=metadata["hash"], file=name).first()
+        if recorded is not None:
+            return recorded
+
+        existing = self.reuse(metadata["hash"], content_type, object_id)
+        if existing is not None:
+            transaction.on_commit(lambda: storage.delete(name))
+            return existing
+
+        media = self.model(file=name, content_type=content_type, object_id=object_id)
+        media.set_image_metadata("file", metadata)
+        media.save()
+        return media
+
+    def reuse(
+        self, file_hash: str, content_type: ContentType, object_id: int
+    ) -> Optional["MediaLibrary"]:
+        """
+        Find the entry of an object holding a file with the given hash.
+
+        Args:
+            file_hash (str): The SHA-256 of the file.
+            content_type (ContentType): The content type of the object.
+            object_id (int): The primary key of the object.
+
+        Returns:
+            Optional[MediaLibrary]: The entry, or None if the object has no such file.
+        """
+        return (
+            self.filter(
+                file_hash=file_hash, content_type=content_type, object_id=object_id
+            )
+            .order_by("pk")
+            .first()
+        )
+
+
+class MediaLibrary(
+    ImageMetadataMixin, LifecycleModelMixin, TimeStampedModel, models.Model
+):
+    """
+    MediaLibrary model to store images associated with any other model.
+
+    Resized variants of every new file are generated in the background, see MediaVariant.
+    Files uploaded to the library itself are content-addressed and deduplicated, see
+    MediaLibraryManager.store_upload.
+
+    Attributes:
+        file (ImageField): The image file to be stored.
+        content_type (ForeignKey): Reference to the ContentType of the related model.
+        object_id (PositiveIntegerField): ID of the related model instance.
+        content_object (GenericForeignKey): Generic relation to the related model.
+        file_width, file_height, file_size, file_mime_type, file_hash: The metadata of
+            the file, see ImageMetadataMixin.
+    """
+
+    file = models.ImageField(upload_to=media_library_upload_to)
+    file_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    file_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    file_size = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    file_mime_type = models.CharField(
+        max_length=100, null=True, blank=True, editable=False
+    )
+    file_hash = models.CharField(max_length=64, null=True, blank=True, editable=False)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey("content_type", "object_id")
+
+    objects = MediaLibraryManager()
+
+    image_metadata_fields = ["file"]
+
+    def __str__(self) -> str:
+        """
+        Returns the base name of the file.
+        """
+        return os.path.basename(self.file.name)
+
+    @hook(AFTER_CREATE)
+    def queue_variants(self):
+        """
+        Queue the generation of the file's resized variants, if it is an image.
+        """
+        if self.file_mime_type and self.file_mime_type.startswith("image/"):
+            queue_image_variants(self.file.name)
+
+    @hook(AFTER_DELETE)
+    def delete_unreferenced_file(self):
+        """
+        Delete the stored file and its variants once no entry refers to it anymore.
+
+        Only files uploaded to the library are deleted, the ones of other models' image
+        fields belong to those models.
+        """
+        name = self.file.name
+        if not name or not name.startswith(MEDIA_LIBRARY_UPLOAD_DIRECTORY):
+            return
+        if MediaLibrary.objects.filter(file_hash=self.file_hash, file=name).exists():
+            return
+        storage = self.file.storage
+        transaction.on_commit(lambda: storage.delete(name))
+        delete_variants(name)
+
+    class Meta:
+        verbose_name = "Media Library"
+        verbose_name_plural = "Media Libraries"
+        indexes = [
+            # Covers the file lookup in CreateMediaLibraryMixin with an index-only scan
+            models.Index(
+                fields=["content_type", "object_id"],
+                include=["file"],
+                name="medialibrary_object_idx",
+            ),
+            # Finds an identical earlier upload, see MediaLibraryManager.store_upload
+            models.Index(fields=["file_hash"], name="medialibrary_file_hash_idx"),
+        ]
+
+
+class MediaVariant(TimeStampedModel, models.Model):
+    """
+    A resized copy of an uploaded image in a modern format, so pages can serve the
+    smallest image that fits instead of the original upload.
+
+    Variants are generated by the generate_image_variants task for every size in
+    IMAGE_VARIANT_SIZES and format in IMAGE_VARIANT_FORMATS, and looked up by the storage
+    name of their original with the helpers in apps.main.variants.
+
+    Attributes:
+        source (CharField): The storage name of the original image.
+        name (CharField): The size of the variant, a key of IMAGE_VARIANT_SIZES.
+        format (CharField): The image format of the variant, e.g. "webp".
+        file (FileField): The variant image.
+        width (PositiveIntegerField): The width of the variant in pixels.
+        height (PositiveIntegerField): The height of the variant in pixels.
+        size (PositiveIntegerField): The size of the variant in bytes.
+    """
+
+    source = models.CharField(max_length=255)
+    name = models.CharField(max_length=50)
+    format = models.CharField(max_length=10)
+    file = models.FileField(upload_to="media_variants/", max_length=255)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    size = models.PositiveIntegerField()
+
+    def __str__(self) -> str:
+        return f"{os.path.basename(self.source)} ({self.name}, {self.format})"
+
+    class Meta:
+        verbose_name = "Media Variant"
+        verbose_name_plural = "Media Variants"
+        constraints = [
+            # Its index also serves the lookups of a source's variants
+            models.UniqueConstraint(
+                fields=["source", "name", "format"], name="unique_media_variant"
+            ),
+        ]
@@ -0,0 +1,244 @@
+from typing import Callable, List, Optional
+
+import auto_prefetch
+from django_lifecycle import (
+    LifecycleModelMixin,
+    hook,
+    AFTER_SAVE,
+    AFTER_DELETE,
+)
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.main.html import RenderedHTMLMixin
+
+
+class NotificationQuerySet(auto_prefetch.QuerySet):
+    """
+    A custom queryset for the Notification model.
+    """
+
+    def mark_as_read(self) -> int:
+        """
+        Mark the unread notifications in the queryset as read with a single UPDATE.
+
+        Callers are responsible for invalidating the affected users' unread summaries.
+
+        :return: The number of notifications that were changed.
+        """
+        return self.filter(is_read=False).update(
+            is_read=True, updated_at=timezone.now()
+        )
+
+
+class NotificationManager(models.Manager.from_queryset(NotificationQuerySet)):
+    """
+    A custom manager for the Notification model.
+    """
+
+    @staticmethod
+    def unread_summary_key(user_id: int) -> str:
+        """
+        Return the cache key holding a user's unread notification summary.
+        """
+        return f"notifications:unread:{user_id}"
+
+    def get_unread_summary(self, user_id: int) -> dict:
+        """
+        Get the number of unread notifications for a user and the latest of them.
+
+        The summary is cached per user until a notification of theirs changes, so pages
+        never load a user's whole unread backlog into memory.
+
+        :param user_id: The primary key of the user.
+        :return: A dict with the unread "count" and the newest unread "items".
+        """
+        key = self.unread_summary_key(user_id)
+        summary = cache.get(key)
+        if summary is None:
+            unread = self.filter(user_id=user_id, is_read=False)
+            summary = {
+                "count": unread.count(),
+                "items": list(
+                    unread.order_by("-created_at")[: settings.NOTIFICATION_SUMMARY_SIZE]
+                ),
+            }
+            cache.set(key, summary, settings.NOTIFICATION_SUMMARY_TIMEOUT)
+        return summary
+
+    def invalidate_unread_summary(self, *user_ids: int) -> None:
+        """
+        Drop the cached unread summaries of the given users once the current transaction
+        commits, so no request can cache the old summary again in the meantime.
+        """
+        keys = [self.unread_summary_key(user_id) for user_id in user_ids]
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+    def broadcast_batch(
+        self,
+        notification: "Notification",
+        users=None,
+        start_after: int = 0,
+        batch_size: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Create the notification for the next batch of users in a single insert.
+
+        Users are walked in primary key order, so the last returned id can be passed back
+        as `start_after` to continue, or to resume a broadcast that was interrupted.
+
+        :param notification: An unsaved notification whose title, message, link and type
+            are copied for every user.
+        :param users: A queryset of users to notify. Defaults to every active user.
+        :param start_after: Only notify users with a primary key greater than this.
+        :param batch_size: How many users to notify. Defaults to NOTIFICATION_BROADCAST_BATCH_SIZE.
+        :return: The primary keys of the users notified, empty once no users are left.
+        """
+        if users is None:
+            users = get_user_model().objects.filter(is_active=True)
+        batch_size = batch_size or settings.NOTIFICATION_BROADCAST_BATCH_SIZE
+
+        user_ids = list(
+            users.filter(pk__gt=start_after)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not user_ids:
+            return user_ids
+
+        # bulk_create skips save(), so render the message once for the whole batch
+        notification.render_html_fields()
+        self.bulk_create(
+            [
+                self.model(
+                    user_id=user_id,
+                    title=notification.title,
+                    message=notification.message,
+                    message_html=notification.message_html,
+                    link=notification.link,
+                    type=notification.type,
+                )
+                for user_id in user_ids
+            ]
+        )
+        self.invalidate_unread_summary(*user_ids)
+        return user_ids
+
+    def broadcast(
+        self,
+        notification: "Notification",
+        users=None,
+        start_after: int = 0,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> int:
+        """
+        Notify every user in `users`, one batch of NOTIFICATION_BROADCAST_BATCH_SIZE at a
+        time.
+
+        Each batch is committed on its own, so a failed broadcast can be resumed by
+        passing the last id reported to `progress` as `start_after`. Use the
+        broadcast_notification task to run this in the background.
+
+        :param notification: An unsaved notification copied for every user, see broadcast_batch.
+        :param progress: Called after each batch with the last user id and the running total.
+        :return: The number of notifications created.
+        """
+        total = 0
+        while True:
+            user_ids = self.broadcast_batch(
+                notification, users=users, start_after=start_after
+            )
+            if not user_ids:
+                return total
+
+            total += len(user_ids)
+            start_after = user_ids[-1]
+            if progress:
+                progress(start_after, total)
+
+
+class Notification(RenderedHTMLMixin, LifecycleModelMixin, auto_prefetch.Model):
+    """
+    Notification model to handle user notifications.
+
+    Attributes:
+        user (User): The user to whom the notification belongs.
+        title (str): The title of the notification.
+        message (str): The message content of the notification.
+        message_html (str): The sanitized message, rendered when the notification is saved.
+        link (str): The URL to which the notification redirects.
+        is_read (bool): Flag to check if the notification has been read.
+        created_at (DateTimeField): The time the notification was created.
+        updated_at (DateTimeField): The time the notification was last updated.
+    """
+
+    user = auto_prefetch.ForeignKey(
+        "users.User", on_delete=models.CASCADE, related_name="notifications"
+    )
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    message_html = models.TextField(blank=True, default="", editable=False)
+    link = models.URLField()
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    TYPES = [
+        ("info", "Info"),
+        ("warning", "Warning"),
+        ("danger", "Danger"),
+        ("success", "Success"),
+    ]
+    type = models.CharField(max_length=10, choices=TYPES, default="info")
+
+    objects = NotificationManager()
+
+    html_fields = ["message"]
+
+    class Meta(auto_prefetch.Model.Meta):
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at"],
+                condition=Q(is_read=False),
+                name="notification_unread_idx",
+            ),
+        ]
+
+    def get_absolute_url(self) -> str:
+        """
+        Get the URL that allows users to mark the notification as read
+        and be redirected to the destination URL.
+
+        The link is URL-encoded to safely include it as a URL parameter.
+
+        :return: URL as a string
+        """
+        return reverse(
+            "mark_as_read_and_redirect",
+            kwargs={"notification_id": self.pk, "destination_url": self.link},
+        )
+
+    def mark_as_read(self) -> None:
+        """
+        Mark the notification as read without rewriting the rest of the row.
+        """
+        if Notification.objects.filter(pk=self.pk).mark_as_read():
+            Notification.objects.invalidate_unread_summary(self.user_id)
+        self.is_read = True
+
+    def __str__(self) -> str:
+        return self.title
+
+    @hook(AFTER_SAVE)
+    @hook(AFTER_DELETE)
+    def clear_unread_summary(self):
+        """
+        Drop the owner's cached unread summary whenever the notification changes.
+        """
+        Notification.objects.invalidate_unread_summary(self.user_id)
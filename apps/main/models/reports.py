@@ -0,0 +1,344 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+import auto_prefetch
+from django_lifecycle import (
+    LifecycleModel,
+    hook,
+    AFTER_CREATE,
+)
+
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.urls import reverse
+from django.utils import timezone
+from model_utils.models import TimeStampedModel
+from procrastinate.exceptions import AlreadyEnqueued
+
+from apps.main.tasks import (
+    moderate_reported_objects,
+    send_email_task,
+)
+
+
+class ReportQuerySet(auto_prefetch.QuerySet):
+    """
+    A custom queryset for the Report model.
+    """
+
+    def counts_for(self, objects: Iterable[models.Model]) -> Dict[int, int]:
+        """
+        Count the reports of several objects of the same model in one grouped query.
+
+        Useful for objects that do not carry a reports_count column, or to check the
+        stored counters against the reports that actually exist.
+
+        Args:
+            objects (Iterable[Model]): The objects to count reports for, e.g. a page of comments.
+
+        Returns:
+            Dict[int, int]: The number of reports keyed by object primary key.
+        """
+        objects = list(objects)
+        if not objects:
+            return {}
+
+        content_type = ContentType.objects.get_for_model(objects[0])
+        rows = (
+            self.filter(
+                content_type=content_type, object_id__in=[obj.pk for obj in objects]
+            )
+            .values("object_id")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        counts = {row["object_id"]: row["count"] for row in rows}
+        return {obj.pk: counts.get(obj.pk, 0) for obj in objects}
+
+    def targets_by_model(self) -> Dict[type, List[int]]:
+        """
+        Group the reported objects by model, keeping only the reportable ones.
+
+        Returns:
+            Dict[type, List[int]]: The primary keys of the reported objects keyed by model.
+        """
+        rows = (
+            self.prefetch_related(None)
+            .order_by()
+            .values_list("content_type", "object_id")
+            .distinct()
+        )
+        targets = defaultdict(list)
+        for content_type_id, object_id in rows:
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            if model is not None and issubclass(model, ReportableObject):
+                targets[model].append(object_id)
+        return targets
+
+    def deactivate_targets(self) -> int:
+        """
+        Deactivate the objects reported in the queryset with one UPDATE per model.
+
+        Returns:
+            int: The number of objects that were deactivated.
+        """
+        return sum(
+            model.get_base_queryset()
+            .filter(pk__in=ids, active=True)
+            .update(active=False)
+            for model, ids in self.targets_by_model().items()
+        )
+
+    def dismiss(self) -> int:
+        """
+        Delete the reports in the queryset.
+
+        Their objects' reports_count is kept up to date by decrement_reports_count, which
+        also runs for queryset deletes.
+
+        Returns:
+            int: The number of reports that were deleted.
+        """
+        deleted, _ = self.prefetch_related(None).delete()
+        return deleted
+
+
+class Report(auto_prefetch.Model, TimeStampedModel, LifecycleModel):
+    """
+    A flexible report model for reporting inappropriate content across various models.
+
+    Attributes:
+        content_type (ContentType): The type of object being reported.
+        object_id (int): The primary key of the related object being reported.
+        content_object (GenericForeignKey): The generic foreign key to the related object.
+        reporter (ForeignKey): The user who created the report.
+        reason (TextField): The reason for the report.
+    """
+
+    content_type = auto_prefetch.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveIntegerField()
+    content_object = GenericForeignKey("content_type", "object_id")
+    reporter = auto_prefetch.ForeignKey(
+        "users.User", on_delete=models.CASCADE, related_name="reports"
+    )
+    reason = models.TextField()
+
+    objects = auto_prefetch.Manager.from_queryset(ReportQuerySet)()
+
+    class Meta(auto_prefetch.Model.Meta):
+        verbose_name = "Report"
+        verbose_name_plural = "Reports"
+        indexes = [
+            models.Index(fields=["created"], name="report_created_idx"),
+        ]
+        constraints = [
+            # Also serves the (content_type, object_id) lookups of an object's reports
+            models.UniqueConstraint(
+                fields=["content_type", "object_id", "reporter"],
+                name="unique_report_per_reporter",
+            ),
+        ]
+
+    @hook(AFTER_CREATE)
+    def increment_reports_count(self):
+        """
+        Add this report to the reported object's reports_count.
+
+        Deleted reports are removed from it by decrement_reports_count.
+        """
+        self.update_reports_count(F("reports_count") + 1)
+
+    def update_reports_count(self, value) -> None:
+        """
+        Apply an UPDATE expression to the reports_count of the reported object.
+
+        Reports against models that are not a ReportableObject are ignored.
+        """
+        model = self.content_type.model_class()
+        if model is not None and issubclass(model, ReportableObject):
+            model.get_base_queryset().filter(pk=self.object_id).update(
+                reports_count=value
+            )
+
+    @hook(AFTER_CREATE)
+    def queue_moderation(self):
+        """
+        Queue a moderation run to check the reported object against its threshold.
+
+        Only one run is queued at a time, so a burst of reports is handled by a single
+        job that processes all of them at once.
+        """
+        try:
+            # The savepoint keeps the surrounding transaction usable when the queueing
+            # lock rejects the job
+            with transaction.atomic():
+                moderate_reported_objects.defer(
+                    timestamp=int(timezone.now().timestamp())
+                )
+        except AlreadyEnqueued:
+            pass
+
+    @hook(AFTER_CREATE)
+    def send_notification_email(self):
+        """
+        Send an email to the admin when a new report is created.
+        """
+        subject = "Report Received: Thank You"
+        message = f"""
+            Thank you for submitting a report. 
+        
+            Your report has been received and will be reviewed by our moderation team.
+        
+            Report details:
+            - Report ID: {self.id}
+            - Submitted on: {self.created}
+        
+            We appreciate your help in keeping our community safe.
+            """
+        from_email = settings.DEFAULT_FROM_EMAIL
+        recipient_list = [self.reporter.email]
+
+        send_email_task.defer(
+            subject=subject,
+            message=message,
+            from_email=from_email,
+            recipient_list=recipient_list,
+        )
+
+
+@receiver(post_delete, sender=Report)
+def decrement_reports_count(sender, instance: Report, **kwargs) -> None:
+    """
+    Remove a deleted report from the reported object's reports_count.
+
+    A signal rather than a lifecycle hook, as hooks only run for Report.delete(), while
+    the signal is also sent for queryset deletes, the admin's delete action and reports
+    deleted along with their reporter.
+    """
+    instance.update_reports_count(Greatest(F("reports_count") - 1, 0))
+
+
+class ReportableObject(models.Model):
+    """Model to be attached to models that can be reported."""
+
+    active = models.BooleanField(default=True)
+    # Maintained by the Report hooks so listing reported objects needs no extra queries
+    reports_count = models.PositiveIntegerField(default=0, editable=False)
+    # When a moderator last reactivated the object. Only reports filed later count towards
+    # automatic deactivation, so the reports they reviewed don't deactivate it again.
+    moderated_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    # The name of the model in report URLs. Defaults to the model name.
+    report_name: Optional[str] = None
+    # Reports within MODERATION_WINDOW_SECONDS that deactivate an object automatically.
+    # Defaults to MODERATION_REPORT_THRESHOLD, 0 turns automatic moderation off.
+    report_threshold: Optional[int] = None
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def get_base_queryset(cls) -> models.QuerySet:
+        """
+        Return every object of this model, including any its default manager hides, so
+        counters and moderation also reach inactive objects.
+
+        Returns:
+            QuerySet: The objects of this model.
+        """
+        return cls._base_manager.all()
+
+    @classmethod
+    def get_report_name(cls) -> str:
+        """
+        Return the name identifying this model in report URLs.
+
+        Returns:
+            str: The report_name attribute, or the model name if it is not set.
+        """
+        return cls.report_name or cls._meta.model_name
+
+    @classmethod
+    def get_report_threshold(cls) -> int:
+        """
+        Return how many recent reports deactivate an object of this model.
+
+        Returns:
+            int: The report_threshold attribute, or MODERATION_REPORT_THRESHOLD if it is
+                not set. 0 means objects are never deactivated automatically.
+        """
+        if cls.report_threshold is not None:
+            return cls.report_threshold
+        return settings.MODERATION_REPORT_THRESHOLD
+
+    def report(self, reporter, reason):
+        """
+        Report this object as inappropriate or violating terms.
+
+        Each user can report an object once. Reporting it again returns the existing
+        report without counting it twice or sending another email.
+
+        Args:
+            reporter: The User who is creating the report.
+            reason: Text explaining why the object is being reported.
+
+        Returns:
+            Report: The new Report instance, or the reporter's existing one.
+        """
+
+        content_type = ContentType.objects.get_for_model(self)
+
+        report, created = Report.objects.get_or_create(
+            content_type=content_type,
+            object_id=self.pk,
+            reporter=reporter,
+            defaults={"reason": reason},
+        )
+        if created:
+            self.refresh_from_db(fields=["reports_count"])
+
+        return report
+
+    def deactivate(self):
+        """
+        Deactivate this object. Must be implemented by any class inheriting from ReportableObject.
+        This method should handle the specific deactivation logic for the model.
+
+        Example implementation:
+            def deactivate(self):
+                self.active = False
+                self.save()
+                # Add any additional deactivation logic here
+        """
+        self.active = False
+        self.save(update_fields=["active"])
+
+    def activate(self):
+        """
+        Reactivate this object after a moderator reviewed its reports.
+
+        The reports filed so far no longer count towards automatic deactivation, see
+        moderated_at.
+        """
+        self.active = True
+        self.moderated_at = timezone.now()
+        self.save(update_fields=["active", "moderated_at"])
+
+    @property
+    def report_url(self):
+        """
+        Returns the URL for reporting this object.
+
+        Returns:
+            str: The URL to report this object.
+        """
+        return reverse(
+            "report",
+            kwargs={"model_name": self.get_report_name(), "object_id": self.pk},
+        )
@@ -0,0 +1,293 @@
+import base64
+import binascii
+import datetime
+import json
+from collections.abc import Sequence
+from typing import Any, List, Optional, Tuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.db.models.options import Options
+from django.utils.functional import cached_property
+
+NEXT = "n"
+PREVIOUS = "p"
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    JSON encoder for cursor values that keeps the full microsecond precision of datetimes,
+    which DjangoJSONEncoder truncates to milliseconds.
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def estimate_count(queryset: QuerySet) -> int:
+    """
+    Estimate the number of rows in a queryset without running COUNT(*).
+
+    Unfiltered querysets use the row count Postgres keeps in pg_class.reltuples, filtered
+    ones the row estimate of the query plan. Tables that have never been analyzed fall
+    back to an exact count.
+
+    Args:
+        queryset (QuerySet): The queryset to estimate.
+
+    Returns:
+        int: The estimated number of rows.
+    """
+    if queryset.query.where:
+        plan = json.loads(queryset.explain(format="json"))
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+
+    if row is None or row[0] < 0:
+        return queryset.count()
+    return row[0]
+
+
+class KeysetPage(Sequence):
+    """
+    A single page of a KeysetPaginator.
+
+    Behaves like a list of the page's objects and exposes opaque cursors for the
+    neighbouring pages instead of page numbers.
+    """
+
+    def __init__(
+        self,
+        object_list: List[Any],
+        paginator: "KeysetPaginator",
+        has_next: bool,
+        has_previous: bool,
+    ):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    def __repr__(self) -> str:
+        return f"<KeysetPage of {len(self.object_list)} objects>"
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    @property
+    def next_cursor(self) -> Optional[str]:
+        """
+        The cursor of the page after this one, or None on the last page.
+        """
+        if not self.has_next:
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1], NEXT)
+
+    @property
+    def previous_cursor(self) -> Optional[str]:
+        """
+        The cursor of the page before this one, or None on the first page.
+        """
+        if not self.has_previous:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], PREVIOUS)
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by the values of its ordering fields instead of by offset.
+
+    Every page is fetched with a `WHERE (ordering) < (cursor)` condition and a LIMIT, so
+    deep pages cost the same as the first one and no COUNT(*) is needed to navigate.
+    The ordering must end with a unique field; the primary key is appended if missing.
+
+    Example:
+        paginator = KeysetPaginator(Comment.objects.all(), 20, ordering=["-created"])
+        page = paginator.get_page(request.GET.get("cursor"))
+    """
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        per_page: int,
+        ordering: Optional[List[str]] = None,
+        estimate: bool = False,
+    ):
+        """
+        Args:
+            queryset (QuerySet): The queryset to paginate.
+            per_page (int): The number of objects per page.
+            ordering (Optional[List[str]]): Field names to order by, "-" for descending.
+                Defaults to the model's Meta.ordering.
+            estimate (bool): Whether `count` should be estimated from Postgres statistics
+                instead of running COUNT(*).
+
+        Raises:
+            ValueError: If the ordering uses a related or nullable field. The cursor
+                conditions compare plain values, so they would skip NULLs and rows
+                ordered through a join.
+        """
+        ordering = list(ordering or queryset.model._meta.ordering)
+        if not {"pk", "-pk", "id", "-id"} & set(ordering):
+            descending = bool(ordering) and ordering[-1].startswith("-")
+            ordering.append("-pk" if descending else "pk")
+        for field in ordering:
+            self._check_ordering_field(queryset.model._meta, field.lstrip("-"))
+
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = ordering
+        self.estimate = estimate
+
+    @staticmethod
+    def _check_ordering_field(opts: Options, name: str) -> None:
+        """
+        Raise a ValueError unless the field is a non-nullable column of the model.
+        """
+        if name == "pk":
+            return
+        try:
+            field = opts.get_field(name)
+        except FieldDoesNotExist as error:
+            raise ValueError(
+                f"Can't paginate {opts.label} by {name!r}, it isn't one of its fields."
+            ) from error
+        if field.is_relation or field.null:
+            raise ValueError(
+                f"Can't paginate {opts.label} by {name!r}, only by non-nullable fields "
+                "that aren't relations."
+            )
+
+    @cached_property
+    def fields(self) -> List[Tuple[str, bool]]:
+        """
+        The ordering as (field name, descending) pairs.
+        """
+        return [(field.lstrip("-"), field.startswith("-")) for field in self.ordering]
+
+    @cached_property
+    def count(self) -> int:
+        """
+        The total number of objects, estimated if the paginator was created with estimate=True.
+        """
+        if self.estimate:
+            return estimate_count(self.queryset)
+        return self.queryset.count()
+
+    def encode_cursor(self, obj, direction: str) -> str:
+        """
+        Encode the ordering values of an object into an opaque, URL-safe cursor.
+
+        Args:
+            obj: The first or last object of a page.
+            direction (str): NEXT to continue after the object, PREVIOUS to go back before it.
+
+        Returns:
+            str: The cursor.
+        """
+        values = [getattr(obj, name) for name, _ in self.fields]
+        payload = json.dumps([direction, values], cls=CursorEncoder)
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> Tuple[str, List[Any]]:
+        """
+        Decode a cursor created by encode_cursor.
+
+        Args:
+            cursor (str): The cursor.
+
+        Returns:
+            Tuple[str, List[Any]]: The direction and the ordering values.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        opts = self.queryset.model._meta
+        try:
+            padding = "=" * (-len(cursor) % 4)
+            direction, values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            if direction not in (NEXT, PREVIOUS) or len(values) != len(self.fields):
+                raise ValueError("Invalid cursor")
+            values = [
+                (opts.pk if name == "pk" else opts.get_field(name)).to_python(value)
+                for (name, _), value in zip(self.fields, values)
+            ]
+        except (
+            binascii.Error,
+            TypeError,
+            UnicodeDecodeError,
+            ValueError,
+            ValidationError,
+        ) as error:
+            raise ValueError("Invalid cursor") from error
+
+        return direction, values
+
+    def get_page(self, cursor: Optional[str] = None) -> KeysetPage:
+        """
+        Return the page a cursor points to. Missing or invalid cursors return the first page.
+
+        Args:
+            cursor (Optional[str]): A cursor taken from a page's next_cursor or previous_cursor.
+
+        Returns:
+            KeysetPage: The page of objects.
+        """
+        direction, values = NEXT, None
+        if cursor:
+            try:
+                direction, values = self.decode_cursor(cursor)
+            except ValueError:
+                pass
+
+        backwards = direction == PREVIOUS
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self._after(values, backwards))
+
+        ordering = self.ordering
+        if backwards:
+            ordering = [
+                field[1:] if field.startswith("-") else f"-{field}"
+                for field in ordering
+            ]
+
+        # Fetch one extra object to find out whether there is another page
+        objects = list(queryset.order_by(*ordering)[: self.per_page + 1])
+        has_more = len(objects) > self.per_page
+        objects = objects[: self.per_page]
+
+        if backwards:
+            objects.reverse()
+            return KeysetPage(objects, self, has_next=True, has_previous=has_more)
+        return KeysetPage(
+            objects, self, has_next=has_more, has_previous=values is not None
+        )
+
+    def _after(self, values: List[Any], backwards: bool) -> Q:
+        """
+        Build the condition selecting the rows that come after the cursor values.
+
+        For an ordering (a, b) this is `a > x OR (a = x AND b > y)`, with the comparison
+        flipped for descending fields and when paging backwards.
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+        for (name, descending), value in zip(self.fields, values):
+            lookup = "lt" if descending != backwards else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
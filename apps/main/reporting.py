@@ -0,0 +1,166 @@
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Type
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Count, Model
+from django.utils import timezone
+
+
+@lru_cache(maxsize=None)
+def get_reportable_models() -> Dict[str, Type[Model]]:
+    """
+    Return every installed model inheriting from ReportableObject, keyed by report name.
+
+    Built on first use, once all models are loaded, so resolving the model of a report
+    URL is a dictionary lookup instead of a ContentType query per request. The models
+    are found through the app registry rather than imported, as the tasks module, which
+    the models import, uses this module.
+
+    Returns:
+        Dict[str, Type[Model]]: The reportable models by the name used in report URLs.
+
+    Raises:
+        ImproperlyConfigured: If two reportable models share a report name. Set
+            `report_name` on one of them to tell them apart.
+    """
+    registry = {}
+    for model in apps.get_models():
+        # Only ReportableObject defines get_report_name
+        if not hasattr(model, "get_report_name"):
+            continue
+
+        name = model.get_report_name()
+        if name in registry:
+            raise ImproperlyConfigured(
+                f"{model._meta.label} and {registry[name]._meta.label} are both "
+                f"reportable as '{name}'. Set report_name on one of them."
+            )
+        registry[name] = model
+    return registry
+
+
+def get_reportable_model(name: str) -> Optional[Type[Model]]:
+    """
+    Return the reportable model a report URL refers to.
+
+    Args:
+        name (str): The report name from the URL.
+
+    Returns:
+        Optional[Type[Model]]: The model, or None if no reportable model has
+            that name.
+    """
+    return get_reportable_models().get(name)
+
+
+def get_reportable_content_type(name: str) -> Optional[ContentType]:
+    """
+    Return the content type of the reportable model a report URL refers to.
+
+    Content types are cached per process by ContentType.objects.get_for_model, so only
+    the first lookup of each model queries the database.
+
+    Args:
+        name (str): The report name from the URL.
+
+    Returns:
+        Optional[ContentType]: The content type, or None if no reportable model has
+            that name.
+    """
+    model = get_reportable_model(name)
+    if model is None:
+        return None
+    return ContentType.objects.get_for_model(model)
+
+
+def deactivate_reported_objects() -> int:
+    """
+    Deactivate every active object with at least its model's report threshold of
+    reports in the last MODERATION_WINDOW_SECONDS, not counting the reports filed before
+    a moderator reactivated it.
+
+    The window is counted with one grouped query over the recent reports, and the
+    objects of each model are deactivated with a single UPDATE, so a run costs the same
+    for one report as for thousands. Use ReportableObject.deactivate for one object.
+
+    Returns:
+        int: The number of objects deactivated.
+    """
+    models_by_content_type = {
+        ContentType.objects.get_for_model(model).pk: model
+        for model in get_reportable_models().values()
+        if model.get_report_threshold() > 0
+    }
+    if not models_by_content_type:
+        return 0
+
+    lowest_threshold = min(
+        model.get_report_threshold() for model in models_by_content_type.values()
+    )
+    report_model = apps.get_model("main", "Report")
+    since = timezone.now() - timedelta(seconds=settings.MODERATION_WINDOW_SECONDS)
+    rows = (
+        report_model.objects.filter(
+            created__gte=since, content_type__in=list(models_by_content_type)
+        )
+        .values("content_type", "object_id")
+        .annotate(count=Count("id"))
+        .filter(count__gte=lowest_threshold)
+        .order_by()
+    )
+
+    object_ids: Dict[Type[Model], List[int]] = defaultdict(list)
+    for row in rows:
+        model = models_by_content_type[row["content_type"]]
+        if row["count"] >= model.get_report_threshold():
+            object_ids[model].append(row["object_id"])
+
+    return sum(
+        model.get_base_queryset()
+        .filter(pk__in=exclude_moderated(model, ids, since), active=True)
+        .update(active=False)
+        for model, ids in object_ids.items()
+    )
+
+
+def exclude_moderated(model: Type[Model], ids: List[int], since: datetime) -> List[int]:
+    """
+    Drop the objects that no longer reach the report threshold once the reports filed
+    before a moderator reactivated them are left out.
+
+    Only the objects reactivated within the window are counted again, which are few, so
+    the common case costs a single query.
+
+    Args:
+        model (Type[Model]): The reportable model.
+        ids (List[int]): The primary keys of its objects past the threshold.
+        since (datetime): The start of the moderation window.
+
+    Returns:
+        List[int]: The primary keys of the objects still past the threshold.
+    """
+    moderated = dict(
+        model.get_base_queryset()
+        .filter(pk__in=ids, moderated_at__gt=since)
+        .values_list("pk", "moderated_at")
+    )
+    if not moderated:
+        return ids
+
+    reports = apps.get_model("main", "Report").objects.filter(
+        content_type=ContentType.objects.get_for_model(model),
+        object_id__in=list(moderated),
+        created__gt=min(moderated.values()),
+    )
+    counts = Counter(
+        object_id
+        for object_id, created in reports.values_list("object_id", "created")
+        if created > moderated[object_id]
+    )
+    threshold = model.get_report_threshold()
+    return [pk for pk in ids if pk not in moderated or counts[pk] >= threshold]
@@ -1,13 +1,23 @@
 import logging
 import smtplib
 
+from django.apps import apps
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
 from django.core.mail import send_mail
+from django.db import transaction
 
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 
+from procrastinate import RetryStrategy
 from procrastinate.contrib.django import app
+from procrastinate.exceptions import AlreadyEnqueued
+
+from apps.main.reporting import deactivate_reported_objects
+from apps.main.uploads import delete_abandoned_direct_uploads
+from apps.main.variants import generate_variants
 
 logger = logging.getLogger("procrastinate")
 
@@ -53,3 +63,144 @@ def notify_by_slack(message: str) -> None:
         return
 
     send_slack_message.defer(message)
+
+
+@app.task(retry=RetryStrategy(max_attempts=5, exponential_wait=2))
+def broadcast_notification(
+    title: str,
+    message: str,
+    link: str,
+    notification_type: str = "info",
+    start_after: int = 0,
+) -> None:
+    """
+    Notify the next batch of active users, then queue the job for the following batch.
+
+    Each job inserts one batch and defers its successor in the same transaction, so a
+    failed job is retried from its own cursor without duplicating earlier batches.
+
+    :param title: The title of the notification.
+    :param message: The message content of the notification.
+    :param link: The URL the notification redirects to.
+    :param notification_type: The notification type, one of Notification.TYPES.
+    :param start_after: The primary key of the last user already notified.
+    """
+    notification_model = apps.get_model("main", "Notification")
+    notification = notification_model(
+        title=title, message=message, link=link, type=notification_type
+    )
+
+    with transaction.atomic():
+        user_ids = notification_model.objects.broadcast_batch(
+            notification, start_after=start_after
+        )
+        if not user_ids:
+            logger.info("Broadcast %r finished after user %s", title, start_after)
+            return
+
+        broadcast_notification.defer(
+            title=title,
+            message=message,
+            link=link,
+            notification_type=notification_type,
+            start_after=user_ids[-1],
+        )
+
+    logger.info(
+        "Broadcast %r notified %s users up to user %s",
+        title,
+        len(user_ids),
+        user_ids[-1],
+    )
+
+
+@app.task()
+def create_report(
+    content_type_id: int, object_id: int, reporter_id: int, reason: str
+) -> None:
+    """
+    Store a report queued by the report view.
+
+    Reporting is idempotent, so a job that runs twice, or a user reporting the same
+    object again, never creates a second report. Reports of objects or users that no
+    longer exist are dropped.
+
+    :param content_type_id: The primary key of the reported object's content type.
+    :param object_id: The primary key of the reported object.
+    :param reporter_id: The primary key of the user who filed the report.
+    :param reason: Text explaining why the object is being reported.
+    """
+    model = ContentType.objects.get_for_id(content_type_id).model_class()
+    # Only ReportableObject defines get_base_queryset, which also finds inactive objects
+    get_queryset = getattr(model, "get_base_queryset", None)
+    obj = get_queryset().filter(pk=object_id).first() if get_queryset else None
+    reporter = get_user_model().objects.filter(pk=reporter_id).first()
+    if obj is None or reporter is None:
+        logger.info(
+            "Dropped report of %s %s by user %s",
+            content_type_id,
+            object_id,
+            reporter_id,
+        )
+        return
+
+    obj.report(reporter=reporter, reason=reason)
+
+
+@app.periodic(cron="* * * * *")
+@app.task(queueing_lock="moderate_reported_objects")
+def moderate_reported_objects(timestamp: int) -> None:
+    """
+    Deactivate the objects that received too many reports recently.
+
+    Runs every minute and after new reports. The queueing lock keeps at most one run
+    waiting, so the reports filed in the meantime are handled together by the next run.
+
+    :param timestamp: When the run was queued, as a Unix timestamp.
+    """
+    deactivated = deactivate_reported_objects()
+    if deactivated:
+        logger.info("Moderation deactivated %s reported objects", deactivated)
+
+
+@app.periodic(cron="0 * * * *")
+@app.task(queueing_lock="clean_direct_uploads")
+def clean_direct_uploads(timestamp: int) -> None:
+    """
+    Delete the files browsers uploaded to the bucket but never reported as done.
+
+    Runs every hour, see delete_abandoned_direct_uploads.
+
+    :param timestamp: When the run was queued, as a Unix timestamp.
+    """
+    deleted = delete_abandoned_direct_uploads()
+    if deleted:
+        logger.info("Deleted %s abandoned direct uploads", deleted)
+
+
+@app.task()
+def generate_image_variants(source: str) -> None:
+    """
+    Generate the missing resized variants of an uploaded image.
+
+    :param source: The storage name of the original image.
+    """
+    variants = generate_variants(source)
+    logger.info("Generated %s variants of %s", len(variants), source)
+
+
+def queue_image_variants(source: str) -> None:
+    """
+    Queue the generation of an image's variants, unless it is already queued.
+
+    :param source: The storage name of the original image.
+    """
+    try:
+        # The savepoint keeps the surrounding transaction usable when the queueing lock
+        # rejects the job
+        with transaction.atomic():
+            generate_image_variants.configure(
+                queueing_lock=f"image_variants:{source}"
+            ).defer(source=source)
+    except AlreadyEnqueued:
+        pass
@@ -1,6 +1,6 @@
 from django import template
-from django.core.cache import cache
 
+from apps.main.cache import CACHE_DEPENDENT_TIMEOUT, get_or_set
 from apps.main.consts import ContactStatus
 from apps.main.forms import ReportForm
 from apps.main.models import SocialMediaLink
@@ -42,10 +42,12 @@ def social_media_row():
     Grab social media links from the database and return them to the template.
     :return: A dictionary containing the social media links.
     """
-    links = cache.get("social_media_links")
-    if links is None:
-        links = list(SocialMediaLink.objects.all())
-        cache.set("social_media_links", links, 3600)
+    links = get_or_set(
+        "social_media_links",
+        lambda: list(SocialMediaLink.objects.all()),
+        CACHE_DEPENDENT_TIMEOUT,
+        depends_on=[SocialMediaLink],
+    )
     return {"links": links}
 
 
@@ -67,7 +69,7 @@ def report_button(context, obj):
     form = ReportForm()
 
     return {
-        "model_type": obj._meta.model_name,
+        "model_type": obj.get_report_name(),
         "object_id": obj.pk,
         "object": obj,
         "report_form": form,
@@ -113,6 +115,30 @@ def pagination_numbers(context):
     return context
 
 
+@register.simple_tag(takes_context=True)
+def get_cursor_link(context, cursor):
+    """
+    Get the link to a page of a KeysetPaginator, keeping the other query parameters
+    """
+    request = context["request"]
+    query_dict = request.GET.copy()
+    query_dict.pop("page", None)
+    query_dict["cursor"] = cursor
+    return f"{request.path_info}?{query_dict.urlencode()}"
+
+
+@register.inclusion_tag("components/cursor_pagination.html", takes_context=True)
+def cursor_pagination(context):
+    """
+    Render previous and next links for a KeysetPage, the cursor based counterpart of
+    pagination_numbers for lists too large to count and offset through. The total is only
+    shown when the paginator estimates it, so rendering never runs a COUNT(*)
+    """
+    paginator = context["page_obj"].paginator
+    context["estimated_count"] = paginator.count if paginator.estimate else None
+    return context
+
+
 @register.filter
 def get_query_param(request, param_name):
     """
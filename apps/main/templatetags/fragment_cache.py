@@ -0,0 +1,174 @@
+import hashlib
+from typing import List, NamedTuple, Type
+
+from django import template
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+from django.utils import translation
+from django.utils.safestring import mark_safe
+from waffle import flag_is_active
+
+from apps.main.cache import get_or_set
+
+register = template.Library()
+
+SLOT_MARKER = "<!--fragment-slot:{}-->"
+
+
+class FragmentOptions(NamedTuple):
+    """
+    The options of a {% cachedfragment %} tag after its name.
+    """
+
+    # Extra values the cache key varies on
+    vary_on: List[template.base.FilterExpression]
+    # Waffle flags whose state the cache key varies on
+    flags: List[str]
+    # Models whose changes render the fragment again
+    depends_on: List[Type[models.Model]]
+
+
+class UncachedNode(template.Node):
+    """
+    A part of a cached fragment that is rendered on every request.
+    """
+
+    def __init__(self, nodelist: template.NodeList):
+        self.nodelist = nodelist
+        self.index = None
+
+    def render(self, context) -> str:
+        if context.render_context.get(CachedFragmentNode.RENDERING_KEY):
+            return SLOT_MARKER.format(self.index)
+        return self.nodelist.render(context)
+
+
+class CachedFragmentNode(template.Node):
+    """
+    Cache the rendered HTML of a fragment, splicing its uncached slots back in per request.
+    """
+
+    RENDERING_KEY = "fragment_cache_rendering"
+
+    def __init__(
+        self,
+        nodelist: template.NodeList,
+        name: template.base.FilterExpression,
+        options: FragmentOptions,
+    ):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on, self.flags, self.depends_on = options
+        self.slots = nodelist.get_nodes_by_type(UncachedNode)
+        for index, slot in enumerate(self.slots):
+            slot.index = index
+
+    def render(self, context) -> str:
+        if context.render_context.get(self.RENDERING_KEY):
+            # Nested in the cached part of another fragment, whose cache entry covers this
+            # one too. Our slots are also slots of the outer fragment, which fills them in.
+            return self.nodelist.render(context)
+
+        request = context.get("request")
+        user = getattr(request, "user", None)
+        vary_on = [var.resolve(context) for var in self.vary_on]
+        parts = [
+            settings.VERSION,
+            translation.get_language(),
+            bool(user and user.is_authenticated),
+            [
+                flag_is_active(request, flag) if request else False
+                for flag in self.flags
+            ],
+            vary_on,
+        ]
+        digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+        key = f"fragment:{self.name.resolve(context)}:{digest}"
+
+        html = get_or_set(
+            key,
+            lambda: self.render_for_cache(context),
+            settings.FRAGMENT_CACHE_TIMEOUT,
+            depends_on=self.depends_on,
+        )
+        for slot in self.slots:
+            marker = SLOT_MARKER.format(slot.index)
+            if marker in html:
+                html = html.replace(marker, slot.nodelist.render(context))
+        return mark_safe(html)
+
+    def render_for_cache(self, context) -> str:
+        """
+        Render the fragment with a marker in place of every uncached slot.
+        """
+        context.render_context[self.RENDERING_KEY] = True
+        try:
+            return str(self.nodelist.render(context))
+        finally:
+            del context.render_context[self.RENDERING_KEY]
+
+
+@register.tag
+def cachedfragment(parser, token):
+    """
+    Cache the rendered HTML of a template fragment.
+
+    The cache key is made of the fragment name, the app version, the active language,
+    whether the user is authenticated, the state of the given waffle flags and any extra
+    values to vary on. Parts that differ per user or per request, such as CSRF tokens or
+    notification badges, go in {% uncached %} blocks: they are left out of the cached HTML
+    and rendered on every request. Uncached blocks must be placed directly in the
+    fragment's template, not in an included one, and may only use variables available
+    where the fragment starts. Fragments can be nested in the same template; templates
+    included in the cached part must not contain uncached blocks or fragments of their own.
+
+    Usage:
+        {% cachedfragment "footer" [vary_on ...] [flags="a,b"] [depends_on="app.Model,..."] %}
+            ...
+            {% uncached %}{% csrf_token %}{% enduncached %}
+        {% endcachedfragment %}
+
+    The depends_on models must be registered with apps.main.cache.track_models, so the
+    fragment is rendered again when one of their rows changes.
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' tag requires at least the fragment name."
+        )
+
+    options = _parse_options(parser, bits[2:])
+    nodelist = parser.parse(("endcachedfragment",))
+    parser.delete_first_token()
+    return CachedFragmentNode(nodelist, parser.compile_filter(bits[1]), options)
+
+
+def _parse_options(parser, bits: List[str]) -> FragmentOptions:
+    """
+    Parse the bits of a {% cachedfragment %} tag that follow the fragment name.
+    """
+    options = FragmentOptions(vary_on=[], flags=[], depends_on=[])
+    for bit in bits:
+        if bit.startswith("flags="):
+            options.flags.extend(
+                flag for flag in bit[len("flags=") :].strip("\"'").split(",") if flag
+            )
+        elif bit.startswith("depends_on="):
+            labels = bit[len("depends_on=") :].strip("\"'").split(",")
+            options.depends_on.extend(
+                apps.get_model(label) for label in labels if label
+            )
+        else:
+            options.vary_on.append(parser.compile_filter(bit))
+    return options
+
+
+@register.tag
+def uncached(parser, token):
+    """
+    Mark a part of a {% cachedfragment %} to be rendered on every request.
+    """
+    nodelist = parser.parse(("enduncached",))
+    parser.delete_first_token()
+    return UncachedNode(nodelist)
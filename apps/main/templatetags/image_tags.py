@@ -0,0 +1,65 @@
+from django import template
+from django.conf import settings
+from django.db.models.fields.files import FieldFile
+
+from apps.main.variants import get_mime_type, get_srcset
+
+register = template.Library()
+
+
+@register.filter(name="srcset")
+def srcset(image: FieldFile, image_format: str = "webp") -> str:
+    """
+    Return the srcset listing the resized variants of an image in one format.
+
+    Usage:
+        <img src="{{ image.url }}" srcset="{{ image|srcset:'webp' }}" sizes="50vw">
+
+    Args:
+        image (FieldFile): The value of an ImageField.
+        image_format (str): The format of the variants.
+
+    Returns:
+        str: The srcset, empty if the image has no variants yet.
+    """
+    if not image:
+        return ""
+    return get_srcset(image.name, image_format)
+
+
+@register.inclusion_tag("components/responsive_image.html")
+def responsive_image(
+    image: FieldFile, alt: str = "", sizes: str = "", css_class: str = ""
+) -> dict:
+    """
+    Render a <picture> offering the resized variants of an image in every format of
+    IMAGE_VARIANT_FORMATS, so browsers download the smallest one they support that fits.
+    The original is the fallback, also used while the variants are generated.
+
+    Usage:
+        {% responsive_image image alt="..." sizes="(min-width: 768px) 50vw, 100vw" %}
+
+    Args:
+        image (FieldFile): The value of an ImageField.
+        alt (str): The alternative text of the image.
+        sizes (str): The sizes attribute telling browsers how wide the image is shown.
+        css_class (str): The CSS classes of the <img>.
+
+    Returns:
+        dict: The context of the template.
+    """
+    sources = []
+    for image_format in settings.IMAGE_VARIANT_FORMATS if image else []:
+        format_srcset = get_srcset(image.name, image_format)
+        if format_srcset:
+            sources.append(
+                {"type": get_mime_type(image_format), "srcset": format_srcset}
+            )
+
+    return {
+        "sources": sources,
+        "src": image.url if image else "",
+        "alt": alt,
+        "sizes": sizes,
+        "css_class": css_class,
+    }
@@ -1,6 +1,6 @@
 from django import template
-from django.core.cache import cache
 
+from apps.main.cache import CACHE_DEPENDENT_TIMEOUT, get_or_set
 from apps.main.models import FAQ
 
 register = template.Library()
@@ -12,8 +12,10 @@ def faqs_module():
     Grab social media links from the database and return them to the template.
     :return: A dictionary containing the social media links.
     """
-    faqs = cache.get("frequently_asked_questions")
-    if faqs is None:
-        faqs = list(FAQ.objects.filter(module=True))
-        cache.set("frequently_asked_questions", faqs, 3600)
+    faqs = get_or_set(
+        "frequently_asked_questions",
+        lambda: list(FAQ.objects.filter(module=True)),
+        CACHE_DEPENDENT_TIMEOUT,
+        depends_on=[FAQ],
+    )
     return {"faqs": faqs}
@@ -0,0 +1,178 @@
+import hashlib
+import os
+import uuid
+from datetime import timedelta
+from typing import Any, Dict
+
+from django.apps import apps
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import FileUploadHandler
+from django.utils import timezone
+
+# Files uploaded by browsers straight to object storage, see create_direct_upload
+DIRECT_UPLOAD_DIRECTORY = "media_library/direct/"
+# Types a browser may upload there. Raster images only, as the files are public and
+# an SVG could run scripts on the bucket's domain.
+DIRECT_UPLOAD_CONTENT_TYPES = (
+    "image/avif",
+    "image/gif",
+    "image/jpeg",
+    "image/png",
+    "image/webp",
+)
+
+
+class HashingUploadHandler(FileUploadHandler):
+    """
+    Hash uploaded files with SHA-256 as their chunks stream in.
+
+    The chunks are passed on unchanged to the next handlers, which store the file as
+    usual, so the hash is known as soon as the upload is parsed without reading the file
+    a second time. Must be inserted before the request's body is read:
+
+        handler = HashingUploadHandler(request)
+        request.upload_handlers.insert(0, handler)
+        upload = request.FILES["upload"]
+        handler.hashes["upload"]
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        # Hex digests keyed by the name of the form field of each file
+        self.hashes: Dict[str, str] = {}
+        self.digest = None
+
+    def new_file(self, *args, **kwargs) -> None:
+        """
+        Start hashing a new file.
+        """
+        super().new_file(*args, **kwargs)
+        self.digest = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> bytes:
+        """
+        Hash a chunk and hand it to the next handler.
+        """
+        self.digest.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size: int) -> None:
+        """
+        Record the hash of the file. The next handler returns the file itself.
+        """
+        self.hashes[self.field_name] = self.digest.hexdigest()
+
+
+def create_direct_upload(
+    filename: str, content_type: str, user_id: int
+) -> Dict[str, Any]:
+    """
+    Create a presigned POST letting a browser upload a file straight to the S3 bucket of
+    the default storage, so no app worker is busy while the file is sent.
+
+    The policy pins the storage key, the content type and the largest accepted size,
+    and expires after DIRECT_UPLOAD_EXPIRES seconds. The returned token identifies the
+    upload when the browser reports it is done, see read_direct_upload_token.
+
+    Args:
+        filename (str): The name of the file on the user's device, for its extension.
+        content_type (str): The MIME type the browser will send.
+        user_id (int): The primary key of the user uploading the file.
+
+    Returns:
+        Dict[str, Any]: The `url` and form `fields` to POST the file to, with the file
+            as the last field, and the `token` completing the upload.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    name = f"{DIRECT_UPLOAD_DIRECTORY}{uuid.uuid4().hex}{extension}"
+    key = f"{default_storage.location}/{name}" if default_storage.location else name
+
+    fields = {"Content-Type": content_type}
+    if default_storage.default_acl:
+        fields["acl"] = default_storage.default_acl
+    cache_control = default_storage.object_parameters.get("CacheControl")
+    if cache_control:
+        fields["Cache-Control"] = cache_control
+
+    presigned = default_storage.connection.meta.client.generate_presigned_post(
+        Bucket=default_storage.bucket_name,
+        Key=key,
+        Fields=fields,
+        Conditions=[
+            *({field: value} for field, value in fields.items()),
+            ["content-length-range", 1, settings.DIRECT_UPLOAD_MAX_SIZE],
+        ],
+        ExpiresIn=settings.DIRECT_UPLOAD_EXPIRES,
+    )
+    return {
+        "url": presigned["url"],
+        "fields": presigned["fields"],
+        "token": signing.dumps(name, salt=_token_salt(user_id)),
+    }
+
+
+def read_direct_upload_token(token: str, user_id: int) -> str:
+    """
+    Return the storage name of a direct upload from its token.
+
+    Args:
+        token (str): The token returned by create_direct_upload.
+        user_id (int): The primary key of the user completing the upload.
+
+    Returns:
+        str: The storage name the file was uploaded to.
+
+    Raises:
+        signing.BadSignature: If the token was tampered with, created for another user or
+            is too old.
+    """
+    # Leaves as long again for an upload that started just before its policy expired
+    return signing.loads(
+        token,
+        salt=_token_salt(user_id),
+        max_age=settings.DIRECT_UPLOAD_EXPIRES * 2,
+    )
+
+
+def delete_abandoned_direct_uploads() -> int:
+    """
+    Delete the direct uploads that were never completed.
+
+    A browser may upload a file and never report it, e.g. when the editor is closed,
+    leaving a public file no MediaLibrary entry refers to. Files older than their token,
+    which can't be completed anymore, are deleted unless an entry records them.
+
+    Returns:
+        int: The number of files deleted.
+    """
+    try:
+        _, files = default_storage.listdir(DIRECT_UPLOAD_DIRECTORY)
+    except FileNotFoundError:
+        # Nothing was ever uploaded to a local storage
+        return 0
+
+    names = [f"{DIRECT_UPLOAD_DIRECTORY}{file}" for file in files]
+    recorded = set(
+        apps.get_model("main", "MediaLibrary")
+        .objects.filter(file__in=names)
+        .values_list("file", flat=True)
+    )
+    cutoff = timezone.now() - timedelta(seconds=settings.DIRECT_UPLOAD_EXPIRES * 2)
+    abandoned = [
+        name
+        for name in names
+        if name not in recorded and default_storage.get_modified_time(name) < cutoff
+    ]
+    for name in abandoned:
+        default_storage.delete(name)
+    return len(abandoned)
+
+
+def _token_salt(user_id: int) -> str:
+    """
+    Return the salt of the direct upload tokens of a user, so they can't be reused by
+    anyone else.
+    """
+    return f"direct_upload:{user_id}"
@@ -4,6 +4,7 @@ from django.urls import path
 from .views import (
     home,
     MarkAsReadAndRedirectView,
+    mark_notifications_as_read,
     terms_and_conditions,
     privacy_policy,
     ContactUsView,
@@ -31,4 +32,9 @@ urlpatterns = [
         MarkAsReadAndRedirectView.as_view(),
         name="mark_as_read_and_redirect",
     ),
+    path(
+        "notifications/mark-as-read/",
+        mark_notifications_as_read,
+        name="mark_notifications_as_read",
+    ),
 ]
@@ -0,0 +1,218 @@
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Model
+
+from apps.main.cache import CACHE_DEPENDENT_TIMEOUT, delete, get_or_set
+from apps.main.image_processing import FORMATS, resize_image
+
+# Seconds an image without variants is cached, so variants that are still being
+# generated, or whose generation failed and is retried, show up soon after
+MISSING_VARIANTS_TIMEOUT = 60
+
+
+@lru_cache(maxsize=None)
+def get_executor() -> Executor:
+    """
+    Return the process pool resizing images, starting it on first use.
+
+    Resizing is CPU bound, so it runs in IMAGE_VARIANT_WORKERS separate processes instead
+    of the worker's threads, which would share a single core. The processes are spawned
+    rather than forked, as the worker has open database connections and running threads.
+
+    The pool is shared by all jobs of a worker.
+
+    Returns:
+        Executor: The process pool.
+    """
+    return ProcessPoolExecutor(
+        max_workers=settings.IMAGE_VARIANT_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def resize_variants(data: bytes, sizes: List[Tuple[int, str]]) -> List[tuple]:
+    """
+    Resize an image to several widths and formats, in the process pool of get_executor
+    or in the current process if IMAGE_VARIANT_WORKERS is 0.
+
+    Args:
+        data (bytes): The original image.
+        sizes (List[Tuple[int, str]]): The width and format of each variant.
+
+    Returns:
+        List[tuple]: The content, width and height of each variant, see resize_image.
+    """
+    arguments = [
+        (data, width, image_format, settings.IMAGE_VARIANT_QUALITY)
+        for width, image_format in sizes
+    ]
+    if settings.IMAGE_VARIANT_WORKERS:
+        return list(get_executor().map(resize_image, *zip(*arguments)))
+    return [resize_image(*args) for args in arguments]
+
+
+def generate_variants(source: str) -> List[Model]:
+    """
+    Generate the variants of an image that don't exist yet, for every size in
+    IMAGE_VARIANT_SIZES and format in IMAGE_VARIANT_FORMATS.
+
+    The original is read from storage once and resized by resize_variants.
+
+    Args:
+        source (str): The storage name of the original image.
+
+    Returns:
+        List[Model]: The MediaVariant objects created.
+    """
+    media_variant_model = apps.get_model("main", "MediaVariant")
+    existing = set(
+        media_variant_model.objects.filter(source=source).values_list("name", "format")
+    )
+    missing = [
+        (name, width, image_format)
+        for name, width in settings.IMAGE_VARIANT_SIZES.items()
+        for image_format in settings.IMAGE_VARIANT_FORMATS
+        if (name, image_format) not in existing
+    ]
+    if not missing:
+        return []
+
+    with default_storage.open(source) as file:
+        results = resize_variants(
+            file.read(), [(width, image_format) for _, width, image_format in missing]
+        )
+
+    stem = os.path.splitext(source)[0]
+    variants = []
+    for (name, _, image_format), (content, width, height) in zip(missing, results):
+        variant = media_variant_model(
+            source=source,
+            name=name,
+            format=image_format,
+            width=width,
+            height=height,
+            size=len(content),
+        )
+        variant.file.save(
+            f"{stem}_{name}.{image_format}", ContentFile(content), save=False
+        )
+        variants.append(variant)
+
+    # Another job may have stored some of them in the meantime
+    media_variant_model.objects.bulk_create(variants, ignore_conflicts=True)
+    delete(variants_key(source))
+    return variants
+
+
+def delete_variants(source: str) -> None:
+    """
+    Delete the variants of an image along with their files, once the transaction
+    commits.
+
+    Args:
+        source (str): The storage name of the original image.
+    """
+    media_variant_model = apps.get_model("main", "MediaVariant")
+    variants = media_variant_model.objects.filter(source=source)
+    names = list(variants.values_list("file", flat=True))
+    variants.delete()
+
+    def delete_files():
+        for name in names:
+            default_storage.delete(name)
+        delete(variants_key(source))
+
+    transaction.on_commit(delete_files)
+
+
+def variants_key(source: str) -> str:
+    """
+    Return the cache key of the variants of an image.
+    """
+    digest = hashlib.md5(source.encode(), usedforsecurity=False).hexdigest()
+    return f"media_variants:{digest}"
+
+
+def get_variants(source: str) -> List[Model]:
+    """
+    Return the variants of an image, smallest first.
+
+    Cached, so rendering an image doesn't query the database. The cache is cleared when
+    new variants are generated, and an image without variants is only cached for
+    MISSING_VARIANTS_TIMEOUT seconds.
+
+    Args:
+        source (str): The storage name of the original image.
+
+    Returns:
+        List[Model]: The MediaVariant objects, which may be empty while they are
+            generated.
+    """
+    media_variant_model = apps.get_model("main", "MediaVariant")
+    return get_or_set(
+        variants_key(source),
+        lambda: list(
+            media_variant_model.objects.filter(source=source).order_by("width")
+        ),
+        lambda variants: (
+            CACHE_DEPENDENT_TIMEOUT if variants else MISSING_VARIANTS_TIMEOUT
+        ),
+    )
+
+
+def get_srcset(source: str, image_format: str) -> str:
+    """
+    Build the `srcset` attribute listing the variants of an image in one format.
+
+    Args:
+        source (str): The storage name of the original image.
+        image_format (str): The format of the variants, e.g. "webp".
+
+    Returns:
+        str: The srcset, e.g. "a_thumbnail.webp 160w, a_medium.webp 800w", or an empty
+            string if the image has no variants in that format.
+    """
+    return ", ".join(
+        f"{variant.file.url} {variant.width}w"
+        for variant in get_variants(source)
+        if variant.format == image_format
+    )
+
+
+def get_variant_url(
+    source: str, name: str, image_format: str = "webp"
+) -> Optional[str]:
+    """
+    Return the URL of one variant of an image.
+
+    WebP is the default as every current browser displays it in a plain <img>.
+
+    Args:
+        source (str): The storage name of the original image.
+        name (str): The size of the variant, a key of IMAGE_VARIANT_SIZES.
+        image_format (str): The format of the variant.
+
+    Returns:
+        Optional[str]: The URL, or None if the variant doesn't exist yet.
+    """
+    for variant in get_variants(source):
+        if variant.name == name and variant.format == image_format:
+            return variant.file.url
+    return None
+
+
+def get_mime_type(image_format: str) -> str:
+    """
+    Return the MIME type of a variant format, used as the type of <source> elements.
+    """
+    return FORMATS[image_format][1]
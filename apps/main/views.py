@@ -4,7 +4,12 @@ from django.conf import settings
 from django.contrib import messages
 from django.contrib.admin.utils import unquote
 from django.contrib.contenttypes.models import ContentType
+from django.core import signing
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db.models import Max
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
@@ -22,33 +27,59 @@ from django.http import (
     JsonResponse,
 )
 
-from .forms import ContactForm
+from .cache import cache_anonymous_page
+from .forms import ContactForm, DirectUploadForm
 from .models import (
     Notification,
     TermsAndConditions,
     PrivacyPolicy,
     FAQ,
     MediaLibrary,
+    SocialMediaLink,
+)
+from .reporting import get_reportable_model
+from .tasks import create_report
+from .uploads import (
+    HashingUploadHandler,
+    create_direct_upload,
+    read_direct_upload_token,
 )
 
 
 @login_not_required
+@cache_anonymous_page(FAQ, SocialMediaLink)
 def home(request):
     """View to the home page."""
     return render(request, "main/home.html")
 
 
 @login_not_required
+@cache_anonymous_page(
+    TermsAndConditions,
+    SocialMediaLink,
+    last_modified=TermsAndConditions.objects.last_modified,
+)
 def terms_and_conditions(request):
     """View to the terms and conditions page."""
-    context = {"terms": TermsAndConditions.objects.latest("created_at")}
+    terms = TermsAndConditions.objects.current()
+    if terms is None:
+        return HttpResponseNotFound("No terms and conditions have been published.")
+    context = {"terms": terms}
     return render(request, "main/terms_and_conditions.html", context)
 
 
 @login_not_required
+@cache_anonymous_page(
+    PrivacyPolicy,
+    SocialMediaLink,
+    last_modified=PrivacyPolicy.objects.last_modified,
+)
 def privacy_policy(request):
     """View to the privacy policy page."""
-    context = {"privacy_policy": PrivacyPolicy.objects.latest("created_at")}
+    policy = PrivacyPolicy.objects.current()
+    if policy is None:
+        return HttpResponseNotFound("No privacy policy has been published.")
+    context = {"privacy_policy": policy}
     return render(request, "main/privacy_policy.html", context)
 
 
@@ -97,21 +128,47 @@ class MarkAsReadAndRedirectView(RedirectView):
 
         decoded_url = unquote(destination_url)  # Decode the URL
 
+        notifications = Notification.objects.filter(
+            id=notification_id, link=destination_url
+        )
+
+        # Mark the notification as read in a single UPDATE. Only when nothing was updated do we
+        # check whether it exists at all, so an unread notification costs one query.
+        if notifications.mark_as_read():
+            Notification.objects.invalidate_unread_summary(request.user.pk)
         # Its important the next line returns a 404 if it doesn't match because otherwise a malicious user could
         # use the redirect parameter to redirect any user to any site they want. Using our domain to gain credibility.
-        try:
-            notification = Notification.objects.get(
-                id=notification_id, link=destination_url
-            )
-        except Notification.DoesNotExist:
+        elif not notifications.exists():
             return HttpResponse(status=404)
 
-        # Mark the notification as read
-        notification.mark_as_read()
-
         return HttpResponseRedirect(decoded_url)  # Redirect to the decoded URL
 
 
+@require_http_methods(["POST"])
+def mark_notifications_as_read(request: HttpRequest) -> HttpResponse:
+    """
+    Mark all of the user's notifications, or only the posted `notification_ids`, as read.
+
+    HTMX requests get the refreshed notifications dropdown back, anything else is
+    redirected to the page the user came from.
+    """
+    try:
+        notification_ids = [int(pk) for pk in request.POST.getlist("notification_ids")]
+    except ValueError:
+        return HttpResponseBadRequest("Invalid notification ids")
+
+    notifications = request.user.notifications.all()
+    if notification_ids:
+        notifications = notifications.filter(id__in=notification_ids)
+
+    if notifications.mark_as_read():
+        Notification.objects.invalidate_unread_summary(request.user.pk)
+
+    if request.htmx:
+        return render(request, "components/notifications.html")
+    return HttpResponseRedirect(request.META.get("HTTP_REFERER", "home"))
+
+
 @method_decorator(login_not_required, name="dispatch")
 class ContactUsView(View):
     """
@@ -141,6 +198,11 @@ class ContactUsView(View):
 
 
 @login_not_required
+@cache_anonymous_page(
+    FAQ,
+    SocialMediaLink,
+    last_modified=lambda: FAQ.objects.aggregate(Max("updated_at"))["updated_at__max"],
+)
 def faq_list(request):
     """
     View to display the list of FAQs.
@@ -154,6 +216,13 @@ def report(request: HttpRequest, model_name: str, object_id: int):
     """
     A view for handling reports of inappropriate content.
 
+    The model is resolved from the registry of reportable models without a query.
+    With REPORTS_ASYNC, the report is queued for the create_report task instead of being
+    stored during the request, and only the first report of a user on an object within
+    REPORT_DEDUP_TIMEOUT seconds is queued. The reported object is then looked up by
+    the task, so reports of missing objects are dropped there rather than answered with
+    a 404.
+
     Args:
         request: The HTTP request
         model_name: Name of the model being reported
@@ -162,16 +231,31 @@ def report(request: HttpRequest, model_name: str, object_id: int):
     Returns:
         HttpResponse redirecting back to previous page or home
     """
-    try:
-        model = ContentType.objects.get(model=model_name).model_class()
-        obj = get_object_or_404(model, pk=object_id)
-    except Http404:
+    reason = request.POST.get("reason", "No reason provided.")
+
+    model = get_reportable_model(model_name)
+    if model is None:
         return HttpResponseNotFound("Object not found")
 
-    obj.report(
-        reporter=request.user,
-        reason=request.POST.get("reason", "No reason provided."),
-    )
+    if settings.REPORTS_ASYNC:
+        content_type = ContentType.objects.get_for_model(model)
+
+        key = f"reports:queued:{content_type.pk}:{object_id}:{request.user.pk}"
+        # cache.add only succeeds for the first report, so repeats never reach the queue
+        if cache.add(key, True, settings.REPORT_DEDUP_TIMEOUT):
+            create_report.defer(
+                content_type_id=content_type.pk,
+                object_id=object_id,
+                reporter_id=request.user.pk,
+                reason=reason,
+            )
+    else:
+        try:
+            obj = get_object_or_404(model, pk=object_id)
+        except Http404:
+            return HttpResponseNotFound("Object not found")
+
+        obj.report(reporter=request.user, reason=reason)
 
     # Refresh the page the user was on. If for some reason it doesnt work then take the user home.
     return HttpResponseRedirect(request.META.get("HTTP_REFERER", "home"))
@@ -196,17 +280,24 @@ def robots_view(request):
 
 @csrf_exempt
 def ckeditor_upload(request):
-    """Custom view for django ckeditor 5 to save the image by default as a media library image"""
+    """
+    Custom view for django ckeditor 5 to save the image by default as a media library image.
+
+    Uploads are hashed while they stream in, so pasting an image that was already
+    uploaded returns the stored copy instead of writing it to storage again.
+    """
+    hashing_handler = HashingUploadHandler(request)
+    request.upload_handlers.insert(0, hashing_handler)
+
     if request.method == "POST" and request.FILES.get("upload"):
         uploaded_file = request.FILES["upload"]
 
-        # Create a new MediaLibrary instance
-        media = MediaLibrary(
-            file=uploaded_file,
+        media = MediaLibrary.objects.store_upload(
+            uploaded_file,
             content_type=ContentType.objects.get_for_model(MediaLibrary),
             object_id=0,
+            file_hash=hashing_handler.hashes.get("upload"),
         )
-        media.save()
 
         # Prepare the response
         url = media.file.url
@@ -215,3 +306,57 @@ def ckeditor_upload(request):
         )
 
     return JsonResponse({"error": {"message": "Invalid request"}}, status=400)
+
+
+@require_http_methods(["POST"])
+def ckeditor_upload_presign(request):
+    """
+    Start a direct CKEditor upload by returning a presigned POST to object storage.
+
+    The browser sends the image straight to the bucket, then calls
+    ckeditor_upload_complete with the returned token, so no worker is busy while the
+    image is uploaded.
+    """
+    if not settings.CKEDITOR_DIRECT_UPLOADS:
+        return HttpResponseNotFound("Direct uploads are disabled.")
+
+    form = DirectUploadForm(request.POST)
+    if not form.is_valid():
+        return JsonResponse(
+            {"error": {"message": form.errors.as_text()}},
+            status=400,
+        )
+
+    upload = create_direct_upload(
+        form.cleaned_data["name"], form.cleaned_data["content_type"], request.user.pk
+    )
+    upload["complete_url"] = reverse("ckeditor_upload_complete")
+    return JsonResponse(upload)
+
+
+@require_http_methods(["POST"])
+def ckeditor_upload_complete(request):
+    """
+    Record a direct CKEditor upload in the media library once the browser has sent it.
+    """
+    if not settings.CKEDITOR_DIRECT_UPLOADS:
+        return HttpResponseNotFound("Direct uploads are disabled.")
+
+    try:
+        name = read_direct_upload_token(request.POST.get("token", ""), request.user.pk)
+    except signing.BadSignature:
+        return JsonResponse({"error": {"message": "Invalid upload"}}, status=400)
+
+    if not default_storage.exists(name):
+        return JsonResponse({"error": {"message": "Upload not found"}}, status=400)
+
+    media = MediaLibrary.objects.register_upload(
+        name,
+        content_type=ContentType.objects.get_for_model(MediaLibrary),
+        object_id=0,
+    )
+    if media is None:
+        return JsonResponse(
+            {"error": {"message": "Only images can be uploaded."}}, status=400
+        )
+    return JsonResponse({"url": media.file.url, "uploaded": "1"})
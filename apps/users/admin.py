@@ -1,9 +1,13 @@
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
 from django.contrib import admin
-from django.db.models import Count
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
-from .models import User, UserIP, UserDevice
+from .models import IPAddressStats, User, UserIP, UserDevice
+
+# How many other users of an IP address the UserIP change page lists
+SHARED_IP_USERS_SHOWN = 50
 
 
 class UserIPInline(admin.TabularInline):
@@ -137,18 +141,34 @@ class UserIPAdmin(admin.ModelAdmin):
         ("Users on Same IP", {"fields": ("get_users_on_same_ip",)}),
     )
 
+    def get_queryset(self, request):
+        """
+        Annotate each row with the number of users sharing its IP address.
+
+        The count is read from IPAddressStats in the same statement, so the changelist
+        can show and sort by it without counting UserIP rows per row.
+        """
+        shared_users = IPAddressStats.objects.filter(
+            ip_address=OuterRef("ip_address")
+        ).values("user_count")[:1]
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("user")
+            .annotate(shared_users=Coalesce(Subquery(shared_users), 0))
+        )
+
+    @admin.display(description="Number of Users", ordering="shared_users")
     def shared_user_count(self, obj) -> int:
         """
-        Calculate the number of distinct users sharing the same IP address.
+        Return the number of distinct users sharing the same IP address.
 
         :param obj: Instance of the UserIP model.
         :return: The count of distinct users.
         """
-        return UserIP.objects.filter(ip_address=obj.ip_address).aggregate(
-            Count("user", distinct=True)
-        )["user__count"]
-
-    shared_user_count.short_description = "Number of Users"
+        if hasattr(obj, "shared_users"):
+            return obj.shared_users
+        return IPAddressStats.objects.user_count(obj.ip_address)
 
     def location_display(self, obj) -> str:
         """
@@ -164,15 +184,24 @@ class UserIPAdmin(admin.ModelAdmin):
     def get_users_on_same_ip(self, obj: UserIP) -> str:
         """
         Display other users that have used the same IP address.
+
+        At most SHARED_IP_USERS_SHOWN users are listed, as shared addresses such as
+        carrier NATs can have thousands.
         :param obj: Instance of the UserIP model.
         :return: Comma-separated string of usernames.
         """
         users = (
             UserIP.objects.filter(ip_address=obj.ip_address)
             .exclude(user=obj.user)
-            .select_related("user")
+            .order_by("-last_seen")
+            .values_list("user__username", flat=True)[: SHARED_IP_USERS_SHOWN + 1]
         )
-        return ", ".join([user_ip.user.username for user_ip in users])
+        usernames = list(users)
+        if len(usernames) > SHARED_IP_USERS_SHOWN:
+            others = self.shared_user_count(obj) - 1 - SHARED_IP_USERS_SHOWN
+            usernames = usernames[:SHARED_IP_USERS_SHOWN]
+            usernames.append(f"and {max(others, 1)} more")
+        return ", ".join(usernames)
 
     get_users_on_same_ip.short_description = "Users on Same IP"
 
@@ -0,0 +1,142 @@
+import threading
+import time
+import uuid
+from typing import Iterable, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+class Blocklist:
+    """
+    A per-process index of blocked IP addresses and device identifiers.
+
+    Membership checks are served from in-memory sets. A version token kept in the cache is
+    bumped whenever a block is added or lifted, and every process reloads its sets from the
+    database when it sees a new token or when BLOCKLIST_REFRESH_SECONDS have passed.
+
+    The token is only bumped once the transaction changing a block commits, so no process
+    can reload the old rows and keep them under the new token.
+    """
+
+    VERSION_KEY = "users:blocklist:version"
+
+    def __init__(self):
+        """
+        Initialize an empty, unloaded blocklist.
+        """
+        self._lock = threading.Lock()
+        self._ips = frozenset()
+        self._devices = frozenset()
+        self._version = None
+        self._loaded_at = None
+
+    def is_ip_blocked(self, ip_address: Optional[str]) -> bool:
+        """
+        Check if an IP address is blocked.
+
+        Args:
+            ip_address (Optional[str]): The IP address to check.
+
+        Returns:
+            bool: True if the IP address is blocked, False otherwise.
+        """
+        self._ensure_fresh()
+        return ip_address in self._ips
+
+    def is_device_blocked(self, device_identifier: Optional[str]) -> bool:
+        """
+        Check if a device identifier is blocked.
+
+        Args:
+            device_identifier (Optional[str]): The device identifier to check.
+
+        Returns:
+            bool: True if the device is blocked, False otherwise.
+        """
+        self._ensure_fresh()
+        return device_identifier in self._devices
+
+    def add(
+        self,
+        ip_addresses: Iterable[str] = (),
+        device_identifiers: Iterable[str] = (),
+    ) -> None:
+        """
+        Add newly blocked entries to this process and tell every process to reload once
+        the current transaction commits.
+
+        Args:
+            ip_addresses (Iterable[str]): IP addresses that were blocked.
+            device_identifiers (Iterable[str]): Device identifiers that were blocked.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            self._ips = self._ips.union(ip_addresses)
+            self._devices = self._devices.union(device_identifiers)
+        transaction.on_commit(self._bump_version)
+
+    def invalidate(self) -> None:
+        """
+        Force every process, including this one, to reload on its next check once the
+        current transaction commits.
+
+        Used when a block is lifted, since entries cannot be removed safely without
+        knowing whether another row still blocks the same IP or device.
+        """
+        transaction.on_commit(self._bump_version)
+
+    def reload(self, version: str) -> None:
+        """
+        Load the blocked IP addresses and device identifiers from the database.
+
+        Args:
+            version (str): The version token the loaded sets correspond to.
+        """
+        user_ip_model = apps.get_model("users", "UserIP")
+        user_device_model = apps.get_model("users", "UserDevice")
+
+        ips = frozenset(
+            user_ip_model.objects.filter(is_blocked=True).values_list(
+                "ip_address", flat=True
+            )
+        )
+        devices = frozenset(
+            user_device_model.objects.filter(is_blocked=True).values_list(
+                "device_identifier", flat=True
+            )
+        )
+
+        with self._lock:
+            self._ips = ips
+            self._devices = devices
+            self._version = version
+            self._loaded_at = time.monotonic()
+
+    def _ensure_fresh(self) -> None:
+        """
+        Reload the sets if the shared version changed or the local copy is too old.
+        """
+        version = cache.get(self.VERSION_KEY)
+        if version is None:
+            version = self._bump_version()
+
+        is_expired = (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at >= settings.BLOCKLIST_REFRESH_SECONDS
+        )
+        if version != self._version or is_expired:
+            self.reload(version)
+
+    def _bump_version(self) -> str:
+        """
+        Store a new version token in the cache and return it.
+        """
+        version = uuid.uuid4().hex
+        cache.set(self.VERSION_KEY, version, None)
+        return version
+
+
+blocklist = Blocklist()
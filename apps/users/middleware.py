@@ -14,6 +14,7 @@ from django.contrib.auth.middleware import LoginRequiredMiddleware
 from ipware import get_client_ip
 
 from .models import UserIP, UserDevice
+from .tracking import should_track, tracking_buffer
 
 security_middleware_excluded_views = [
     "terms_and_conditions",
@@ -191,6 +192,8 @@ class SecurityMiddleware:
         Update the user's IP and device tracking information.
 
         This method records or updates the user's current IP address and device identifier.
+        Combinations seen within USER_TRACKING_THROTTLE_SECONDS are skipped, and when
+        USER_TRACKING_BUFFERED is enabled the write is queued for a later bulk upsert.
 
         Args:
             request (HttpRequest): The request object containing user and request information.
@@ -198,6 +201,13 @@ class SecurityMiddleware:
         ip_address, _ = get_client_ip(request)
         device_identifier = self.get_device_identifier(request)
 
+        if not should_track(request.user.pk, ip_address, device_identifier):
+            return
+
+        if settings.USER_TRACKING_BUFFERED:
+            tracking_buffer.add(request.user.pk, ip_address, device_identifier)
+            return
+
         if ip_address:
             UserIP.objects.update_or_create(
                 user=request.user,
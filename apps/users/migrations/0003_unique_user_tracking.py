@@ -0,0 +1,54 @@
+# Generated by Django 6.0 on 2026-10-18 09:12
+
+from django.contrib.postgres.aggregates import BoolOr
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def remove_duplicate_tracking_rows(apps, schema_editor):
+    """
+    Collapse duplicate (user, ip) and (user, device) rows before the unique constraints
+    are added. The newest row is kept and inherits the blocked flag of its duplicates.
+    """
+    for model_name, field_name in (
+        ("UserIP", "ip_address"),
+        ("UserDevice", "device_identifier"),
+    ):
+        model = apps.get_model("users", model_name)
+        duplicates = (
+            model.objects.values("user_id", field_name)
+            .annotate(
+                keep_id=Max("id"), total=Count("id"), blocked=BoolOr("is_blocked")
+            )
+            .filter(total__gt=1)
+        )
+        for duplicate in duplicates:
+            rows = model.objects.filter(
+                user_id=duplicate["user_id"], **{field_name: duplicate[field_name]}
+            )
+            rows.exclude(id=duplicate["keep_id"]).delete()
+            if duplicate["blocked"]:
+                rows.update(is_blocked=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0002_user_referral_source"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_tracking_rows, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="userip",
+            constraint=models.UniqueConstraint(
+                fields=("user", "ip_address"), name="unique_user_ip_address"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="userdevice",
+            constraint=models.UniqueConstraint(
+                fields=("user", "device_identifier"),
+                name="unique_user_device_identifier",
+            ),
+        ),
+    ]
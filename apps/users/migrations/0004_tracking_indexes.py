@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-18 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0003_unique_user_tracking"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="userdevice",
+            name="device_identifier",
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name="userip",
+            name="ip_address",
+            field=models.GenericIPAddressField(db_index=True),
+        ),
+    ]
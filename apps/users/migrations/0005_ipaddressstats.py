@@ -0,0 +1,63 @@
+# Generated by Django 6.0 on 2026-10-18 16:02
+
+import django.db.models.manager
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_ip_stats(apps, schema_editor):
+    """
+    Count the distinct users of every tracked IP address.
+    """
+    UserIP = apps.get_model("users", "UserIP")
+    IPAddressStats = apps.get_model("users", "IPAddressStats")
+
+    rows = (
+        UserIP.objects.values("ip_address")
+        .annotate(count=Count("user", distinct=True))
+        .order_by()
+    )
+    IPAddressStats.objects.bulk_create(
+        (
+            IPAddressStats(ip_address=row["ip_address"], user_count=row["count"])
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0004_tracking_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IPAddressStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("ip_address", models.GenericIPAddressField(unique=True)),
+                ("user_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "IP Address Stats",
+                "verbose_name_plural": "IP Address Stats",
+                "abstract": False,
+                "base_manager_name": "prefetch_manager",
+            },
+            managers=[
+                ("objects", django.db.models.manager.Manager()),
+                ("prefetch_manager", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.RunPython(populate_ip_stats, migrations.RunPython.noop),
+    ]
@@ -2,14 +2,27 @@ import auto_prefetch
 import requests
 from django.contrib.auth.models import AbstractUser
 from django.db import models
-from django.db.models import Value, F
-from django.db.models.functions import Concat
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.templatetags.static import static
-
+from django.utils import timezone
+from django_lifecycle import (
+    LifecycleModelMixin,
+    hook,
+    AFTER_CREATE,
+    AFTER_UPDATE,
+    AFTER_DELETE,
+)
+
+from apps.main.image_metadata import ImageMetadataMixin
 from apps.main.mixins import CreateMediaLibraryMixin
+from apps.main.variants import get_variant_url
+from apps.users.blocklist import blocklist
 
 
-class User(CreateMediaLibraryMixin, AbstractUser):
+class User(CreateMediaLibraryMixin, ImageMetadataMixin, AbstractUser):
     """An override of the user model to extend any new fields or remove others."""
 
     # override the default email field so that we can make it unique
@@ -20,6 +33,13 @@ class User(CreateMediaLibraryMixin, AbstractUser):
         db_collation="en-x-icu",
     )
     avatar = models.ImageField(upload_to="profile_image/", null=True, blank=True)
+    avatar_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    avatar_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    avatar_size = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    avatar_mime_type = models.CharField(
+        max_length=100, null=True, blank=True, editable=False
+    )
+    avatar_hash = models.CharField(max_length=64, null=True, blank=True, editable=False)
 
     full_name = models.GeneratedField(
         expression=Concat(
@@ -41,14 +61,19 @@ class User(CreateMediaLibraryMixin, AbstractUser):
 
     # Add any custom fields for your application here
 
+    image_metadata_fields = ["avatar"]
+
     def __str__(self):
         return self.email
 
     @property
     def avatar_url(self):
-        """Return the URL of the user's avatar."""
+        """
+        Return the URL of the user's avatar, resized to a thumbnail once its variants
+        are generated.
+        """
         if self.avatar:
-            return self.avatar.url
+            return get_variant_url(self.avatar.name, "thumbnail") or self.avatar.url
         return static("images/default_user.jpeg")
 
     def deactivate_user(self):
@@ -67,10 +92,14 @@ class User(CreateMediaLibraryMixin, AbstractUser):
         """Block all devices that are related to a user"""
 
         self.devices.all().update(is_blocked=True)
+        blocklist.add(
+            device_identifiers=self.devices.values_list("device_identifier", flat=True)
+        )
 
     def block_ips(self):
         """Block all ip addresses related to a user"""
         self.ips.all().update(is_blocked=True)
+        blocklist.add(ip_addresses=self.ips.values_list("ip_address", flat=True))
 
 
 class UserIPManager(models.Manager):
@@ -79,8 +108,8 @@ class UserIPManager(models.Manager):
     """
 
     def is_ip_blocked(self, ip_address):
-        """Checks if the ip address is blocked"""
-        return self.filter(ip_address=ip_address, is_blocked=True).exists()
+        """Checks if the ip address is blocked, using the in-memory blocklist"""
+        return blocklist.is_ip_blocked(ip_address)
 
     def is_ip_blocked_or_suspicious(self, ip_address):
         """
@@ -101,8 +130,23 @@ class UserIPManager(models.Manager):
         """
         return self.filter(user_id=user_id).order_by("-last_seen")
 
+    def bulk_track(self, entries):
+        """
+        Record a batch of IP sightings in a single upsert.
+        :param entries: An iterable of (user_id, ip_address) pairs.
+        :return:
+        """
+        entries = list(entries)
+        self.bulk_create(
+            [self.model(user_id=user_id, ip_address=ip) for user_id, ip in entries],
+            update_conflicts=True,
+            unique_fields=["user", "ip_address"],
+            update_fields=["last_seen"],
+        )
+        IPAddressStats.objects.refresh({ip for _, ip in entries})
+
 
-class UserIP(auto_prefetch.Model):
+class UserIP(LifecycleModelMixin, auto_prefetch.Model):
     """
     This Django model stores IP addresses associated with users.
 
@@ -120,11 +164,18 @@ class UserIP(auto_prefetch.Model):
     objects = UserIPManager()
 
     user = auto_prefetch.ForeignKey(User, on_delete=models.CASCADE, related_name="ips")
-    ip_address = models.GenericIPAddressField()
+    ip_address = models.GenericIPAddressField(db_index=True)
     last_seen = models.DateTimeField(auto_now=True)
     is_blocked = models.BooleanField(default=False)
     is_suspicious = models.BooleanField(default=False)
 
+    class Meta(auto_prefetch.Model.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "ip_address"], name="unique_user_ip_address"
+            ),
+        ]
+
     @property
     def location(self):
         """
@@ -136,6 +187,135 @@ class UserIP(auto_prefetch.Model):
             return f"{json['country']}, {json['region']}, {json['city']}"
         return None
 
+    @hook(AFTER_CREATE, when="is_blocked", is_now=True)
+    @hook(AFTER_UPDATE, when="is_blocked", has_changed=True)
+    @hook(AFTER_DELETE, when="is_blocked", is_now=True)
+    def sync_blocklist(self):
+        """
+        Keep the in-memory blocklist in step with changes to the blocked flag.
+        """
+        if self.is_blocked and self.pk is not None:
+            blocklist.add(ip_addresses=[self.ip_address])
+        else:
+            blocklist.invalidate()
+
+
+class IPAddressStatsManager(models.Manager):
+    """
+    A custom manager for the IPAddressStats model.
+    """
+
+    def refresh(self, ip_addresses):
+        """
+        Recount the distinct users of the given IP addresses and store the counts.
+
+        Missing rows are inserted first, then every count is recomputed by the UPDATE
+        itself, so the tracking pipeline can refresh a whole batch of addresses at once.
+        :param ip_addresses: An iterable of IP addresses whose users changed.
+        :return:
+        """
+        ip_addresses = set(ip_addresses)
+        if not ip_addresses:
+            return
+
+        self.bulk_create(
+            [self.model(ip_address=ip) for ip in ip_addresses], ignore_conflicts=True
+        )
+        # A user has at most one row per address, so counting rows counts users
+        users = (
+            UserIP.objects.filter(ip_address=OuterRef("ip_address"))
+            .order_by()
+            .values("ip_address")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        self.filter(ip_address__in=ip_addresses).update(
+            user_count=Coalesce(Subquery(users), 0), updated_at=timezone.now()
+        )
+
+    def add_user(self, ip_address):
+        """
+        Count one more user of an IP address.
+
+        The count is incremented in the database, so concurrent sightings of the same
+        address are all counted.
+        :param ip_address: The IP address.
+        :return:
+        """
+        self.bulk_create([self.model(ip_address=ip_address)], ignore_conflicts=True)
+        self.filter(ip_address=ip_address).update(
+            user_count=F("user_count") + 1, updated_at=timezone.now()
+        )
+
+    def remove_user(self, ip_address):
+        """
+        Count one less user of an IP address.
+        :param ip_address: The IP address.
+        :return:
+        """
+        self.filter(ip_address=ip_address).update(
+            user_count=Greatest(F("user_count") - 1, 0), updated_at=timezone.now()
+        )
+
+    def user_count(self, ip_address):
+        """
+        Return the stored number of distinct users of an IP address.
+        :param ip_address: The IP address.
+        :return: The count, or 0 if the address has no stats yet.
+        """
+        stats = self.filter(ip_address=ip_address).only("user_count").first()
+        return stats.user_count if stats else 0
+
+
+class IPAddressStats(auto_prefetch.Model):
+    """
+    The number of distinct users seen on each IP address.
+
+    Kept up to date by the tracking pipeline so admin pages can show and sort by how
+    widely an address is shared without counting UserIP rows on every request.
+
+    Attributes:
+        ip_address (str): The IP address.
+        user_count (int): The number of distinct users that used the address.
+        updated_at (DateTime): When the count was last refreshed.
+    """
+
+    objects = IPAddressStatsManager()
+
+    ip_address = models.GenericIPAddressField(unique=True)
+    user_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta(auto_prefetch.Model.Meta):
+        verbose_name = "IP Address Stats"
+        verbose_name_plural = "IP Address Stats"
+
+    def __str__(self):
+        return f"{self.ip_address} ({self.user_count} users)"
+
+
+@receiver(post_save, sender=UserIP)
+def count_ip_user(sender, instance: UserIP, created: bool, **kwargs) -> None:
+    """
+    Count the user of a new UserIP row in its address's stats.
+
+    Rows created in bulk by UserIPManager.bulk_track are recounted there instead.
+    """
+    if created:
+        IPAddressStats.objects.add_user(instance.ip_address)
+
+
+@receiver(post_delete, sender=UserIP)
+def uncount_ip_user(sender, instance: UserIP, **kwargs) -> None:
+    """
+    Remove the user of a deleted UserIP row from its address's stats.
+
+    A signal rather than a lifecycle hook, as hooks only run for UserIP.delete(), while
+    the signal is also sent for queryset deletes, the admin's delete action and rows
+    deleted along with their user.
+    """
+    IPAddressStats.objects.remove_user(instance.ip_address)
+
 
 class UserDeviceManager(models.Manager):
     """
@@ -144,13 +324,11 @@ class UserDeviceManager(models.Manager):
 
     def is_device_blocked(self, device_identifier):
         """
-        Check if a device is blocked.
+        Check if a device is blocked, using the in-memory blocklist.
         :param device_identifier:
         :return:
         """
-        return self.filter(
-            device_identifier=device_identifier, is_blocked=True
-        ).exists()
+        return blocklist.is_device_blocked(device_identifier)
 
     def get_device_history_for_user(self, user_id):
         """
@@ -160,15 +338,51 @@ class UserDeviceManager(models.Manager):
         """
         return self.filter(user_id=user_id).order_by("-last_seen")
 
+    def bulk_track(self, entries):
+        """
+        Record a batch of device sightings in a single upsert.
+        :param entries: An iterable of (user_id, device_identifier) pairs.
+        :return:
+        """
+        self.bulk_create(
+            [
+                self.model(user_id=user_id, device_identifier=device)
+                for user_id, device in entries
+            ],
+            update_conflicts=True,
+            unique_fields=["user", "device_identifier"],
+            update_fields=["last_seen"],
+        )
 
-class UserDevice(models.Model):
+
+class UserDevice(LifecycleModelMixin, models.Model):
     """
     This Django model stores device identifiers associated with users.
     """
 
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="devices")
-    device_identifier = models.CharField(max_length=255)
+    device_identifier = models.CharField(max_length=255, db_index=True)
     last_seen = models.DateTimeField(auto_now=True)
     is_blocked = models.BooleanField(default=False)
 
     objects = UserDeviceManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "device_identifier"],
+                name="unique_user_device_identifier",
+            ),
+        ]
+
+    @hook(AFTER_CREATE, when="is_blocked", is_now=True)
+    @hook(AFTER_UPDATE, when="is_blocked", has_changed=True)
+    @hook(AFTER_DELETE, when="is_blocked", is_now=True)
+    def sync_blocklist(self):
+        """
+        Keep the in-memory blocklist in step with changes to the blocked flag.
+        """
+        if self.is_blocked and self.pk is not None:
+            blocklist.add(device_identifiers=[self.device_identifier])
+        else:
+            blocklist.invalidate()
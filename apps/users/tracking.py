@@ -0,0 +1,117 @@
+import atexit
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import User, UserIP, UserDevice
+
+
+def should_track(user_id: int, ip_address: str, device_identifier: str) -> bool:
+    """
+    Check whether this user/IP/device combination should be recorded.
+
+    A combination that was already recorded within USER_TRACKING_THROTTLE_SECONDS is
+    skipped, so repeat page views cost a single cache lookup instead of database writes.
+
+    Args:
+        user_id (int): The primary key of the user making the request.
+        ip_address (str): The client IP address.
+        device_identifier (str): The hashed device identifier.
+
+    Returns:
+        bool: True if the sighting should be recorded, False if it was seen recently.
+    """
+    timeout = settings.USER_TRACKING_THROTTLE_SECONDS
+    if not timeout:
+        return True
+
+    key = f"users:tracking:{user_id}:{ip_address}:{device_identifier}"
+    # cache.add only succeeds when the key is missing, so it doubles as the "seen" check
+    return cache.add(key, True, timeout)
+
+
+class TrackingBuffer:
+    """
+    A per-process write-behind buffer for user IP and device tracking.
+
+    Sightings are collected in memory and written with one bulk upsert per table once
+    USER_TRACKING_BATCH_SIZE entries are pending or USER_TRACKING_FLUSH_INTERVAL seconds
+    have passed since the last flush. Anything left over is flushed when the process exits.
+
+    Flushes run once the transaction of the request that reached a threshold commits, so
+    a batch that fails to write is logged instead of failing that unrelated request.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty buffer.
+        """
+        self._lock = threading.Lock()
+        self._ips = set()
+        self._devices = set()
+        self._last_flush = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._ips) + len(self._devices)
+
+    def add(self, user_id: int, ip_address: str, device_identifier: str) -> None:
+        """
+        Queue a sighting and flush the buffer if a threshold has been reached.
+
+        Args:
+            user_id (int): The primary key of the user making the request.
+            ip_address (str): The client IP address.
+            device_identifier (str): The hashed device identifier.
+        """
+        with self._lock:
+            if ip_address:
+                self._ips.add((user_id, ip_address))
+            if device_identifier:
+                self._devices.add((user_id, device_identifier))
+            should_flush = self._should_flush()
+
+        if should_flush:
+            transaction.on_commit(self.flush, robust=True)
+
+    def _should_flush(self) -> bool:
+        """
+        Check the size and interval thresholds. Must be called while holding the lock.
+        """
+        if len(self) >= settings.USER_TRACKING_BATCH_SIZE:
+            return True
+        elapsed = time.monotonic() - self._last_flush
+        return elapsed >= settings.USER_TRACKING_FLUSH_INTERVAL
+
+    def flush(self) -> None:
+        """
+        Write all pending sightings to the database and empty the buffer.
+
+        Sightings of users deleted since they were queued are dropped, as their rows
+        would violate the foreign key.
+        """
+        with self._lock:
+            ips, self._ips = self._ips, set()
+            devices, self._devices = self._devices, set()
+            self._last_flush = time.monotonic()
+
+        if not ips and not devices:
+            return
+        existing = set(
+            User.objects.filter(
+                pk__in={user_id for user_id, _ in ips | devices}
+            ).values_list("pk", flat=True)
+        )
+        ips = {entry for entry in ips if entry[0] in existing}
+        devices = {entry for entry in devices if entry[0] in existing}
+
+        if ips:
+            UserIP.objects.bulk_track(ips)
+        if devices:
+            UserDevice.objects.bulk_track(devices)
+
+
+tracking_buffer = TrackingBuffer()
+atexit.register(tracking_buffer.flush)
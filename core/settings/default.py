@@ -440,6 +440,15 @@ CKEDITOR_5_CONFIGS = {
     },
 }
 CK_EDITOR_5_UPLOAD_FILE_VIEW_NAME = "ckeditor_upload"
+# Let CKEditor upload images straight to the S3 bucket with a presigned POST instead of
+# through ckeditor_upload. The bucket's CORS rules must allow POST from the site.
+CKEDITOR_DIRECT_UPLOADS = (
+    os.getenv("CKEDITOR_DIRECT_UPLOADS", "FALSE").upper() == "TRUE"
+)
+# Largest file in bytes, and seconds a presigned POST stays valid. Files whose upload is
+# never completed are deleted by the hourly clean_direct_uploads task.
+DIRECT_UPLOAD_MAX_SIZE = int(os.getenv("DIRECT_UPLOAD_MAX_SIZE", str(10 * 1024 * 1024)))
+DIRECT_UPLOAD_EXPIRES = int(os.getenv("DIRECT_UPLOAD_EXPIRES", "600"))
 
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
 SLACK_DEFAULT_CHANNEL = os.getenv("DEFAULT_SLACK_CHANNEL")
@@ -449,3 +458,82 @@ ENABLE_SLACK_MESSAGES = os.getenv("ENABLE_SLACK_MESSAGES", "FALSE").upper() == "
 RESEND_API_KEY = os.getenv("RESEND_API_KEY")
 DEFAULT_FROM_EMAIL = "noreply@example.com"
 ENABLE_EMAILS = os.getenv("ENABLE_EMAILS", "TRUE").upper() == "TRUE"
+
+# User tracking settings
+# Skip recording the same user/IP/device combination again for this many seconds
+USER_TRACKING_THROTTLE_SECONDS = int(os.getenv("USER_TRACKING_THROTTLE_SECONDS", "300"))
+# Queue tracking writes in memory and flush them as bulk upserts
+USER_TRACKING_BUFFERED = os.getenv("USER_TRACKING_BUFFERED", "FALSE").upper() == "TRUE"
+USER_TRACKING_BATCH_SIZE = int(os.getenv("USER_TRACKING_BATCH_SIZE", "500"))
+USER_TRACKING_FLUSH_INTERVAL = int(os.getenv("USER_TRACKING_FLUSH_INTERVAL", "30"))
+# Reload the in-memory IP/device blocklist at least this often, even without a version change
+BLOCKLIST_REFRESH_SECONDS = int(os.getenv("BLOCKLIST_REFRESH_SECONDS", "60"))
+
+# Notification settings
+# How many of the newest unread notifications are shown in the navbar dropdown
+NOTIFICATION_SUMMARY_SIZE = int(os.getenv("NOTIFICATION_SUMMARY_SIZE", "10"))
+# Seconds a user's cached unread summary is kept before it is recomputed
+NOTIFICATION_SUMMARY_TIMEOUT = int(os.getenv("NOTIFICATION_SUMMARY_TIMEOUT", "300"))
+# Users notified per insert when broadcasting a notification
+NOTIFICATION_BROADCAST_BATCH_SIZE = int(
+    os.getenv("NOTIFICATION_BROADCAST_BATCH_SIZE", "1000")
+)
+
+# Report settings
+# Queue reports for the create_report task instead of storing them during the request
+REPORTS_ASYNC = os.getenv("REPORTS_ASYNC", "FALSE").upper() == "TRUE"
+# Seconds during which repeated reports of an object by the same user are not queued again
+REPORT_DEDUP_TIMEOUT = int(os.getenv("REPORT_DEDUP_TIMEOUT", "86400"))
+# Objects with this many reports within MODERATION_WINDOW_SECONDS are deactivated
+# automatically. Reportable models can override it with report_threshold, 0 disables it.
+MODERATION_REPORT_THRESHOLD = int(os.getenv("MODERATION_REPORT_THRESHOLD", "5"))
+MODERATION_WINDOW_SECONDS = int(os.getenv("MODERATION_WINDOW_SECONDS", "3600"))
+
+# Cache settings
+# Point REDIS_URL at a Redis server so every worker process shares one cache. Without it
+# each process keeps its own in-memory cache.
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+# Per-process tier in front of the shared cache, used by apps.main.cache.get_or_set
+CACHES["local"] = {
+    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    "LOCATION": "local",
+}
+# Longest a value is served from the per-process tier without checking the shared cache
+CACHE_LOCAL_TIMEOUT = int(os.getenv("CACHE_LOCAL_TIMEOUT", "30"))
+# Seconds a process may hold the lock to recompute a missing value, and others wait for it
+CACHE_LOCK_TIMEOUT = int(os.getenv("CACHE_LOCK_TIMEOUT", "10"))
+CACHE_LOCK_POLL_INTERVAL = float(os.getenv("CACHE_LOCK_POLL_INTERVAL", "0.05"))
+# Longest a request waits for another process's recomputation before computing the value
+# itself, so a slow computation does not tie up every sync worker for CACHE_LOCK_TIMEOUT
+CACHE_LOCK_WAIT_TIMEOUT = float(os.getenv("CACHE_LOCK_WAIT_TIMEOUT", "1"))
+# How eagerly get_or_set recomputes values before they expire, 0 disables it
+CACHE_EARLY_REFRESH_BETA = float(os.getenv("CACHE_EARLY_REFRESH_BETA", "1.0"))
+# Seconds the rendered HTML of a {% cachedfragment %} is kept. Keys include VERSION, so a
+# deploy that sets a new VERSION never serves fragments of the old templates.
+FRAGMENT_CACHE_TIMEOUT = int(os.getenv("FRAGMENT_CACHE_TIMEOUT", "86400"))
+# Seconds a page decorated with cache_anonymous_page is kept for anonymous visitors. Pages
+# are purged as soon as a model they depend on changes, so this can be long.
+PAGE_CACHE_TIMEOUT = int(os.getenv("PAGE_CACHE_TIMEOUT", "604800"))
+
+# Image variant settings
+# Widths the resized variants of uploaded images are generated at, keyed by variant name.
+# Images narrower than a width are re-encoded without being upscaled.
+IMAGE_VARIANT_SIZES = {"thumbnail": 160, "medium": 800}
+# Formats every size is generated in, the most efficient first
+IMAGE_VARIANT_FORMATS = os.getenv("IMAGE_VARIANT_FORMATS", "avif,webp").split(",")
+IMAGE_VARIANT_QUALITY = int(os.getenv("IMAGE_VARIANT_QUALITY", "75"))
+# Processes each worker resizes images in, 0 resizes in the worker itself
+IMAGE_VARIANT_WORKERS = int(os.getenv("IMAGE_VARIANT_WORKERS", "2"))
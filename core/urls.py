@@ -2,11 +2,19 @@ from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 
-from apps.main.views import BadRequestView, ServerErrorView, ckeditor_upload
+from apps.main.views import (
+    BadRequestView,
+    ServerErrorView,
+    ckeditor_upload,
+    ckeditor_upload_complete,
+    ckeditor_upload_presign,
+)
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("upload/", ckeditor_upload, name="ckeditor_upload"),
+    path("upload/presign/", ckeditor_upload_presign, name="ckeditor_upload_presign"),
+    path("upload/complete/", ckeditor_upload_complete, name="ckeditor_upload_complete"),
     path("accounts/", include("allauth.urls")),
     path("payments/", include("apps.payments.urls")),
     path("users/", include("apps.users.urls")),
@@ -0,0 +1,96 @@
+// Upload CKEditor 5 images straight to object storage with a presigned POST.
+// Loaded by apps.main.forms.CKEditorWidget when CKEDITOR_DIRECT_UPLOADS is enabled.
+(function () {
+    function getCsrfToken() {
+        const match = document.cookie.match(/(?:^|;\s*)csrftoken=([^;]+)/);
+        return match ? decodeURIComponent(match[1]) : "";
+    }
+
+    async function postForm(url, data) {
+        const body = new FormData();
+        Object.entries(data).forEach(([key, value]) => body.append(key, value));
+        const response = await fetch(url, {
+            method: "POST",
+            body: body,
+            credentials: "same-origin",
+            headers: {"X-CSRFToken": getCsrfToken()},
+        });
+        const json = await response.json();
+        if (!response.ok) {
+            throw json.error ? json.error.message : "Upload failed";
+        }
+        return json;
+    }
+
+    class DirectUploadAdapter {
+        constructor(loader, presignUrl) {
+            this.loader = loader;
+            this.presignUrl = presignUrl;
+            this.xhr = null;
+        }
+
+        async upload() {
+            const file = await this.loader.file;
+            const upload = await postForm(this.presignUrl, {
+                name: file.name,
+                content_type: file.type,
+                size: file.size,
+            });
+            await this.send(upload, file);
+            const media = await postForm(upload.complete_url, {token: upload.token});
+            return {default: media.url};
+        }
+
+        send(upload, file) {
+            return new Promise((resolve, reject) => {
+                const body = new FormData();
+                Object.entries(upload.fields).forEach(([key, value]) => body.append(key, value));
+                // Storage ignores the fields that come after the file
+                body.append("file", file);
+
+                this.xhr = new XMLHttpRequest();
+                this.xhr.open("POST", upload.url, true);
+                this.xhr.upload.addEventListener("progress", (event) => {
+                    if (event.lengthComputable) {
+                        this.loader.uploadTotal = event.total;
+                        this.loader.uploaded = event.loaded;
+                    }
+                });
+                this.xhr.addEventListener("load", () => {
+                    if (this.xhr.status >= 200 && this.xhr.status < 300) {
+                        resolve();
+                    } else {
+                        reject(`Couldn't upload file: ${file.name}.`);
+                    }
+                });
+                this.xhr.addEventListener("error", () => reject(`Couldn't upload file: ${file.name}.`));
+                this.xhr.addEventListener("abort", () => reject());
+                this.xhr.send(body);
+            });
+        }
+
+        abort() {
+            if (this.xhr) {
+                this.xhr.abort();
+            }
+        }
+    }
+
+    function useDirectUploads(editor, presignUrl) {
+        editor.plugins.get("FileRepository").createUploadAdapter = (loader) => {
+            return new DirectUploadAdapter(loader, presignUrl);
+        };
+    }
+
+    document.addEventListener("DOMContentLoaded", () => {
+        document.querySelectorAll("textarea[data-direct-upload-url]").forEach((element) => {
+            const presignUrl = element.dataset.directUploadUrl;
+            const editor = window.editors && window.editors[element.id];
+            if (editor) {
+                useDirectUploads(editor, presignUrl);
+            } else if (window.ckeditorRegisterCallback) {
+                window.ckeditorRegisterCallback(element.id, (created) => useDirectUploads(created, presignUrl));
+            }
+        });
+    });
+})();
@@ -0,0 +1,14 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Empty every cache before each test.
+
+    Tests run in transactions that are rolled back and whose on_commit hooks never bump
+    model cache versions, so values cached by one test must not leak into the next.
+    """
+    for cache in caches.all():
+        cache.clear()
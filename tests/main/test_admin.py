@@ -370,3 +370,159 @@ class CommentAdminTest(TestCase):
         result = comment_admin.content_object_link(comment)
 
         self.assertEqual(result, "Object does not exist")
+
+
+class ReportAdminActionsTest(TestCase):
+    """
+    Test suite for the ReportAdmin changelist query count and bulk actions.
+    """
+
+    def setUp(self):
+        """
+        Set up reports against two comments.
+        :return:
+        """
+        super().setUp()
+        self.admin_user = UserFactory(is_superuser=True, is_staff=True)
+        self.client.force_login(self.admin_user)
+        self.url = reverse("admin:main_report_changelist")
+        self.comments = CommentFactory.create_batch(2)
+        self.reports = [
+            comment.report(UserFactory(), "Spam")
+            for comment in self.comments
+            for _ in range(2)
+        ]
+
+    def test_content_objects_are_prefetched(self):
+        """
+        Test that the changelist loads all content objects without a query per row.
+        :return:
+        """
+        request = RequestFactory().get(self.url)
+        request.user = self.admin_user
+        report_admin = ReportAdmin(Report, AdminSite())
+        reports = list(report_admin.get_changelist_instance(request).result_list)
+
+        # The only query left loads the users shown in the comments' names, which
+        # auto_prefetch fetches for the whole page at once
+        with self.assertNumQueries(1):
+            links = [report_admin.content_object_link(report) for report in reports]
+
+        self.assertEqual(len(links), 4)
+
+    def test_link_to_model_without_admin(self):
+        """
+        Test that objects without an admin page are shown without a link.
+        :return:
+        """
+        content_type = ContentType.objects.get_for_model(ContentType)
+        report = ReportFactory(content_type=content_type, object_id=content_type.pk)
+
+        link = ReportAdmin(Report, AdminSite()).content_object_link(report)
+
+        self.assertEqual(link, str(content_type))
+
+    def test_deactivate_targets_action(self):
+        """
+        Test that the action deactivates the objects of the selected reports.
+        :return:
+        """
+        response = self.client.post(
+            self.url,
+            {
+                "action": "deactivate_targets",
+                "_selected_action": [self.reports[0].pk, self.reports[1].pk],
+            },
+            follow=True,
+        )
+
+        self.assertContains(response, "Deactivated 1 objects.")
+        self.comments[0].refresh_from_db()
+        self.comments[1].refresh_from_db()
+        self.assertFalse(self.comments[0].active)
+        self.assertTrue(self.comments[1].active)
+
+    def test_dismiss_reports_action(self):
+        """
+        Test that the action deletes the selected reports and recounts their objects.
+        :return:
+        """
+        response = self.client.post(
+            self.url,
+            {"action": "dismiss_reports", "_selected_action": [self.reports[0].pk]},
+            follow=True,
+        )
+
+        self.assertContains(response, "Dismissed 1 reports.")
+        self.assertFalse(Report.objects.filter(pk=self.reports[0].pk).exists())
+        self.comments[0].refresh_from_db()
+        self.comments[1].refresh_from_db()
+        self.assertEqual(self.comments[0].reports_count, 1)
+        self.assertEqual(self.comments[1].reports_count, 2)
+
+
+class CommentAdminActionsTest(TestCase):
+    """
+    Test suite for the CommentAdmin bulk actions.
+    """
+
+    def test_deactivate_comments_action(self):
+        """
+        Test that the action deactivates the selected comments with one UPDATE, and
+        that comments on content types without a model are listed without a link.
+        :return:
+        """
+        self.client.force_login(UserFactory(is_superuser=True, is_staff=True))
+        comment, other_comment = CommentFactory.create_batch(2)
+
+        response = self.client.post(
+            reverse("admin:main_comment_changelist"),
+            {"action": "deactivate_comments", "_selected_action": [comment.pk]},
+            follow=True,
+        )
+
+        self.assertContains(response, "Deactivated 1 comments.")
+        self.assertContains(response, "Object does not exist", count=2)
+        comment.refresh_from_db()
+        other_comment.refresh_from_db()
+        self.assertFalse(comment.active)
+        self.assertTrue(other_comment.active)
+
+    def test_activate_comments_action(self):
+        """
+        Test that the action reactivates the selected comments and records when.
+        :return:
+        """
+        self.client.force_login(UserFactory(is_superuser=True, is_staff=True))
+        comment = CommentFactory(active=False)
+
+        response = self.client.post(
+            reverse("admin:main_comment_changelist"),
+            {"action": "activate_comments", "_selected_action": [comment.pk]},
+            follow=True,
+        )
+
+        self.assertContains(response, "Reactivated 1 comments.")
+        comment.refresh_from_db()
+        self.assertTrue(comment.active)
+        self.assertIsNotNone(comment.moderated_at)
+
+    def test_reactivating_in_change_form_records_moderation(self):
+        """
+        Test that checking active in the change form records the moderation decision,
+        and other edits don't.
+        :return:
+        """
+        comment_admin = CommentAdmin(Comment, AdminSite())
+        request = RequestFactory().post("/")
+        comment = CommentFactory()
+
+        comment.content = "Edited"
+        form = type("Form", (), {"changed_data": ["content"]})()
+        comment_admin.save_model(request, comment, form, change=True)
+        self.assertIsNone(comment.moderated_at)
+
+        form.changed_data = ["active"]
+        comment_admin.save_model(request, comment, form, change=True)
+        comment.refresh_from_db()
+        self.assertIsNotNone(comment.moderated_at)
@@ -0,0 +1,420 @@
+import time
+from unittest import mock
+
+from django.contrib import messages
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages.middleware import MessageMiddleware
+from django.core.cache import cache, caches
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+
+from apps.main.cache import (
+    cache_anonymous_page,
+    delete,
+    get_or_set,
+    get_versions,
+    version_key,
+)
+from apps.main.models import FAQ, Contact, SocialMediaLink
+from tests.base import BaseTestCase
+from tests.factories.main import FAQFactory, TermsAndConditionsFactory
+
+
+@override_settings(CACHE_LOCAL_TIMEOUT=30, CACHE_LOCK_TIMEOUT=1)
+class GetOrSetTest(TestCase):
+    """
+    Test the stampede protected get_or_set helper.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        caches["local"].clear()
+        self.default = mock.Mock(return_value="value")
+
+    def test_missing_value_is_computed_once(self):
+        """
+        Test that a missing value is computed, stored and then served from the cache.
+        """
+        self.assertEqual(get_or_set("key", self.default, 60), "value")
+        self.assertEqual(get_or_set("key", self.default, 60), "value")
+
+        self.default.assert_called_once()
+        self.assertEqual(cache.get("key")[0], "value")
+        self.assertIsNone(cache.get("key:lock"))
+
+    def test_timeout_depends_on_value(self):
+        """
+        Test that a callable timeout is given the computed value.
+        """
+        self.default.return_value = []
+        timeout = mock.Mock(return_value=5)
+
+        get_or_set("key", self.default, timeout)
+
+        timeout.assert_called_once_with([])
+        self.assertAlmostEqual(cache.get("key")[2], time.time() + 5, delta=1)
+
+    def test_local_tier_serves_without_shared_cache(self):
+        """
+        Test that a value stays available from the local tier.
+        """
+        get_or_set("key", self.default, 60)
+        cache.delete("key")
+
+        self.assertEqual(get_or_set("key", self.default, 60), "value")
+        self.default.assert_called_once()
+
+    def test_shared_hit_fills_local_tier(self):
+        """
+        Test that a value found in the shared cache is copied to the local tier.
+        """
+        cache.set("key", ("shared", 0.1, time.time() + 60), 60)
+
+        self.assertEqual(get_or_set("key", self.default, 60), "shared")
+        self.assertEqual(caches["local"].get("key")[0], "shared")
+        self.default.assert_not_called()
+
+    @override_settings(CACHE_LOCAL_TIMEOUT=0)
+    def test_local_tier_disabled(self):
+        """
+        Test that nothing is kept locally when the local timeout is zero.
+        """
+        get_or_set("key", self.default, 60)
+
+        self.assertIsNone(caches["local"].get("key"))
+
+    def test_without_local_tier(self):
+        """
+        Test that local=False always reads the shared cache.
+        """
+        get_or_set("key", self.default, 60, local=False)
+        cache.delete("key")
+
+        get_or_set("key", self.default, 60, local=False)
+
+        self.assertEqual(self.default.call_count, 2)
+        self.assertIsNone(caches["local"].get("key"))
+
+    @mock.patch("apps.main.cache.random.random", return_value=0.999999)
+    def test_early_refresh_near_expiry(self, _mock_random):
+        """
+        Test that a value close to expiry is recomputed before it expires.
+        """
+        cache.set("key", ("old", 100.0, time.time() + 10), 60)
+
+        self.assertEqual(get_or_set("key", self.default, 60, local=False), "value")
+        self.assertEqual(cache.get("key")[0], "value")
+
+    @mock.patch("apps.main.cache.random.random", return_value=0.999999)
+    def test_early_refresh_skipped_when_locked(self, _mock_random):
+        """
+        Test that only the process holding the lock refreshes, others serve the old value.
+        """
+        cache.set("key", ("old", 100.0, time.time() + 10), 60)
+        cache.add("key:lock", True, 10)
+
+        self.assertEqual(get_or_set("key", self.default, 60, local=False), "old")
+        self.default.assert_not_called()
+
+    @mock.patch("apps.main.cache.random.random", return_value=0.999999)
+    @override_settings(CACHE_EARLY_REFRESH_BETA=0)
+    def test_beta_zero_disables_early_refresh(self, _mock_random):
+        """
+        Test that CACHE_EARLY_REFRESH_BETA=0 only recomputes values once they expire.
+        """
+        cache.set("key", ("old", 100.0, time.time() + 10), 60)
+
+        self.assertEqual(get_or_set("key", self.default, 60), "old")
+
+    @override_settings(CACHE_LOCK_POLL_INTERVAL=0)
+    def test_waits_for_value_computed_elsewhere(self):
+        """
+        Test that a miss waits for the process holding the lock instead of recomputing.
+        """
+        cache.add("key:lock", True, 10)
+
+        def compute_elsewhere(_seconds):
+            cache.set("key", ("elsewhere", 0.1, time.time() + 60), 60)
+
+        with mock.patch("apps.main.cache.time.sleep", side_effect=compute_elsewhere):
+            self.assertEqual(get_or_set("key", self.default, 60), "elsewhere")
+
+        self.default.assert_not_called()
+
+    @override_settings(CACHE_LOCK_WAIT_TIMEOUT=0)
+    def test_computes_when_wait_times_out(self):
+        """
+        Test that a miss is computed locally when the lock holder takes too long, without
+        waiting for the whole CACHE_LOCK_TIMEOUT.
+        """
+        cache.add("key:lock", True, 10)
+
+        self.assertEqual(get_or_set("key", self.default, 60), "value")
+        self.assertIsNone(cache.get("key"))
+
+    def test_lock_released_on_error(self):
+        """
+        Test that a failing computation does not leave the lock behind.
+        """
+        self.default.side_effect = ValueError
+
+        with self.assertRaises(ValueError):
+            get_or_set("key", self.default, 60)
+
+        self.assertIsNone(cache.get("key:lock"))
+
+    def test_delete(self):
+        """
+        Test that delete removes the value from both tiers.
+        """
+        get_or_set("key", self.default, 60)
+
+        delete("key")
+
+        self.assertIsNone(cache.get("key"))
+        self.assertIsNone(caches["local"].get("key"))
+
+
+class ModelVersionTest(TestCase):
+    """
+    Test invalidating cached values through model versions.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        caches["local"].clear()
+        self.default = mock.Mock(return_value="value")
+
+    def test_save_bumps_version_on_commit(self):
+        """
+        Test that saving a tracked model changes its version once the transaction commits.
+        """
+        (version,) = get_versions([FAQ])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FAQFactory()
+            self.assertEqual(cache.get(version_key(FAQ)), version)
+
+        self.assertNotEqual(cache.get(version_key(FAQ)), version)
+
+    def test_delete_invalidates_dependent_value(self):
+        """
+        Test that deleting a row of a dependency recomputes the value.
+        """
+        faq = FAQFactory()
+        get_or_set("key", self.default, 60, depends_on=[FAQ])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            faq.delete()
+        get_or_set("key", self.default, 60, depends_on=[FAQ])
+
+        self.assertEqual(self.default.call_count, 2)
+
+    def test_other_models_do_not_invalidate(self):
+        """
+        Test that changes to unrelated models keep the cached value.
+        """
+        get_or_set("key", self.default, 60, depends_on=[FAQ])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SocialMediaLink.objects.create(
+                platform_name="Example", profile_url="https://example.com"
+            )
+        get_or_set("key", self.default, 60, depends_on=[FAQ])
+
+        self.default.assert_called_once()
+
+    def test_untracked_model_raises(self):
+        """
+        Test that depending on a model without tracking is refused.
+        """
+        with self.assertRaises(ImproperlyConfigured):
+            get_or_set("key", self.default, 60, depends_on=[Contact])
+
+    def test_faqs_module_shows_edits_immediately(self):
+        """
+        Test that the FAQ module reflects an edit without waiting for the cache to expire.
+        """
+        template = Template("{% load module_tags %}{% faqs_module %}")
+        faq = FAQFactory(module=True, question="Old question")
+        self.assertIn("Old question", template.render(Context()))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            faq.question = "New question"
+            faq.save()
+
+        self.assertIn("New question", template.render(Context()))
+
+
+@override_settings(PAGE_CACHE_TIMEOUT=60)
+class CacheAnonymousPageTest(BaseTestCase):
+    """
+    Test the full page cache for anonymous visitors.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        caches["local"].clear()
+        self.url = reverse("faqs")
+        self.faq = FAQFactory(question="Old question")
+        self.calls = 0
+
+    def view(self, request, status=200, csrf=False):
+        """
+        A view counting how often it runs.
+        """
+        self.calls += 1
+        if csrf:
+            get_token(request)
+        return HttpResponse("content", status=status)
+
+    def get_request(self, path="/cached/"):
+        """
+        Build an anonymous GET request with message storage.
+        """
+        request = RequestFactory().get(path)
+        request.user = AnonymousUser()
+        request.session = {}
+        MessageMiddleware(self.view).process_request(request)
+        return request
+
+    def test_page_served_from_cache(self):
+        """
+        Test that repeat visits are served the stored page with an ETag.
+        """
+        response = self.client.get(self.url)
+        self.assertContains(response, "Old question")
+        self.assertTrue(response.has_header("ETag"))
+
+        # QuerySet.update() skips signals, so the cached page is still served
+        FAQ.objects.update(question_html="New question")
+        response = self.client.get(self.url)
+        self.assertContains(response, "Old question")
+
+    def test_save_purges_page(self):
+        """
+        Test that saving a model the page depends on renders the page again.
+        """
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.faq.question = "New question"
+            self.faq.save()
+
+        self.assertContains(self.client.get(self.url), "New question")
+
+    def test_if_none_match_returns_not_modified(self):
+        """
+        Test that a visitor sending the current ETag gets a 304 without a body.
+        """
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_last_modified(self):
+        """
+        Test that pages with a modification date send Last-Modified and honor
+        If-Modified-Since.
+        """
+        terms = TermsAndConditionsFactory()
+        url = reverse("terms_and_conditions")
+
+        response = self.client.get(url)
+        self.assertEqual(
+            response["Last-Modified"], http_date(terms.created_at.timestamp())
+        )
+
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_authenticated_user_not_cached(self):
+        """
+        Test that logged in users always get a freshly rendered page.
+        """
+        self.client.force_login(self.regular_user)
+        response = self.client.get(self.url)
+        self.assertFalse(response.has_header("ETag"))
+
+        FAQ.objects.update(question_html="New question")
+        self.assertContains(self.client.get(self.url), "New question")
+
+    def test_htmx_request_not_cached(self):
+        """
+        Test that HTMX requests are not answered from the page cache.
+        """
+        response = self.client.get(self.url, HTTP_HX_REQUEST="true")
+
+        self.assertFalse(response.has_header("ETag"))
+
+    def test_query_string_not_cached(self):
+        """
+        Test that requests with a query string neither fill nor read the page cache.
+        """
+        view = cache_anonymous_page(FAQ)(self.view)
+        view(self.get_request())
+
+        view(self.get_request("/cached/?page=1"))
+        view(self.get_request("/cached/?utm_source=mail"))
+
+        self.assertEqual(self.calls, 3)
+
+    def test_pending_messages_not_cached(self):
+        """
+        Test that a page showing flash messages is neither cached nor served from cache.
+        """
+        view = cache_anonymous_page(FAQ)(self.view)
+        request = self.get_request()
+        messages.info(request, "Saved")
+
+        view(request)
+        view(request)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_error_response_not_cached(self):
+        """
+        Test that responses other than a 200 are not stored.
+        """
+        view = cache_anonymous_page(FAQ)(self.view)
+
+        response = view(self.get_request(), status=404)
+        view(self.get_request(), status=404)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.calls, 2)
+
+    def test_csrf_token_not_cached(self):
+        """
+        Test that pages using a CSRF token, which is unique per visitor, are not stored.
+        """
+        view = cache_anonymous_page(FAQ)(self.view)
+
+        view(self.get_request(), csrf=True)
+        view(self.get_request(), csrf=True)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_cached_view_runs_once(self):
+        """
+        Test that a stored page is served without running the view again.
+        """
+        view = cache_anonymous_page(FAQ)(self.view)
+
+        view(self.get_request())
+        response = view(self.get_request())
+
+        self.assertEqual(response.content, b"content")
+        self.assertEqual(self.calls, 1)
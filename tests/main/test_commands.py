@@ -9,6 +9,7 @@ from apps.main.management.commands.restore_db import (
     NO_COMMANDS_MESSAGE,
     create_command,
 )
+from apps.main.models import Comment, MediaLibrary, Report
 
 
 @override_settings(DEBUG=True)
@@ -329,3 +330,40 @@ class RestoreDbCommandTest(TestCase):
         self.assertIn("Exiting now", mock_stdout.getvalue())
         mock_exit.assert_called_once_with(0)
         mock_run_commands.assert_not_called()
+
+
+class ExplainGenericIndexesCommandTest(TestCase):
+    """
+    Test suite for the explain_generic_indexes command.
+    """
+
+    @override_settings(DEBUG=True)
+    def test_prints_plans_and_rolls_back(self) -> None:
+        """
+        Test that the command prints a plan for every index and leaves no rows behind.
+        """
+        stdout = StringIO()
+
+        call_command("explain_generic_indexes", rows=100, per_object=5, stdout=stdout)
+
+        output = stdout.getvalue()
+        for index_name in (
+            "unique_report_per_reporter",
+            "comment_object_created_idx",
+            "medialibrary_object_idx",
+        ):
+            self.assertIn(index_name, output)
+        self.assertEqual(output.count("-- without index"), 3)
+        self.assertFalse(Report.objects.exists())
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(MediaLibrary.objects.exists())
+
+    @override_settings(DEBUG=False)
+    def test_refuses_to_run_on_live_server(self) -> None:
+        """
+        Test that the command exits when DEBUG is off.
+        """
+        with self.assertRaises(SystemExit):
+            call_command("explain_generic_indexes", rows=10)
+
+        self.assertFalse(Comment.objects.exists())
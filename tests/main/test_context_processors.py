@@ -1,4 +1,8 @@
-from django.test import RequestFactory
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 
 from apps.main.context_processors import notifications
 from tests.base import BaseTestCase
@@ -16,6 +20,7 @@ class TestNotificationContextProcessor(BaseTestCase):
         :return:
         """
         super().setUp()
+        cache.clear()
         NotificationFactory.create_batch(5)
         NotificationFactory(user=self.regular_user)
         self.factory = RequestFactory()
@@ -35,3 +40,89 @@ class TestNotificationContextProcessor(BaseTestCase):
         # Assert that the result contains the expected notifications
         self.assertEqual(len(result["notifications"]), 1)
         self.assertEqual(result["notifications"][0].user, self.regular_user)
+
+    def test_unread_notification_count(self):
+        """
+        Test that the unread count is provided and ignores read notifications.
+        """
+        NotificationFactory(user=self.regular_user, is_read=True)
+        request = self.factory.get("/")
+        request.user = self.regular_user
+
+        result = notifications(request)
+
+        self.assertEqual(result["unread_notification_count"], 1)
+
+    @override_settings(NOTIFICATION_SUMMARY_SIZE=2)
+    def test_notifications_are_limited(self):
+        """
+        Test that only the newest unread notifications are loaded.
+        """
+        NotificationFactory.create_batch(3, user=self.regular_user)
+        request = self.factory.get("/")
+        request.user = self.regular_user
+
+        result = notifications(request)
+
+        self.assertEqual(len(result["notifications"]), 2)
+        self.assertEqual(result["unread_notification_count"], 4)
+
+    def test_summary_is_cached(self):
+        """
+        Test that repeat renders do not query the database.
+        """
+        request = self.factory.get("/")
+        request.user = self.regular_user
+        notifications(request)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = notifications(request)
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(result["unread_notification_count"], 1)
+
+    def test_summary_is_invalidated(self):
+        """
+        Test that creating or reading a notification refreshes the summary.
+        """
+        request = self.factory.get("/")
+        request.user = self.regular_user
+        notifications(request)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notification = NotificationFactory(user=self.regular_user)
+        self.assertEqual(notifications(request)["unread_notification_count"], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notification.mark_as_read()
+        self.assertEqual(notifications(request)["unread_notification_count"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            notification.delete()
+        self.assertEqual(notifications(request)["unread_notification_count"], 1)
+
+    def test_summary_is_invalidated_on_commit(self):
+        """
+        Test that the summary is only dropped once the transaction commits, so a request
+        can't cache the old rows again before the new ones are visible.
+        """
+        request = self.factory.get("/")
+        request.user = self.regular_user
+        notifications(request)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            NotificationFactory(user=self.regular_user)
+            self.assertEqual(notifications(request)["unread_notification_count"], 1)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(notifications(request)["unread_notification_count"], 2)
+
+    def test_anonymous_user(self):
+        """
+        Test that anonymous users get no notifications.
+        """
+        request = self.factory.get("/")
+        request.user = AnonymousUser()
+
+        self.assertEqual(notifications(request), {})
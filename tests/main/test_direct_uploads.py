@@ -0,0 +1,278 @@
+import hashlib
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+import boto3
+import requests
+from django.contrib.contenttypes.models import ContentType
+from django.conf import settings
+from django.core import signing
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from moto import mock_aws
+
+from apps.main.forms import CKEditorWidget
+from apps.main.models import MediaLibrary
+from apps.main.tasks import clean_direct_uploads
+from apps.main.uploads import (
+    DIRECT_UPLOAD_DIRECTORY,
+    create_direct_upload,
+    delete_abandoned_direct_uploads,
+    read_direct_upload_token,
+)
+from tests.base import BaseTestCase
+from tests.utils import create_mock_image
+
+BUCKET = "direct-uploads"
+
+
+def storages_with(**options) -> dict:
+    """
+    Return the STORAGES setting with an S3 default storage.
+    """
+    return {
+        "default": {
+            "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
+            "OPTIONS": options,
+        },
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
+
+
+@override_settings(
+    STORAGES=storages_with(),
+    AWS_STORAGE_BUCKET_NAME=BUCKET,
+    AWS_S3_ENDPOINT_URL=None,
+    AWS_S3_REGION_NAME="us-east-1",
+    CKEDITOR_DIRECT_UPLOADS=True,
+)
+class DirectUploadTest(BaseTestCase):
+    """
+    Test CKEditor uploads sent straight to an S3 bucket, stood in for by moto.
+    """
+
+    def setUp(self):
+        """
+        Start the S3 stand-in, create the bucket and log in.
+        """
+        super().setUp()
+        aws = mock_aws()
+        aws.start()
+        self.addCleanup(aws.stop)
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+
+        self.client.force_login(self.regular_user)
+        self.image = create_mock_image().read()
+
+    def presign(self, **data) -> dict:
+        """
+        Ask for a presigned POST, returning its JSON.
+        """
+        data = {"name": "photo.JPG", "content_type": "image/jpeg", "size": 100, **data}
+        response = self.client.post(reverse("ckeditor_upload_presign"), data)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def upload(self, content: bytes) -> dict:
+        """
+        Upload a file the way the browser does, returning the presign JSON.
+        """
+        upload = self.presign()
+        response = requests.post(
+            upload["url"],
+            data=upload["fields"],
+            files={"file": ("photo.jpg", content)},
+            timeout=10,
+        )
+        self.assertEqual(response.status_code, 204)
+        return upload
+
+    def complete(self, token: str):
+        """
+        Report a finished upload.
+        """
+        return self.client.post(reverse("ckeditor_upload_complete"), {"token": token})
+
+    def test_upload(self):
+        """
+        Test that a file uploaded to the bucket is recorded in the media library.
+        """
+        upload = self.upload(self.image)
+        self.assertEqual(upload["complete_url"], reverse("ckeditor_upload_complete"))
+        self.assertEqual(upload["fields"]["Content-Type"], "image/jpeg")
+
+        response = self.complete(upload["token"])
+
+        self.assertEqual(response.status_code, 200)
+        media = MediaLibrary.objects.get(
+            file_hash=hashlib.sha256(self.image).hexdigest()
+        )
+        self.assertTrue(media.file.name.startswith(DIRECT_UPLOAD_DIRECTORY))
+        self.assertTrue(media.file.name.endswith(".jpg"))
+        self.assertEqual((media.file_width, media.file_mime_type), (100, "image/jpeg"))
+        self.assertEqual(
+            media.content_type, ContentType.objects.get_for_model(MediaLibrary)
+        )
+        self.assertEqual(response.json(), {"url": media.file.url, "uploaded": "1"})
+
+    def test_completed_twice(self):
+        """
+        Test that completing the same upload again returns the same entry.
+        """
+        upload = self.upload(self.image)
+        first = self.complete(upload["token"]).json()
+        second = self.complete(upload["token"]).json()
+        self.assertEqual(first, second)
+        self.assertEqual(MediaLibrary.objects.count(), 1)
+
+    def test_duplicate(self):
+        """
+        Test that uploading a stored image again reuses its entry and drops the copy.
+        """
+        media = MediaLibrary.objects.store_upload(
+            ContentFile(self.image, name="photo.jpg"),
+            content_type=ContentType.objects.get_for_model(MediaLibrary),
+            object_id=0,
+        )
+        upload = self.upload(self.image)
+        name = read_direct_upload_token(upload["token"], self.regular_user.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.complete(upload["token"])
+
+        self.assertEqual(response.json()["url"], media.file.url)
+        self.assertEqual(MediaLibrary.objects.count(), 1)
+        self.assertFalse(default_storage.exists(name))
+
+    def test_not_an_image(self):
+        """
+        Test that files which aren't images are rejected and deleted.
+        """
+        upload = self.upload(b"not an image")
+        name = read_direct_upload_token(upload["token"], self.regular_user.pk)
+
+        response = self.complete(upload["token"])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(default_storage.exists(name))
+        self.assertFalse(MediaLibrary.objects.exists())
+
+    def test_not_uploaded(self):
+        """
+        Test that completing an upload that never reached the bucket fails.
+        """
+        response = self.complete(self.presign()["token"])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"]["message"], "Upload not found")
+
+    def test_invalid_token(self):
+        """
+        Test that tampered tokens and tokens of other users are rejected.
+        """
+        token = self.presign()["token"]
+        self.assertEqual(self.complete(token + "x").status_code, 400)
+
+        self.client.force_login(self.superuser)
+        self.assertEqual(self.complete(token).status_code, 400)
+        with self.assertRaises(signing.BadSignature):
+            read_direct_upload_token(token, self.superuser.pk)
+
+    def test_invalid_file(self):
+        """
+        Test that presigning rejects files that aren't images or are too large.
+        """
+        url = reverse("ckeditor_upload_presign")
+        data = {"name": "a.pdf", "content_type": "application/pdf", "size": 100}
+        self.assertEqual(self.client.post(url, data).status_code, 400)
+        data = {"name": "a.svg", "content_type": "image/svg+xml", "size": 100}
+        self.assertEqual(self.client.post(url, data).status_code, 400)
+
+        with self.settings(DIRECT_UPLOAD_MAX_SIZE=10):
+            data = {"name": "a.jpg", "content_type": "image/jpeg", "size": 11}
+            response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("at most 10 bytes", response.json()["error"]["message"])
+
+    def test_abandoned_uploads(self):
+        """
+        Test that uploads never completed are deleted once their token expired.
+        """
+        completed = self.upload(self.image)
+        self.complete(completed["token"])
+        abandoned = self.upload(self.image)
+        kept = read_direct_upload_token(completed["token"], self.regular_user.pk)
+        name = read_direct_upload_token(abandoned["token"], self.regular_user.pk)
+
+        self.assertEqual(delete_abandoned_direct_uploads(), 0)
+        self.assertTrue(default_storage.exists(name))
+
+        expired = timezone.now() + timedelta(seconds=settings.DIRECT_UPLOAD_EXPIRES * 2)
+        with mock.patch("apps.main.uploads.timezone.now", return_value=expired):
+            clean_direct_uploads(timestamp=0)
+        self.assertFalse(default_storage.exists(name))
+        self.assertTrue(default_storage.exists(kept))
+
+    def test_abandoned_uploads_without_directory(self):
+        """
+        Test that a local storage without direct uploads has nothing to delete.
+        """
+        with tempfile.TemporaryDirectory() as location:
+            local = {
+                "BACKEND": "django.core.files.storage.FileSystemStorage",
+                "OPTIONS": {"location": location},
+            }
+            with self.settings(STORAGES={**storages_with(), "default": local}):
+                self.assertEqual(delete_abandoned_direct_uploads(), 0)
+
+    def test_policy(self):
+        """
+        Test that the presigned POST sets the storage's ACL and cache headers.
+        """
+        with self.settings(STORAGES=storages_with(location="media")):
+            upload = create_direct_upload("a.png", "image/png", self.regular_user.pk)
+        fields = upload["fields"]
+        self.assertTrue(fields["key"].startswith(f"media/{DIRECT_UPLOAD_DIRECTORY}"))
+        self.assertEqual(fields["acl"], "public-read")
+        self.assertEqual(fields["Cache-Control"], "max-age=86400")
+
+        with self.settings(
+            STORAGES=storages_with(default_acl=None, object_parameters={})
+        ):
+            upload = create_direct_upload("a.png", "image/png", self.regular_user.pk)
+        self.assertNotIn("acl", upload["fields"])
+        self.assertNotIn("Cache-Control", upload["fields"])
+
+    def test_widget(self):
+        """
+        Test that the editor loads the upload adapter and knows where to presign.
+        """
+        widget = CKEditorWidget()
+        self.assertIn("django_ckeditor_5/dist/bundle.js", str(widget.media))
+        self.assertIn("js/ckeditor_direct_upload.js", str(widget.media))
+        context = widget.get_context("body", "", {"id": "id_body"})
+        self.assertEqual(
+            context["widget"]["attrs"]["data-direct-upload-url"],
+            reverse("ckeditor_upload_presign"),
+        )
+
+    @override_settings(CKEDITOR_DIRECT_UPLOADS=False)
+    def test_disabled(self):
+        """
+        Test that the views and the upload adapter are off unless enabled.
+        """
+        self.assertEqual(
+            self.client.post(reverse("ckeditor_upload_presign")).status_code, 404
+        )
+        self.assertEqual(
+            self.client.post(reverse("ckeditor_upload_complete")).status_code, 404
+        )
+        widget = CKEditorWidget()
+        self.assertNotIn("js/ckeditor_direct_upload.js", str(widget.media))
+        context = widget.get_context("body", "", {"id": "id_body"})
+        self.assertNotIn("data-direct-upload-url", context["widget"]["attrs"])
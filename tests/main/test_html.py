@@ -0,0 +1,108 @@
+from django.test import TestCase
+
+from apps.main.html import minify_html, render_html, sanitize_html
+from apps.main.models import FAQ, Notification
+from apps.users.models import User
+from tests.factories.main import FAQFactory, NotificationFactory
+from tests.factories.users import UserFactory
+
+
+class RenderHTMLTest(TestCase):
+    """
+    Test sanitizing and minifying stored HTML.
+    """
+
+    def test_sanitize_removes_scripts_and_handlers(self):
+        """
+        Test that scripts and event handlers are stripped while formatting is kept.
+        """
+        html = sanitize_html(
+            '<p onclick="steal()" class="lead"><b>Bold</b></p><script>alert(1)</script>'
+        )
+
+        self.assertEqual(html, '<p class="lead"><b>Bold</b></p>')
+
+    def test_minify_collapses_whitespace(self):
+        """
+        Test that whitespace runs are collapsed outside of <pre> blocks.
+        """
+        html = minify_html("  <p>Some\n\n   text</p>\n<pre>line 1\n  line 2</pre>  ")
+
+        self.assertEqual(html, "<p>Some text</p> <pre>line 1\n  line 2</pre>")
+
+    def test_render_empty_value(self):
+        """
+        Test that a missing value renders to an empty string.
+        """
+        self.assertEqual(render_html(None), "")
+
+
+class RenderedHTMLMixinTest(TestCase):
+    """
+    Test storing the rendered copy of HTML fields on save.
+    """
+
+    def test_rendered_on_save(self):
+        """
+        Test that every HTML field gets its rendered copy when the model is saved.
+        """
+        faq = FAQFactory(
+            question="<b>Why?</b>  ", answer="<p>Because<script></script></p>"
+        )
+
+        faq.refresh_from_db()
+        self.assertEqual(faq.question_html, "<b>Why?</b>")
+        self.assertEqual(faq.answer_html, "<p>Because</p>")
+
+    def test_render_html_fields(self):
+        """
+        Test that the rendered copies can be set without saving, e.g. for bulk_create().
+        """
+        faq = FAQ(question="<b>Why?</b> ", answer="<p>Because</p>")
+
+        faq.render_html_fields(["question"])
+        self.assertEqual((faq.question_html, faq.answer_html), ("<b>Why?</b>", ""))
+
+        faq.render_html_fields()
+        self.assertEqual(faq.answer_html, "<p>Because</p>")
+
+    def test_update_fields_only_renders_saved_fields(self):
+        """
+        Test that saving with update_fields renders and stores only the listed fields.
+        """
+        faq = FAQFactory(question="Old question", answer="Old answer")
+        faq.question = "New question"
+        faq.answer = "New answer"
+
+        faq.save(update_fields=["question"])
+
+        faq = FAQ.objects.get(pk=faq.pk)
+        self.assertEqual(faq.question_html, "New question")
+        self.assertEqual(faq.answer_html, "Old answer")
+
+    def test_broadcast_renders_message(self):
+        """
+        Test that broadcast notifications, which skip save(), store the rendered message.
+        """
+        user = UserFactory()
+
+        Notification.objects.broadcast_batch(
+            Notification(
+                title="Title",
+                message="<i>Hello</i><script></script>",
+                link="https://example.com",
+            ),
+            users=User.objects.filter(pk=user.pk),
+        )
+
+        self.assertEqual(
+            Notification.objects.get(user=user).message_html, "<i>Hello</i>"
+        )
+
+    def test_notification_rendered_on_create(self):
+        """
+        Test that notifications store the rendered message when created.
+        """
+        notification = NotificationFactory(message="<img src=x onerror=alert(1)>")
+
+        self.assertEqual(notification.message_html, '<img src="x">')
@@ -0,0 +1,191 @@
+import hashlib
+import io
+from io import StringIO
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.main.image_metadata import read_image_metadata
+from apps.main.models import MediaLibrary, SocialMediaLink
+from apps.users.models import User
+from tests.factories.dummy import DummyFactory
+from tests.factories.main import MediaLibraryFactory, SocialMediaLinkFactory
+from tests.factories.users import UserFactory
+from tests.test_app.models import Dummy
+from tests.utils import create_mock_image
+
+
+class ReadImageMetadataTest(TestCase):
+    """
+    Test the read_image_metadata function.
+    """
+
+    def test_image(self):
+        """
+        Test that the metadata of an image is read and the file is rewound.
+        """
+        content = create_mock_image().read()
+        file = io.BytesIO(content)
+        file.seek(10)
+        self.assertEqual(
+            read_image_metadata(file),
+            {
+                "width": 100,
+                "height": 100,
+                "size": len(content),
+                "mime_type": "image/jpeg",
+                "hash": hashlib.sha256(content).hexdigest(),
+            },
+        )
+        self.assertEqual(file.tell(), 0)
+
+    def test_not_an_image(self):
+        """
+        Test that files Pillow can't identify only get a size and hash.
+        """
+        metadata = read_image_metadata(io.BytesIO(b"not an image"))
+        self.assertIsNone(metadata["width"])
+        self.assertIsNone(metadata["mime_type"])
+        self.assertEqual(metadata["size"], 12)
+
+
+class ImageMetadataMixinTest(TestCase):
+    """
+    Test that image metadata is stored when files are uploaded.
+    """
+
+    def test_upload_stores_metadata(self):
+        """
+        Test that uploading an image stores its metadata, and the file is saved intact.
+        """
+        link = SocialMediaLinkFactory()
+        link.refresh_from_db()
+        self.assertEqual((link.image_width, link.image_height), (100, 100))
+        self.assertEqual(link.image_mime_type, "image/jpeg")
+        self.assertEqual(link.image_size, default_storage.size(link.image.name))
+        with default_storage.open(link.image.name) as file:
+            self.assertEqual(link.image_hash, hashlib.sha256(file.read()).hexdigest())
+
+    def test_unchanged_image_is_not_read(self):
+        """
+        Test that saving without a new file doesn't read it from storage.
+        """
+        link = SocialMediaLink.objects.get(pk=SocialMediaLinkFactory().pk)
+        with mock.patch("apps.main.image_metadata.read_image_metadata") as mock_read:
+            link.platform_name = "Renamed"
+            link.save()
+        mock_read.assert_not_called()
+
+    def test_update_fields(self):
+        """
+        Test that the metadata is saved along with its image field.
+        """
+        link = SocialMediaLinkFactory()
+        SocialMediaLink.objects.filter(pk=link.pk).update(image_hash=None)
+        link.image = create_mock_image()
+        link.save(update_fields=["image"])
+        self.assertIsNotNone(SocialMediaLink.objects.get(pk=link.pk).image_hash)
+
+        link.image = create_mock_image()
+        link.platform_name = "Renamed"
+        with mock.patch("apps.main.image_metadata.read_image_metadata") as mock_read:
+            link.save(update_fields=["platform_name"])
+        mock_read.assert_not_called()
+
+    def test_deferred_image_is_not_loaded(self):
+        """
+        Test that saving an instance with a deferred image field doesn't load it.
+        """
+        link = SocialMediaLink.objects.only("platform_name").get(
+            pk=SocialMediaLinkFactory().pk
+        )
+        link.platform_name = "Renamed"
+        with self.assertNumQueries(1):
+            link.save()
+
+    def test_cleared_image_clears_metadata(self):
+        """
+        Test that removing the image removes its metadata.
+        """
+        user = UserFactory(avatar=create_mock_image())
+        self.assertIsNotNone(user.avatar_hash)
+        user.avatar = None
+        user.save()
+        user.refresh_from_db()
+        self.assertIsNone(user.avatar_hash)
+        self.assertIsNone(user.avatar_width)
+
+
+class MediaLibraryMetadataTest(TestCase):
+    """
+    Test the metadata of MediaLibrary entries.
+    """
+
+    def test_copied_from_model(self):
+        """
+        Test that entries for a model keeping metadata copy it instead of reading the file.
+        """
+        with mock.patch(
+            "apps.main.image_metadata.read_image_metadata",
+            wraps=read_image_metadata,
+        ) as mock_read:
+            user = UserFactory(avatar=create_mock_image())
+        self.assertEqual(mock_read.call_count, 1)
+
+        media = MediaLibrary.objects.get(
+            content_type=ContentType.objects.get_for_model(User), object_id=user.pk
+        )
+        self.assertEqual(media.file_hash, user.avatar_hash)
+        self.assertEqual(media.file_width, 100)
+
+    def test_read_for_other_models(self):
+        """
+        Test that entries for a model without metadata read it from storage.
+        """
+        dummy = DummyFactory()
+        media = MediaLibrary.objects.get(
+            content_type=ContentType.objects.get_for_model(Dummy), object_id=dummy.pk
+        )
+        self.assertEqual(media.file_size, default_storage.size(dummy.image.name))
+        self.assertEqual(media.file_mime_type, "image/jpeg")
+
+
+class BackfillImageMetadataCommandTest(TestCase):
+    """
+    Test the backfill_image_metadata command.
+    """
+
+    def test_backfills_missing_metadata(self):
+        """
+        Test that rows without metadata are filled in, and unreadable files skipped.
+        """
+        media = MediaLibraryFactory()
+        link = SocialMediaLinkFactory()
+        user = UserFactory(avatar=create_mock_image())
+        missing = MediaLibraryFactory()
+        default_storage.delete(missing.file.name)
+        expected = (media.file_hash, link.image_hash, user.avatar_hash)
+
+        MediaLibrary.objects.update(file_hash=None, file_width=None)
+        SocialMediaLink.objects.update(image_hash=None)
+        User.objects.update(avatar_hash=None)
+
+        call_command(
+            "backfill_image_metadata",
+            "--batch-size",
+            "1",
+            "--workers",
+            "2",
+            stdout=StringIO(),
+        )
+
+        media.refresh_from_db()
+        link.refresh_from_db()
+        user.refresh_from_db()
+        missing.refresh_from_db()
+        self.assertEqual((media.file_hash, link.image_hash, user.avatar_hash), expected)
+        self.assertEqual(media.file_width, 100)
+        self.assertIsNone(missing.file_hash)
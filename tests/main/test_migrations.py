@@ -0,0 +1,88 @@
+from unittest import mock
+
+from django.apps import apps
+from django.test import TestCase
+
+from apps.main.models import FAQ, Comment, Report
+from tests.factories.main import CommentFactory, FAQFactory
+from tests.factories.users import UserFactory
+from tests.utils import load_migration, remove_constraints
+
+
+class BackfillReportsCountTest(TestCase):
+    """
+    Test the data migration storing reports_count on comments.
+    """
+
+    def test_counts_existing_reports(self):
+        """
+        Test that every comment gets the number of reports filed against it.
+        """
+        reported = CommentFactory()
+        reported.report(UserFactory(), "Spam")
+        reported.report(UserFactory(), "Spam")
+        unreported = CommentFactory()
+        Comment.objects.update(reports_count=7)
+
+        load_migration("main", "0004_comment_reports_count").backfill_reports_count(
+            apps, None
+        )
+
+        reported.refresh_from_db()
+        unreported.refresh_from_db()
+        self.assertEqual(reported.reports_count, 2)
+        self.assertEqual(unreported.reports_count, 0)
+
+
+class RemoveDuplicateReportsTest(TestCase):
+    """
+    Test the data migration removing repeat reports before they are made unique.
+    """
+
+    def test_keeps_first_report_and_recounts(self):
+        """
+        Test that only the oldest report of each reporter is kept and counts are fixed.
+        """
+        remove_constraints(Report, "unique_report_per_reporter")
+        comment = CommentFactory()
+        reporter = UserFactory()
+        first = comment.report(reporter, "Spam")
+        # bulk_create skips the hooks that keep reports_count up to date
+        Report.objects.bulk_create(
+            [
+                Report(content_object=comment, reporter=reporter, reason="Again")
+                for _ in range(2)
+            ]
+        )
+        comment.report(UserFactory(), "Spam")
+
+        load_migration(
+            "main", "0009_unique_report_per_reporter"
+        ).remove_duplicate_reports(apps, None)
+
+        self.assertEqual(Report.objects.filter(reporter=reporter).get(), first)
+        comment.refresh_from_db()
+        self.assertEqual(comment.reports_count, 2)
+
+
+class BackfillRenderedHTMLTest(TestCase):
+    """
+    Test the data migration rendering the HTML copies of existing rows.
+    """
+
+    def test_renders_existing_rows_in_batches(self):
+        """
+        Test that every row gets its rendered copies, across several batches.
+        """
+        FAQFactory.create_batch(3, question="<p>Question <script>x</script></p>")
+        FAQ.objects.update(question_html="", answer_html="")
+        migration = load_migration("main", "0008_rendered_html_fields")
+
+        with mock.patch.object(migration, "BATCH_SIZE", 2):
+            migration.backfill_rendered_html(apps, None)
+
+        self.assertEqual(
+            list(FAQ.objects.values_list("question_html", flat=True).distinct()),
+            ["<p>Question </p>"],
+        )
+        self.assertFalse(FAQ.objects.filter(answer_html="").exists())
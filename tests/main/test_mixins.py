@@ -1,10 +1,15 @@
+import warnings
 from unittest import TestCase, mock
 
 import pytest
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from tests.factories.dummy import DummyFactory
+from tests.factories.users import UserFactory
 from tests.test_app.models import Dummy
 from apps.main.models import MediaLibrary
 
@@ -58,16 +63,94 @@ class CreateMediaLibraryMixinTest(TestCase):
     @mock.patch("apps.main.mixins.CreateMediaLibraryMixin.create_media_library_entries")
     def test_save_calls_create_media_library_entries(self, mock_create_entries):
         """
-        Test that the save method calls create_media_library_entries.
+        Test that the save method calls create_media_library_entries for changed images.
         """
+        self.dummy_instance.image = "dummy_images/other_image.jpg"
         self.dummy_instance.save()
-        self.assertTrue(mock_create_entries.called)
+        mock_create_entries.assert_called_once_with(["image"])
+
+    @mock.patch("apps.main.mixins.CreateMediaLibraryMixin.create_media_library_entries")
+    def test_save_skips_unchanged_images(self, mock_create_entries):
+        """
+        Test that saving without changing an image skips the MediaLibrary sync.
+        """
+        self.dummy_instance.name = "Renamed"
+        self.dummy_instance.save()
+        Dummy.objects.get(pk=self.dummy_instance.pk).save()
+        self.assertFalse(mock_create_entries.called)
+
+    def test_save_with_update_fields_runs_no_media_library_queries(self):
+        """
+        Test that saving only other fields runs the UPDATE and nothing else.
+        """
+        dummy = Dummy.objects.get(pk=self.dummy_instance.pk)
+        dummy.image = "dummy_images/other_image.jpg"
+        dummy.name = "Renamed"
+        with CaptureQueriesContext(connection) as queries:
+            dummy.save(update_fields=["name"])
+        self.assertEqual(len(queries), 1)
+
+    def test_save_deferred_image_field(self):
+        """
+        Test that saving an instance with a deferred image field doesn't load it.
+        """
+        dummy = Dummy.objects.only("name").get(pk=self.dummy_instance.pk)
+        dummy.name = "Renamed"
+        with CaptureQueriesContext(connection) as queries:
+            dummy.save()
+        self.assertEqual(len(queries), 1)
+
+    def test_changed_image_is_synced_once(self):
+        """
+        Test that a new image creates an entry, and saving again does not query for it.
+        """
+        dummy = Dummy.objects.get(pk=self.dummy_instance.pk)
+        dummy.image = SimpleUploadedFile("new_image.jpg", b"image")
+        dummy.save()
+        content_type = ContentType.objects.get_for_model(Dummy)
+        self.assertTrue(
+            MediaLibrary.objects.filter(
+                content_type=content_type, object_id=dummy.pk, file=dummy.image.name
+            ).exists()
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            dummy.save()
+        self.assertEqual(len(queries), 1)
+
+    def test_load_without_deprecation_warning(self):
+        """
+        Test that loading an instance passes Django's extra from_db arguments through.
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            dummy = Dummy.objects.get(pk=self.dummy_instance.pk)
+        self.assertEqual(dummy.get_changed_media_library_fields(), [])
+
+    def test_get_media_library_metadata(self):
+        """
+        Test that only fields with stored metadata pass it on to the MediaLibrary entry.
+        """
+        user = UserFactory.build(avatar_width=10, avatar_hash="abc")
+        metadata = user.get_media_library_metadata("avatar")
+        self.assertEqual((metadata["file_width"], metadata["file_hash"]), (10, "abc"))
+
+        user.image_metadata_fields = []
+        self.assertEqual(user.get_media_library_metadata("avatar"), {})
+        self.assertEqual(self.dummy_instance.get_media_library_metadata("image"), {})
+
+    def test_get_image_field_names(self):
+        """
+        Test that the image fields of a model are listed.
+        """
+        self.assertEqual(Dummy.get_image_field_names(), ("image",))
 
     def test_ml_exclude_list(self):
         """
         Test that the field is skipped if it is in the ml_exclude_list.
         """
         self.dummy_instance.ml_exclude_list = ["image"]
+        self.dummy_instance.image = "dummy_images/other_image.jpg"
         self.dummy_instance.save()
         content_type = ContentType.objects.get_for_model(Dummy)
         media_library_entries = MediaLibrary.objects.filter(
@@ -82,6 +165,7 @@ class CreateMediaLibraryMixinTest(TestCase):
         Test that the field is skipped if it is not in the ml_include_list.
         """
         self.dummy_instance.ml_include_list = ["non_existent_field"]
+        self.dummy_instance.image = "dummy_images/other_image.jpg"
         self.dummy_instance.save()
         content_type = ContentType.objects.get_for_model(Dummy)
         media_library_entries = MediaLibrary.objects.filter(
@@ -114,7 +198,7 @@ class CreateMediaLibraryMixinTest(TestCase):
             content_type=content_type,
             object_id=self.dummy_instance.pk,
         )
-        self.dummy_instance.save()
+        self.dummy_instance.create_media_library_entries()
         media_library_entries = MediaLibrary.objects.filter(
             content_type=content_type,
             object_id=self.dummy_instance.pk,
@@ -1,8 +1,17 @@
+import hashlib
 import os
+import shutil
+from datetime import timedelta
+from tempfile import mkdtemp
+from unittest import mock
 
 from django.contrib.contenttypes.models import ContentType
-from django.test import TestCase
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
+from procrastinate.exceptions import AlreadyEnqueued
 
 from apps.main.models import (
     TermsAndConditions,
@@ -11,7 +20,11 @@ from apps.main.models import (
     Notification,
     SocialMediaLink,
     Report,
+    Comment,
+    MediaLibrary,
+    media_library_upload_to,
 )
+from apps.users.models import User
 from tests.base import BaseTestCase
 from tests.factories.dummy import DummyFactory
 
@@ -21,6 +34,7 @@ from tests.factories.main import (
     FAQFactory,
     MediaLibraryFactory,
     CommentFactory,
+    ReportFactory,
 )
 from tests.factories.users import UserFactory
 from tests.utils import create_mock_image
@@ -42,6 +56,43 @@ class TermsAndConditionsTest(TestCase):
             str(terms), f"Terms And Conditions created at {terms.created_at}"
         )
 
+    def test_current_is_newest_version(self):
+        """
+        Test that current() returns the most recent version, or None without any.
+        """
+        self.assertIsNone(TermsAndConditions.objects.current())
+
+        TermsAndConditions.objects.create(terms="Old terms")
+        with self.captureOnCommitCallbacks(execute=True):
+            newest = TermsAndConditions.objects.create(terms="New terms")
+
+        self.assertEqual(TermsAndConditions.objects.current(), newest)
+
+    def test_last_modified(self):
+        """
+        Test that last_modified() is the creation time of the current version, if any.
+        """
+        self.assertIsNone(TermsAndConditions.objects.last_modified())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            terms = TermsAndConditions.objects.create(terms="Sample Terms")
+
+        self.assertEqual(TermsAndConditions.objects.last_modified(), terms.created_at)
+
+    def test_current_is_cached(self):
+        """
+        Test that the current version is served from the cache until a version is created.
+        """
+        terms = TermsAndConditions.objects.create(terms="Sample Terms")
+        self.assertEqual(TermsAndConditions.objects.current(), terms)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(TermsAndConditions.objects.current(), terms)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            newest = TermsAndConditions.objects.create(terms="New terms")
+        self.assertEqual(TermsAndConditions.objects.current(), newest)
+
 
 class PrivacyPolicyTest(TestCase):
     """
@@ -57,6 +108,14 @@ class PrivacyPolicyTest(TestCase):
         self.assertTrue(isinstance(policy, PrivacyPolicy))
         self.assertEqual(str(policy), f"Privacy Policy created at {policy.created_at}")
 
+    def test_current(self):
+        """
+        Test that current() returns the most recent privacy policy.
+        """
+        policy = PrivacyPolicy.objects.create(policy="Sample Policy")
+
+        self.assertEqual(PrivacyPolicy.objects.current(), policy)
+
 
 class ContactTest(TestCase):
     """
@@ -118,6 +177,103 @@ class NotificationTest(TestCase):
         self.assertFalse(self.notification.is_read)
         self.notification.mark_as_read()
         self.assertTrue(self.notification.is_read)
+        self.notification.refresh_from_db()
+        self.assertTrue(self.notification.is_read)
+
+    def test_queryset_mark_as_read(self):
+        """
+        Test that the queryset method only updates unread notifications.
+        """
+        NotificationFactory(user=self.user, is_read=True)
+        NotificationFactory(user=self.user)
+
+        updated = Notification.objects.filter(user=self.user).mark_as_read()
+
+        self.assertEqual(updated, 2)
+        self.assertFalse(
+            Notification.objects.filter(user=self.user, is_read=False).exists()
+        )
+
+
+class NotificationBroadcastTest(BaseTestCase):
+    """
+    Test the Notification broadcast manager methods.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.users = UserFactory.create_batch(4)
+        self.inactive_user = UserFactory(is_active=False)
+        self.notification = Notification(
+            title="Announcement", message="Hello", link="https://example.com"
+        )
+
+    def test_broadcast_notifies_active_users(self):
+        """
+        Test that every active user gets exactly one notification.
+        """
+        with override_settings(NOTIFICATION_BROADCAST_BATCH_SIZE=2):
+            total = Notification.objects.broadcast(self.notification)
+
+        self.assertEqual(total, 6)
+        notified = Notification.objects.filter(title="Announcement")
+        self.assertEqual(notified.count(), 6)
+        self.assertFalse(notified.filter(user=self.inactive_user).exists())
+
+    def test_broadcast_reports_progress(self):
+        """
+        Test that progress is reported after every batch.
+        """
+        progress = mock.Mock()
+        users = User.objects.filter(pk__in=[user.pk for user in self.users])
+
+        with override_settings(NOTIFICATION_BROADCAST_BATCH_SIZE=3):
+            Notification.objects.broadcast(
+                self.notification, users=users, progress=progress
+            )
+
+        progress_calls = [
+            mock.call(self.users[2].pk, 3),
+            mock.call(self.users[3].pk, 4),
+        ]
+        progress.assert_has_calls(progress_calls)
+
+    def test_broadcast_batch_resumes_after_cursor(self):
+        """
+        Test that a batch only notifies users after the given cursor.
+        """
+        self.notification.type = "warning"
+        user_ids = Notification.objects.broadcast_batch(
+            self.notification, start_after=self.users[1].pk
+        )
+
+        self.assertEqual(user_ids, [user.pk for user in self.users[2:]])
+        self.assertTrue(
+            Notification.objects.filter(user=self.users[2], type="warning").exists()
+        )
+        self.assertFalse(Notification.objects.filter(user=self.users[1]).exists())
+
+    def test_broadcast_batch_when_finished(self):
+        """
+        Test that an empty list is returned once every user has been notified.
+        """
+        user_ids = Notification.objects.broadcast_batch(
+            self.notification, start_after=self.users[-1].pk
+        )
+
+        self.assertEqual(user_ids, [])
+
+    def test_broadcast_invalidates_unread_summary(self):
+        """
+        Test that broadcasting refreshes the cached unread counts.
+        """
+        user = self.users[0]
+        self.assertEqual(Notification.objects.get_unread_summary(user.pk)["count"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.broadcast(self.notification)
+
+        self.assertEqual(Notification.objects.get_unread_summary(user.pk)["count"], 1)
 
 
 class SocialMediaLinkTest(TestCase):
@@ -201,6 +357,115 @@ class MediaLibraryTest(TestCase):
         self.assertEqual(str(self.media_library), expected_str)
 
 
+class MediaLibraryDeduplicationTest(TestCase):
+    """
+    Test the content-addressed storage and deduplication of MediaLibrary uploads.
+    """
+
+    def setUp(self):
+        """
+        Set up an empty storage and the object the uploads belong to.
+        """
+        super().setUp()
+        # Files outlive the test's transaction, so each test gets an empty storage
+        media_root = mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        storage_settings = self.settings(MEDIA_ROOT=media_root)
+        storage_settings.enable()
+        self.addCleanup(storage_settings.disable)
+
+        self.content_type = ContentType.objects.get_for_model(MediaLibrary)
+        self.content = create_mock_image().read()
+        self.file_hash = hashlib.sha256(self.content).hexdigest()
+
+    def store(self, object_id: int = 0, **kwargs) -> MediaLibrary:
+        """
+        Store an upload of the same image.
+        """
+        return MediaLibrary.objects.store_upload(
+            SimpleUploadedFile("pasted.JPG", self.content),
+            content_type=self.content_type,
+            object_id=object_id,
+            **kwargs,
+        )
+
+    def test_stored_under_content_hash(self):
+        """
+        Test that uploads are stored under their hash, computed if not given.
+        """
+        media = self.store()
+        self.assertEqual(media.file_hash, self.file_hash)
+        self.assertEqual(media.file.name, f"media_library/{self.file_hash}.jpg")
+
+    def test_repeated_upload_is_reused(self):
+        """
+        Test that the same upload for the same object reuses the entry.
+        """
+        media = self.store(file_hash=self.file_hash)
+        with self.assertNumQueries(1):
+            reused = self.store(file_hash=self.file_hash)
+        self.assertEqual(reused.pk, media.pk)
+        self.assertEqual(MediaLibrary.objects.count(), 1)
+
+    def test_other_object_gets_own_entry(self):
+        """
+        Test that entries are only shared between uploads to the same object.
+        """
+        self.store()
+        self.store(object_id=1)
+        self.assertEqual(MediaLibrary.objects.count(), 2)
+
+    def test_delete(self):
+        """
+        Test that deleting the last entry of a file deletes the file.
+        """
+        media = self.store()
+        with self.captureOnCommitCallbacks(execute=True):
+            media.delete()
+        self.assertFalse(default_storage.exists(media.file.name))
+
+    def test_shared_file_is_kept(self):
+        """
+        Test that a file another entry refers to is not deleted.
+        """
+        media = self.store()
+        MediaLibrary.objects.create(
+            file=media.file.name, content_type=self.content_type, object_id=1
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            media.delete()
+        self.assertTrue(default_storage.exists(media.file.name))
+
+    def test_files_of_other_models_are_kept(self):
+        """
+        Test that deleting the entry of a model's image field keeps the model's file.
+        """
+        user = UserFactory(avatar=create_mock_image())
+        with self.captureOnCommitCallbacks(execute=True):
+            MediaLibrary.objects.filter(file=user.avatar.name).get().delete()
+        self.assertTrue(default_storage.exists(user.avatar.name))
+
+    @mock.patch("apps.main.models.media.queue_image_variants")
+    def test_variants_only_queued_for_images(self, mock_queue):
+        """
+        Test that uploads Pillow can't read don't get variants.
+        """
+        MediaLibrary.objects.store_upload(
+            SimpleUploadedFile("notes.txt", b"text"),
+            content_type=self.content_type,
+            object_id=0,
+        )
+        mock_queue.assert_not_called()
+
+    def test_upload_to_without_hash(self):
+        """
+        Test that entries without a hash keep the uploaded name.
+        """
+        self.assertEqual(
+            media_library_upload_to(MediaLibrary(), "a.jpg"), "media_library/a.jpg"
+        )
+
+
 class TestCommentModel(TestCase):
     """
     Test the Comment Model
@@ -220,6 +485,89 @@ class TestCommentModel(TestCase):
         )
 
 
+class CommentPrefetchTest(BaseTestCase):
+    """
+    Test loading the comments of many objects at once.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user_type = ContentType.objects.get_for_model(User)
+        now = timezone.now()
+        self.user_comments = [
+            CommentFactory(
+                content_type=self.user_type,
+                object_id=self.regular_user.pk,
+                created=now - timedelta(minutes=minutes),
+            )
+            for minutes in range(3)
+        ]
+        self.superuser_comment = CommentFactory(
+            content_type=self.user_type, object_id=self.superuser.pk
+        )
+        self.other_user = UserFactory()
+
+    def test_prefetch_for_attaches_comments(self):
+        """
+        Test that each object gets its own comments, newest first, in constant queries.
+        """
+        users = [self.regular_user, self.superuser, self.other_user]
+
+        with self.assertNumQueries(1):
+            Comment.objects.prefetch_for(users)
+            # Users are preloaded, so rendering the comments costs nothing more
+            rendered = [str(comment) for user in users for comment in user.comment_list]
+
+        self.assertEqual(len(rendered), 4)
+        self.assertEqual(self.regular_user.comment_list, self.user_comments)
+        self.assertEqual(self.superuser.comment_list, [self.superuser_comment])
+        self.assertEqual(self.other_user.comment_list, [])
+        self.assertIsNone(self.regular_user.comment_list_cursor)
+
+    def test_prefetch_for_with_limit_and_cursor(self):
+        """
+        Test paging through an object's comments with the cursor.
+        """
+        Comment.objects.prefetch_for([self.regular_user, self.superuser], limit=2)
+
+        self.assertEqual(self.regular_user.comment_list, self.user_comments[:2])
+        self.assertIsNotNone(self.regular_user.comment_list_cursor)
+        self.assertEqual(self.superuser.comment_list, [self.superuser_comment])
+        self.assertIsNone(self.superuser.comment_list_cursor)
+
+        Comment.objects.prefetch_for(
+            [self.regular_user],
+            limit=2,
+            before=self.regular_user.comment_list_cursor,
+        )
+
+        self.assertEqual(self.regular_user.comment_list, self.user_comments[2:])
+        self.assertIsNone(self.regular_user.comment_list_cursor)
+
+    def test_prefetch_for_mixed_models(self):
+        """
+        Test that objects of different models only get their own comments.
+        """
+        comment = CommentFactory(
+            content_type=ContentType.objects.get_for_model(Comment),
+            object_id=self.regular_user.pk,
+        )
+        target = Comment(pk=self.regular_user.pk)
+
+        Comment.objects.prefetch_for([self.regular_user, target], to_attr="previews")
+
+        # Attached under to_attr, so the attribute isn't declared on the models
+        self.assertEqual(getattr(self.regular_user, "previews"), self.user_comments)
+        self.assertEqual(getattr(target, "previews"), [comment])
+
+    def test_prefetch_for_no_objects(self):
+        """
+        Test that nothing is queried without objects.
+        """
+        with self.assertNumQueries(0):
+            self.assertEqual(Comment.objects.prefetch_for([]), [])
+
+
 class ReportableObjectTest(BaseTestCase):
     """Test cases for the ReportableObject functionality using Comment model."""
 
@@ -244,12 +592,92 @@ class ReportableObjectTest(BaseTestCase):
 
     def test_reports_count_with_multiple_reports(self):
         """Test reports_count returns correct number with multiple reports."""
-        # Create three reports
+        # Create three reports by different users
         for i in range(3):
-            self.comment.report(self.regular_user, f"Reason {i}")
+            self.comment.report(UserFactory(), f"Reason {i}")
 
         self.assertEqual(self.comment.reports_count, 3)
 
+    def test_repeated_report_is_deduplicated(self):
+        """Test that reporting the same object twice keeps a single report."""
+        first_report = self.comment.report(self.regular_user, "Reason")
+
+        with mock.patch("apps.main.models.reports.send_email_task.defer") as mock_defer:
+            second_report = self.comment.report(self.regular_user, "Other reason")
+
+        self.assertEqual(first_report, second_report)
+        self.assertEqual(second_report.reason, "Reason")
+        self.assertEqual(self.comment.reports_count, 1)
+        mock_defer.assert_not_called()
+
+    def test_reports_count_is_stored(self):
+        """Test reports_count is kept on the row so reading it needs no query."""
+        self.comment.report(self.regular_user, "Reason")
+        comment = Comment.objects.get(pk=self.comment.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(comment.reports_count, 1)
+
+    def test_deleting_a_report_decrements_reports_count(self):
+        """Test reports_count goes down when a report is deleted."""
+        report = self.comment.report(self.regular_user, "Reason")
+        self.comment.report(self.superuser, "Reason")
+
+        report.delete()
+        self.comment.refresh_from_db()
+
+        self.assertEqual(self.comment.reports_count, 1)
+
+    def test_bulk_deletes_decrement_reports_count(self):
+        """Test queryset deletes and cascades from a deleted reporter keep the count."""
+        reporter = UserFactory()
+        self.comment.report(reporter, "Reason")
+        self.comment.report(self.regular_user, "Reason")
+        self.comment.report(self.superuser, "Reason")
+
+        reporter.delete()
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.reports_count, 2)
+
+        Report.objects.filter(reporter=self.regular_user).delete()
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.reports_count, 1)
+
+    def test_report_queues_moderation(self):
+        """Test that a report queues a moderation run, unless one is already queued."""
+        with mock.patch(
+            "apps.main.models.reports.moderate_reported_objects.defer",
+            side_effect=AlreadyEnqueued(),
+        ) as mock_defer:
+            self.comment.report(self.regular_user, "Reason")
+
+        mock_defer.assert_called_once()
+        self.assertEqual(self.comment.reports_count, 1)
+
+    def test_report_on_non_reportable_object(self):
+        """Test reports on models without a counter do not fail."""
+        report = ReportFactory()
+
+        report.delete()
+
+        self.assertFalse(Report.objects.exists())
+
+    def test_counts_for(self):
+        """Test counts_for returns the counts of several objects at once."""
+        other_comment = CommentFactory(user=self.regular_user)
+        self.comment.report(self.regular_user, "Reason")
+        self.comment.report(self.superuser, "Reason")
+
+        with self.assertNumQueries(1):
+            counts = Report.objects.counts_for([self.comment, other_comment])
+
+        self.assertEqual(counts, {self.comment.pk: 2, other_comment.pk: 0})
+
+    def test_counts_for_no_objects(self):
+        """Test counts_for does not query when given no objects."""
+        with self.assertNumQueries(0):
+            self.assertEqual(Report.objects.counts_for([]), {})
+
     def test_report_url_generation(self):
         """Test that report_url property returns correct URL."""
         expected_url = reverse(
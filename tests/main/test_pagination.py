@@ -0,0 +1,159 @@
+import json
+from datetime import date, timedelta
+from unittest import mock
+
+from django.db import connection
+from django.utils import timezone
+
+from apps.main.models import Comment, Notification
+from apps.main.pagination import CursorEncoder, KeysetPaginator, estimate_count
+from apps.users.models import User
+from tests.base import BaseTestCase
+from tests.factories.main import CommentFactory, NotificationFactory
+
+
+class KeysetPaginatorTest(BaseTestCase):
+    """
+    Test the KeysetPaginator.
+    """
+
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        # Pairs of comments share a timestamp so the primary key has to break ties
+        self.comments = [
+            CommentFactory(created=now - timedelta(seconds=index // 2))
+            for index in range(7)
+        ]
+        self.expected = list(Comment.objects.order_by("-created", "-pk"))
+        self.paginator = KeysetPaginator(Comment.objects.all(), 3)
+
+    def test_walks_forward_and_backward(self):
+        """
+        Test that following the cursors visits every object once, in order, both ways.
+        """
+        first = self.paginator.get_page()
+        second = self.paginator.get_page(first.next_cursor)
+        third = self.paginator.get_page(second.next_cursor)
+
+        self.assertEqual(list(first) + list(second) + list(third), self.expected)
+        self.assertFalse(first.has_previous)
+        self.assertIsNone(first.previous_cursor)
+        self.assertTrue(second.has_next)
+        self.assertFalse(third.has_next)
+        self.assertIsNone(third.next_cursor)
+
+        back = self.paginator.get_page(third.previous_cursor)
+        self.assertEqual(list(back), list(second))
+        self.assertTrue(back.has_previous)
+
+        start = self.paginator.get_page(back.previous_cursor)
+        self.assertEqual(list(start), list(first))
+        self.assertFalse(start.has_previous)
+        self.assertTrue(start.has_next)
+
+    def test_ordering_defaults_to_model_and_appends_pk(self):
+        """
+        Test that the model ordering is used with the primary key as tie breaker.
+        """
+        self.assertEqual(self.paginator.ordering, ["-created", "-pk"])
+        paginator = KeysetPaginator(Notification.objects.all(), 3, ordering=["title"])
+        self.assertEqual(paginator.ordering, ["title", "pk"])
+
+    def test_rejects_related_and_nullable_orderings(self):
+        """
+        Test that orderings the cursor conditions can't follow are refused.
+        """
+        for ordering in (["user"], ["user__username"], ["-unknown"]):
+            with self.subTest(ordering=ordering):
+                with self.assertRaises(ValueError):
+                    KeysetPaginator(Comment.objects.all(), 3, ordering=ordering)
+
+        with self.assertRaises(ValueError):
+            KeysetPaginator(User.objects.all(), 3, ordering=["last_login"])
+
+    def test_cursor_encodes_other_values(self):
+        """
+        Test that values other than datetimes are encoded like DjangoJSONEncoder does.
+        """
+        self.assertEqual(
+            json.dumps([date(2026, 1, 2)], cls=CursorEncoder), '["2026-01-02"]'
+        )
+
+    def test_page_query_does_not_count(self):
+        """
+        Test that fetching a page runs a single query without COUNT(*).
+        """
+        cursor = self.paginator.get_page().next_cursor
+
+        with self.assertNumQueries(1):
+            page = self.paginator.get_page(cursor)
+            self.assertEqual(len(page), 3)
+            self.assertEqual(page[0], self.expected[3])
+
+    def test_invalid_cursor_returns_first_page(self):
+        """
+        Test that malformed or tampered cursors fall back to the first page.
+        """
+        for cursor in ["not-a-cursor", "WyJuIiwgWyJ4Il1d", "WyJuIiwgWyJ4IiwgMV1d"]:
+            page = self.paginator.get_page(cursor)
+            self.assertEqual(list(page), self.expected[:3])
+
+    def test_count(self):
+        """
+        Test the exact count.
+        """
+        self.assertEqual(self.paginator.count, 7)
+        self.assertEqual(repr(self.paginator.get_page()), "<KeysetPage of 3 objects>")
+
+
+class EstimateCountTest(BaseTestCase):
+    """
+    Test the estimated count used for large lists.
+    """
+
+    def setUp(self):
+        super().setUp()
+        NotificationFactory.create_batch(5, user=self.regular_user)
+
+    def test_unanalyzed_table_falls_back_to_count(self):
+        """
+        Test that a table without statistics is counted exactly.
+        """
+        with mock.patch("apps.main.pagination.connections") as connections:
+            cursor = connections.__getitem__.return_value.cursor.return_value
+            cursor.__enter__.return_value.fetchone.return_value = (-1,)
+
+            self.assertEqual(estimate_count(Notification.objects.all()), 5)
+
+    def test_analyzed_table_uses_reltuples(self):
+        """
+        Test that unfiltered querysets read the planner statistics.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Notification._meta.db_table}")
+
+        with self.assertNumQueries(1):
+            self.assertEqual(estimate_count(Notification.objects.all()), 5)
+
+    def test_filtered_queryset_uses_plan_estimate(self):
+        """
+        Test that filtered querysets use the row estimate of the query plan.
+        """
+        estimate = estimate_count(Notification.objects.filter(user=self.regular_user))
+
+        self.assertIsInstance(estimate, int)
+        self.assertGreaterEqual(estimate, 1)
+
+    def test_paginator_estimate(self):
+        """
+        Test that the paginator estimates the count when asked to.
+        """
+        paginator = KeysetPaginator(Notification.objects.all(), 2, estimate=True)
+
+        with mock.patch(
+            "apps.main.pagination.estimate_count", return_value=1000
+        ) as estimate:
+            self.assertEqual(paginator.count, 1000)
+
+        estimate.assert_called_once_with(paginator.queryset)
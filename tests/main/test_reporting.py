@@ -0,0 +1,151 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.main.models import Comment, Notification, Report
+from apps.main.reporting import (
+    deactivate_reported_objects,
+    get_reportable_content_type,
+    get_reportable_model,
+    get_reportable_models,
+)
+from tests.factories.main import CommentFactory
+from tests.factories.users import UserFactory
+
+
+class ReportableRegistryTest(TestCase):
+    """
+    Test the registry of reportable models.
+    """
+
+    def test_reportable_models_are_registered(self):
+        """
+        Test that models inheriting from ReportableObject are registered by name.
+        """
+        self.assertIs(get_reportable_model("comment"), Comment)
+
+    def test_other_models_are_not_registered(self):
+        """
+        Test that models that cannot be reported, or unknown names, are not resolved.
+        """
+        self.assertIsNone(get_reportable_model(Notification._meta.model_name))
+        self.assertIsNone(get_reportable_model("unknown"))
+        self.assertIsNone(get_reportable_content_type("unknown"))
+
+    def test_content_type_lookup_is_cached(self):
+        """
+        Test that resolving a content type needs no query once it is cached.
+        """
+        content_type = ContentType.objects.get_for_model(Comment)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_reportable_content_type("comment"), content_type)
+
+    def test_duplicate_report_names_raise(self):
+        """
+        Test that two reportable models with the same name are refused.
+        """
+        get_reportable_models.cache_clear()
+        self.addCleanup(get_reportable_models.cache_clear)
+        with patch(
+            "apps.main.reporting.apps.get_models", return_value=[Comment, Comment]
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                get_reportable_models()
+
+        self.assertIs(get_reportable_model("comment"), Comment)
+
+
+@override_settings(MODERATION_REPORT_THRESHOLD=2, MODERATION_WINDOW_SECONDS=3600)
+class DeactivateReportedObjectsTest(TestCase):
+    """
+    Test deactivating objects that received too many recent reports.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.comment = CommentFactory()
+        self.other_comment = CommentFactory()
+
+    def report(self, obj, times: int) -> None:
+        """
+        Report an object by several different users.
+        """
+        for _ in range(times):
+            obj.report(UserFactory(), "Spam")
+
+    def test_objects_over_threshold_are_deactivated(self):
+        """
+        Test that only the objects reaching the threshold are deactivated.
+        """
+        self.report(self.comment, 2)
+        self.report(self.other_comment, 1)
+
+        self.assertEqual(deactivate_reported_objects(), 1)
+
+        self.comment.refresh_from_db()
+        self.other_comment.refresh_from_db()
+        self.assertFalse(self.comment.active)
+        self.assertTrue(self.other_comment.active)
+
+    def test_inactive_objects_are_not_counted(self):
+        """
+        Test that running again does not count objects that are already inactive.
+        """
+        self.report(self.comment, 2)
+        deactivate_reported_objects()
+
+        self.assertEqual(deactivate_reported_objects(), 0)
+
+    def test_reports_outside_window_are_ignored(self):
+        """
+        Test that reports older than the window do not count.
+        """
+        self.report(self.comment, 2)
+        Report.objects.update(created=timezone.now() - timedelta(hours=2))
+
+        self.assertEqual(deactivate_reported_objects(), 0)
+
+    def test_reports_before_moderation_are_ignored(self):
+        """
+        Test that a reactivated object is only deactivated again by newer reports.
+        """
+        self.report(self.comment, 2)
+        deactivate_reported_objects()
+        self.comment.refresh_from_db()
+        self.comment.activate()
+        self.report(self.other_comment, 2)
+
+        self.assertEqual(deactivate_reported_objects(), 1)
+        self.comment.refresh_from_db()
+        self.other_comment.refresh_from_db()
+        self.assertTrue(self.comment.active)
+        self.assertFalse(self.other_comment.active)
+
+        self.report(self.comment, 2)
+        self.assertEqual(deactivate_reported_objects(), 1)
+        self.comment.refresh_from_db()
+        self.assertFalse(self.comment.active)
+
+    def test_model_threshold_overrides_setting(self):
+        """
+        Test that a model's report_threshold takes precedence over the setting.
+        """
+        self.report(self.comment, 2)
+
+        with patch.object(Comment, "report_threshold", 3):
+            self.assertEqual(deactivate_reported_objects(), 0)
+
+    @override_settings(MODERATION_REPORT_THRESHOLD=0)
+    def test_disabled(self):
+        """
+        Test that a threshold of 0 turns automatic moderation off.
+        """
+        self.report(self.comment, 2)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(deactivate_reported_objects(), 0)
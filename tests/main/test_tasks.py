@@ -3,10 +3,21 @@ from unittest.mock import patch, Mock
 
 from django.test import TestCase, override_settings
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 
 from slack_sdk.errors import SlackApiError
 
-from apps.main.tasks import send_email_task, send_slack_message, notify_by_slack
+from apps.main.models import Comment, Notification, Report
+from apps.main.tasks import (
+    send_email_task,
+    send_slack_message,
+    notify_by_slack,
+    broadcast_notification,
+    create_report,
+    moderate_reported_objects,
+)
+from tests.base import BaseTestCase
+from tests.factories.main import CommentFactory
 
 
 class TestSendEmailTask(TestCase):
@@ -109,3 +120,108 @@ class SlackNotificationTests(TestCase):
 
         # Assert
         mock_send.defer.assert_called_once_with(self.message)
+
+
+class BroadcastNotificationTaskTests(BaseTestCase):
+    """Test suite for the broadcast_notification task"""
+
+    @override_settings(NOTIFICATION_BROADCAST_BATCH_SIZE=1)
+    @patch("apps.main.tasks.broadcast_notification.defer")
+    def test_broadcast_queues_next_batch(self, mock_defer):
+        """Test that a batch is inserted and the next batch is queued"""
+        broadcast_notification("Title", "Message", "https://example.com")
+
+        self.assertEqual(Notification.objects.filter(title="Title").count(), 1)
+        notified_id = Notification.objects.get(title="Title").user_id
+        mock_defer.assert_called_once_with(
+            title="Title",
+            message="Message",
+            link="https://example.com",
+            notification_type="info",
+            start_after=notified_id,
+        )
+
+    @patch("apps.main.tasks.broadcast_notification.defer")
+    def test_broadcast_stops_when_finished(self, mock_defer):
+        """Test that no job is queued once every user is notified"""
+        broadcast_notification(
+            "Title", "Message", "https://example.com", start_after=self.superuser.pk
+        )
+
+        self.assertFalse(Notification.objects.filter(title="Title").exists())
+        mock_defer.assert_not_called()
+
+    def test_broadcast_is_retried(self):
+        """Test that a failed batch is retried"""
+        self.assertEqual(broadcast_notification.retry_strategy.max_attempts, 5)
+
+
+class CreateReportTaskTests(BaseTestCase):
+    """Test suite for the create_report task"""
+
+    def setUp(self):
+        super().setUp()
+        self.comment = CommentFactory()
+        self.content_type_id = ContentType.objects.get_for_model(Comment).pk
+
+    def test_report_is_stored_once(self):
+        """Test that running the job twice stores a single report"""
+        for _ in range(2):
+            create_report(
+                self.content_type_id, self.comment.pk, self.regular_user.pk, "Spam"
+            )
+
+        report = Report.objects.get()
+        self.assertEqual(report.content_object, self.comment)
+        self.assertEqual(report.reporter, self.regular_user)
+        self.comment.refresh_from_db()
+        self.assertEqual(self.comment.reports_count, 1)
+
+    def test_missing_object_is_dropped(self):
+        """Test that reports of deleted objects are dropped"""
+        object_id = self.comment.pk
+        self.comment.delete()
+
+        create_report(self.content_type_id, object_id, self.regular_user.pk, "Spam")
+
+        self.assertFalse(Report.objects.exists())
+
+    def test_unreportable_model_is_dropped(self):
+        """Test that reports of models that cannot be reported are dropped"""
+        content_type_id = ContentType.objects.get_for_model(Notification).pk
+        notification = Notification.objects.create(
+            user=self.regular_user, title="Title", message="Message"
+        )
+
+        create_report(content_type_id, notification.pk, self.regular_user.pk, "Spam")
+
+        self.assertFalse(Report.objects.exists())
+
+    def test_missing_reporter_is_dropped(self):
+        """Test that reports by deleted users are dropped"""
+        create_report(self.content_type_id, self.comment.pk, 0, "Spam")
+
+        self.assertFalse(Report.objects.exists())
+
+
+class ModerateReportedObjectsTaskTests(TestCase):
+    """Test suite for the moderate_reported_objects task"""
+
+    @patch("apps.main.tasks.logger")
+    @patch("apps.main.tasks.deactivate_reported_objects", return_value=2)
+    def test_logs_deactivated_objects(self, mock_deactivate, mock_logger):
+        """Test that a run deactivates the reported objects and logs how many"""
+        moderate_reported_objects(timestamp=0)
+
+        mock_deactivate.assert_called_once_with()
+        mock_logger.info.assert_called_once_with(
+            "Moderation deactivated %s reported objects", 2
+        )
+
+    @patch("apps.main.tasks.logger")
+    @patch("apps.main.tasks.deactivate_reported_objects", return_value=0)
+    def test_quiet_when_nothing_deactivated(self, mock_deactivate, mock_logger):
+        """Test that runs without deactivations do not log"""
+        moderate_reported_objects(timestamp=0)
+
+        mock_logger.info.assert_not_called()
@@ -0,0 +1,25 @@
+import hashlib
+
+from django.test import TestCase
+
+from apps.main.uploads import HashingUploadHandler
+
+
+class HashingUploadHandlerTest(TestCase):
+    """
+    Test the HashingUploadHandler.
+    """
+
+    def test_hashes_chunks_and_passes_them_on(self):
+        """
+        Test that every chunk is hashed and handed to the next handler.
+        """
+        handler = HashingUploadHandler()
+        handler.new_file("upload", "image.jpg", "image/jpeg", None)
+        self.assertEqual(handler.receive_data_chunk(b"first ", 0), b"first ")
+        self.assertEqual(handler.receive_data_chunk(b"second", 6), b"second")
+        self.assertIsNone(handler.file_complete(12))
+
+        self.assertEqual(
+            handler.hashes, {"upload": hashlib.sha256(b"first second").hexdigest()}
+        )
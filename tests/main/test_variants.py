@@ -0,0 +1,332 @@
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image
+from procrastinate.exceptions import AlreadyEnqueued
+
+from apps.main.image_processing import resize_image
+from apps.main.models import MediaLibrary, MediaVariant
+from apps.main.tasks import generate_image_variants, queue_image_variants
+from apps.main.variants import (
+    MISSING_VARIANTS_TIMEOUT,
+    generate_variants,
+    get_executor,
+    get_mime_type,
+    get_srcset,
+    get_variant_url,
+    get_variants,
+    variants_key,
+)
+from tests.factories.main import MediaLibraryFactory
+from tests.factories.users import UserFactory
+from tests.utils import create_mock_image
+
+
+def create_image(width: int, height: int, mode: str = "RGB") -> bytes:
+    """
+    Create a PNG image of the given size.
+    """
+    output = io.BytesIO()
+    Image.new(mode, (width, height)).save(output, format="PNG")
+    return output.getvalue()
+
+
+class ResizeImageTest(TestCase):
+    """
+    Test the resize_image function run by the process pool.
+    """
+
+    def test_shrinks_to_width(self):
+        """
+        Test that wide images are shrunk to the width, keeping their aspect ratio.
+        """
+        content, width, height = resize_image(create_image(1000, 500), 160, "webp", 75)
+        self.assertEqual((width, height), (160, 80))
+        self.assertEqual(Image.open(io.BytesIO(content)).format, "WEBP")
+
+    def test_never_upscales(self):
+        """
+        Test that narrow images keep their size.
+        """
+        content, width, height = resize_image(create_image(100, 50), 160, "avif", 75)
+        self.assertEqual((width, height), (100, 50))
+        self.assertEqual(Image.open(io.BytesIO(content)).format, "AVIF")
+
+    def test_keeps_transparency(self):
+        """
+        Test that transparent images stay transparent.
+        """
+        content, _, _ = resize_image(create_image(100, 50, "RGBA"), 160, "webp", 75)
+        self.assertEqual(Image.open(io.BytesIO(content)).mode, "RGBA")
+
+
+@override_settings(
+    IMAGE_VARIANT_SIZES={"thumbnail": 160, "medium": 800},
+    IMAGE_VARIANT_FORMATS=["avif", "webp"],
+)
+class GenerateVariantsTest(TestCase):
+    """
+    Test the generation and lookup of image variants.
+    """
+
+    def setUp(self):
+        """
+        Create a media file larger than the thumbnail.
+        """
+        super().setUp()
+        self.media = MediaLibraryFactory(file__width=1000, file__height=500)
+        self.source = self.media.file.name
+
+    def test_generates_every_size_and_format(self):
+        """
+        Test that a variant is stored for every size and format.
+        """
+        generated = generate_variants(self.source)
+        self.assertEqual(len(generated), 4)
+        thumbnail = MediaVariant.objects.get(
+            source=self.source, name="thumbnail", format="webp"
+        )
+        self.assertEqual((thumbnail.width, thumbnail.height), (160, 80))
+        self.assertEqual(thumbnail.size, thumbnail.file.size)
+        self.assertTrue(thumbnail.file.name.startswith("media_variants/"))
+        self.assertIn("(thumbnail, webp)", str(thumbnail))
+
+    def test_only_generates_missing_variants(self):
+        """
+        Test that existing variants are not generated again.
+        """
+        generate_variants(self.source)
+        with override_settings(IMAGE_VARIANT_FORMATS=["avif", "webp", "jpeg"]):
+            with mock.patch("apps.main.variants.resize_image") as mock_resize:
+                mock_resize.return_value = (b"image", 160, 80)
+                generated = generate_variants(self.source)
+        self.assertEqual(
+            [(variant.name, variant.format) for variant in generated],
+            [("thumbnail", "jpeg"), ("medium", "jpeg")],
+        )
+        self.assertEqual(generate_variants(self.source), [])
+
+    @override_settings(IMAGE_VARIANT_WORKERS=2)
+    def test_resizes_in_executor(self):
+        """
+        Test that images are resized in the executor when workers are configured.
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with mock.patch(
+                "apps.main.variants.get_executor", return_value=executor
+            ) as mock_get_executor:
+                generated = generate_variants(self.source)
+        mock_get_executor.assert_called_once()
+        self.assertEqual(len(generated), 4)
+
+    @override_settings(IMAGE_VARIANT_WORKERS=1)
+    def test_get_executor_is_reused(self):
+        """
+        Test that the process pool is started once.
+        """
+        get_executor.cache_clear()
+        self.addCleanup(get_executor.cache_clear)
+        executor = get_executor()
+        try:
+            self.assertIsInstance(executor, ProcessPoolExecutor)
+            self.assertIs(get_executor(), executor)
+        finally:
+            executor.shutdown()
+
+    def test_lookups(self):
+        """
+        Test the srcset and URL of generated variants.
+        """
+        self.assertEqual(get_srcset(self.source, "webp"), "")
+        self.assertIsNone(get_variant_url(self.source, "thumbnail"))
+
+        generate_variants(self.source)
+        thumbnail, medium = MediaVariant.objects.filter(
+            source=self.source, format="webp"
+        ).order_by("width")
+        self.assertEqual(
+            get_srcset(self.source, "webp"),
+            f"{thumbnail.file.url} 160w, {medium.file.url} 800w",
+        )
+        self.assertEqual(get_variant_url(self.source, "thumbnail"), thumbnail.file.url)
+        self.assertEqual(get_mime_type("avif"), "image/avif")
+
+    def test_get_variants_is_cached(self):
+        """
+        Test that looking up variants again doesn't query the database.
+        """
+        generate_variants(self.source)
+        get_variants(self.source)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(get_variants(self.source)), 4)
+
+    def test_missing_variants_are_cached_briefly(self):
+        """
+        Test that an image without variants yet is not cached for long.
+        """
+        get_variants(self.source)
+        self.assertAlmostEqual(
+            cache.get(variants_key(self.source))[2],
+            time.time() + MISSING_VARIANTS_TIMEOUT,
+            delta=1,
+        )
+
+    def test_deleting_media_deletes_variants(self):
+        """
+        Test that deleting the last entry of a file deletes its variants and their files.
+        """
+        variants = generate_variants(self.source)
+        get_variants(self.source)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.media.delete()
+
+        self.assertFalse(MediaVariant.objects.filter(source=self.source).exists())
+        for variant in variants:
+            self.assertFalse(default_storage.exists(variant.file.name))
+        self.assertEqual(get_variants(self.source), [])
+
+    def test_task(self):
+        """
+        Test that the task generates the variants.
+        """
+        generate_image_variants(source=self.source)
+        self.assertEqual(MediaVariant.objects.filter(source=self.source).count(), 4)
+
+
+class QueueImageVariantsTest(TestCase):
+    """
+    Test the queueing of the variant generation.
+    """
+
+    @mock.patch("apps.main.models.media.queue_image_variants")
+    def test_new_media_queues_variants(self, mock_queue):
+        """
+        Test that creating a media file queues its variants.
+        """
+        media = MediaLibraryFactory()
+        # The factory's Dummy queues the entry of its own image too
+        mock_queue.assert_any_call(media.file.name)
+
+    @mock.patch("apps.main.tasks.generate_image_variants.configure")
+    def test_queueing_lock(self, mock_configure):
+        """
+        Test that jobs are locked per image and already queued images are skipped.
+        """
+        mock_configure.return_value.defer.side_effect = AlreadyEnqueued()
+        queue_image_variants("media_library/a.jpg")
+        mock_configure.assert_called_once_with(
+            queueing_lock="image_variants:media_library/a.jpg"
+        )
+        mock_configure.return_value.defer.assert_called_once_with(
+            source="media_library/a.jpg"
+        )
+
+
+@override_settings(IMAGE_VARIANT_FORMATS=["webp"])
+class ImageTagsTest(TestCase):
+    """
+    Test the image template tags.
+    """
+
+    def setUp(self):
+        """
+        Create a media file with variants.
+        """
+        super().setUp()
+        self.media = MediaLibraryFactory(file__width=1000, file__height=500)
+
+    def render(self, template: str, **context) -> str:
+        """
+        Render a template using the image tags.
+        """
+        return Template("{% load image_tags %}" + template).render(Context(context))
+
+    def test_srcset(self):
+        """
+        Test the srcset filter.
+        """
+        generate_variants(self.media.file.name)
+        self.assertEqual(
+            self.render("{{ image|srcset }}", image=self.media.file),
+            get_srcset(self.media.file.name, "webp"),
+        )
+        self.assertEqual(self.render("{{ image|srcset }}", image=None), "")
+
+    def test_responsive_image(self):
+        """
+        Test that the picture lists the variants and falls back to the original.
+        """
+        template = '{% responsive_image image alt="Alt" sizes="50vw" css_class="w-8" %}'
+        html = self.render(template, image=self.media.file)
+        self.assertNotIn("<source", html)
+        self.assertIn(f'src="{self.media.file.url}"', html)
+
+        generate_variants(self.media.file.name)
+        html = self.render(template, image=self.media.file)
+        self.assertIn('<source type="image/webp"', html)
+        self.assertIn('sizes="50vw"', html)
+        self.assertIn('class="w-8"', html)
+
+    def test_responsive_image_without_image(self):
+        """
+        Test that an empty image renders no sources.
+        """
+        html = self.render("{% responsive_image image %}", image=None)
+        self.assertNotIn("<source", html)
+        self.assertIn('src=""', html)
+
+
+class AvatarVariantTest(TestCase):
+    """
+    Test that avatars use their thumbnail variant.
+    """
+
+    def test_avatar_url_uses_thumbnail(self):
+        """
+        Test that avatar_url returns the thumbnail once it is generated.
+        """
+        user = UserFactory(avatar=create_mock_image())
+        self.assertEqual(user.avatar_url, user.avatar.url)
+
+        generate_variants(user.avatar.name)
+        self.assertEqual(
+            user.avatar_url, get_variant_url(user.avatar.name, "thumbnail")
+        )
+        self.assertIn("media_variants/", user.avatar_url)
+
+
+class GenerateImageVariantsCommandTest(TestCase):
+    """
+    Test the generate_image_variants command.
+    """
+
+    @mock.patch(
+        "apps.main.management.commands.generate_image_variants.queue_image_variants"
+    )
+    def test_queues_images_without_variants(self, mock_queue):
+        """
+        Test that only images without variants are queued, unless --all is given.
+        """
+        with_variants = MediaLibraryFactory()
+        generate_variants(with_variants.file.name)
+        without_variants = MediaLibraryFactory()
+
+        call_command("generate_image_variants", stdout=StringIO())
+        queued = [call.args[0] for call in mock_queue.call_args_list]
+        self.assertIn(without_variants.file.name, queued)
+        self.assertNotIn(with_variants.file.name, queued)
+
+        mock_queue.reset_mock()
+        call_command("generate_image_variants", "--all", stdout=StringIO())
+        self.assertEqual(
+            mock_queue.call_count,
+            MediaLibrary.objects.values("file").distinct().count(),
+        )
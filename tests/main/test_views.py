@@ -1,10 +1,11 @@
+import hashlib
 import os
 from tempfile import mkdtemp
 from unittest.mock import patch, mock_open
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from apps.main.consts import ContactType
@@ -67,6 +68,92 @@ class MarkAsReadAndRedirectViewTestCase(BaseTestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 404)
 
+    def test_already_read_notification_redirects(self):
+        """
+        Test that an already read notification still redirects.
+        """
+        self.notification.mark_as_read()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, self.notification.link)
+
+
+class MarkNotificationsAsReadViewTestCase(BaseTestCase):
+    """
+    Test cases for the mark_notifications_as_read view.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.client.force_login(self.regular_user)
+        self.notifications = NotificationFactory.create_batch(3, user=self.regular_user)
+        self.other_notification = NotificationFactory()
+        self.url = reverse("mark_notifications_as_read")
+
+    def test_mark_all_as_read(self):
+        """
+        Test that every notification of the user is marked as read.
+        """
+        response = self.client.post(self.url, HTTP_REFERER="/previous/")
+
+        self.assertRedirects(response, "/previous/", fetch_redirect_response=False)
+        self.assertFalse(self.regular_user.notifications.filter(is_read=False).exists())
+        self.other_notification.refresh_from_db()
+        self.assertFalse(self.other_notification.is_read)
+
+    def test_mark_selected_as_read(self):
+        """
+        Test that only the posted notifications are marked as read.
+        """
+        self.client.post(
+            self.url,
+            {
+                "notification_ids": [
+                    self.notifications[0].id,
+                    self.other_notification.id,
+                ]
+            },
+        )
+
+        self.assertEqual(
+            self.regular_user.notifications.filter(is_read=False).count(), 2
+        )
+        self.other_notification.refresh_from_db()
+        self.assertFalse(self.other_notification.is_read)
+
+    def test_invalid_ids(self):
+        """
+        Test that ids which aren't integers are rejected without marking anything.
+        """
+        response = self.client.post(
+            self.url, {"notification_ids": [self.notifications[0].id, "abc"]}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            self.regular_user.notifications.filter(is_read=False).count(), 3
+        )
+
+    def test_htmx_request_renders_dropdown(self):
+        """
+        Test that HTMX requests get the refreshed dropdown back.
+        """
+        response = self.client.post(self.url, HTTP_HX_REQUEST="true")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "components/notifications.html")
+        self.assertContains(response, "No notifications at this time")
+
+    def test_get_not_allowed(self):
+        """
+        Test that the view only accepts POST requests.
+        """
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 405)
+
 
 class ContactUsViewTests(TestCase):
     """
@@ -168,6 +255,14 @@ class TermsAndConditionsViewTests(TestCase):
         # Assert that the response contains the terms and conditions
         self.assertContains(response, "This is a test terms and conditions page.")
 
+    def test_no_terms_and_conditions(self):
+        """
+        Test that a 404 is returned before any terms and conditions are published.
+        """
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
+
 
 class PrivacyPolicyViewTests(TestCase):
     """
@@ -194,6 +289,14 @@ class PrivacyPolicyViewTests(TestCase):
         # Assert that the response contains the privacy policy
         self.assertContains(response, "This is a test privacy policy page.")
 
+    def test_no_privacy_policy(self):
+        """
+        Test that a 404 is returned before any privacy policy is published.
+        """
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
+
 
 class ReportViewTest(TestCase):
     """
@@ -253,6 +356,18 @@ class ReportViewTest(TestCase):
         self.assertEqual(response.status_code, 302)
         self.assertEqual(response.url, "home")
 
+    def test_report_of_model_that_is_not_reportable(self):
+        """
+        Test that only models inheriting from ReportableObject can be reported.
+        """
+        notification = NotificationFactory()
+        report_url = reverse("report", args=["notification", notification.pk])
+
+        response = self.client.post(report_url, {"reason": "Spam"})
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Report.objects.exists())
+
     def test_report_creation_with_invalid_object_id(self):
         """
         Test report creation with an invalid object ID.
@@ -277,6 +392,57 @@ class ReportViewTest(TestCase):
         self.assertFalse(exists)
 
 
+@override_settings(REPORTS_ASYNC=True)
+class AsyncReportViewTest(TestCase):
+    """
+    Test cases for queueing reports with REPORTS_ASYNC.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.reporter = UserFactory()
+        self.client.force_login(self.reporter)
+        self.comment = CommentFactory()
+        self.content_type = ContentType.objects.get_for_model(Comment)
+        self.report_url = reverse("report", args=["comment", self.comment.pk])
+
+    @patch("apps.main.views.create_report.defer")
+    def test_report_is_queued(self, mock_defer):
+        """
+        Test that the report is queued instead of stored during the request.
+        """
+        response = self.client.post(self.report_url, {"reason": "Spam"})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Report.objects.exists())
+        mock_defer.assert_called_once_with(
+            content_type_id=self.content_type.pk,
+            object_id=self.comment.pk,
+            reporter_id=self.reporter.pk,
+            reason="Spam",
+        )
+
+    @patch("apps.main.views.create_report.defer")
+    def test_repeated_report_is_queued_once(self, mock_defer):
+        """
+        Test that a report storm from the same user queues a single job.
+        """
+        for _ in range(3):
+            self.client.post(self.report_url, {"reason": "Spam"})
+
+        mock_defer.assert_called_once()
+
+    @patch("apps.main.views.create_report.defer")
+    def test_unknown_model(self, mock_defer):
+        """
+        Test that reports of unknown models are rejected without queueing a job.
+        """
+        response = self.client.post(reverse("report", args=["unknown", 1]))
+
+        self.assertEqual(response.status_code, 404)
+        mock_defer.assert_not_called()
+
+
 class RobotsViewTests(BaseTestCase):
     """
     robots.txt view
@@ -355,9 +521,11 @@ class CustomUploadViewTestCase(BaseTestCase):
         self.assertIn("url", json_response)
         self.assertEqual(json_response["fileName"], "test_file.jpg")
 
-        self.assertTrue(
-            MediaLibrary.objects.filter(file__contains="test_file.jpg").exists()
-        )
+        file_hash = hashlib.sha256(file_content).hexdigest()
+        media = MediaLibrary.objects.get(file_hash=file_hash)
+        # Stored under its content hash
+        self.assertEqual(media.file.name, f"media_library/{file_hash}.jpg")
+        self.assertEqual(json_response["url"], media.file.url)
 
     def test_upload_no_file(self):
         """
@@ -396,7 +564,9 @@ class CustomUploadViewTestCase(BaseTestCase):
 
         self.client.post(self.url, {"upload": file})
 
-        saved_file = MediaLibrary.objects.get(file__contains="test_content_file.txt")
+        saved_file = MediaLibrary.objects.get(
+            file_hash=hashlib.sha256(file_content).hexdigest()
+        )
         with saved_file.file.open("rb") as f:
             self.assertEqual(f.read(), file_content)
 
@@ -408,12 +578,27 @@ class CustomUploadViewTestCase(BaseTestCase):
         """
         for i in range(3):
             file = SimpleUploadedFile(
-                f"test_file_{i}.jpg", b"content", content_type="image/jpeg"
+                f"test_file_{i}.jpg", f"content {i}".encode(), content_type="image/jpeg"
             )
             self.client.post(self.url, {"upload": file})
 
         self.assertEqual(MediaLibrary.objects.count(), 3)
 
+    def test_upload_duplicate_files(self):
+        """
+        Test that uploading the same content again reuses the stored file.
+        This test verifies that repeated uploads share one MediaLibrary entry.
+        """
+        urls = []
+        for i in range(3):
+            file = SimpleUploadedFile(
+                f"pasted_{i}.jpg", b"same content", content_type="image/jpeg"
+            )
+            urls.append(self.client.post(self.url, {"upload": file}).json()["url"])
+
+        media = MediaLibrary.objects.get()
+        self.assertEqual(set(urls), {media.file.url})
+
     def test_upload_large_file(self):
         """
         Test uploading a large file (5MB).
@@ -433,7 +618,9 @@ class CustomUploadViewTestCase(BaseTestCase):
         json_response = response.json()
         self.assertEqual(json_response["uploaded"], "1")
 
-        saved_file = MediaLibrary.objects.get(file__contains="large_file.bin")
+        saved_file = MediaLibrary.objects.get(
+            file_hash=hashlib.sha256(large_file_content).hexdigest()
+        )
         self.assertEqual(saved_file.file.size, 5 * 1024 * 1024)
 
     def test_upload_as_regular_user(self):
@@ -39,3 +39,26 @@ MEDIA_ROOT = BASE_DIR / "media"
 MEDIA_URL = "/media/"
 
 ENABLE_EMAILS = False
+
+# Reload the blocklist on every check so it never outlives a test's rolled back data
+BLOCKLIST_REFRESH_SECONDS = 0
+
+# A file based cache is shared between processes like Redis, without needing a server
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": tempfile.mkdtemp(),
+    },
+    "local": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "local",
+    },
+}
+
+# Tests run in rolled back transactions whose on_commit hooks never bump model versions, so
+# rendered HTML must not be shared between tests. Tests of the caches override these.
+FRAGMENT_CACHE_TIMEOUT = 0
+PAGE_CACHE_TIMEOUT = 0
+
+# Resize images in the test process, so no process pool is started per test run
+IMAGE_VARIANT_WORKERS = 0
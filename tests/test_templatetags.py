@@ -1,10 +1,19 @@
 from django import forms
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache, caches
 from django.core.paginator import Paginator
-from django.template import Context, Template
-from django.test import RequestFactory
+from django.template import Context, Template, TemplateSyntaxError
+from django.test import RequestFactory, override_settings
+from waffle.testutils import override_flag
 
 from apps.main.forms import ReportForm
-from apps.main.templatetags.custom_filters import get_page_link, report_button
+from apps.main.models import Comment, SocialMediaLink
+from apps.main.pagination import KeysetPaginator
+from apps.main.templatetags.custom_filters import (
+    get_cursor_link,
+    get_page_link,
+    report_button,
+)
 from tests.base import BaseTestCase
 from tests.factories.main import CommentFactory
 from tests.factories.users import UserFactory
@@ -127,6 +136,41 @@ class PaginationTagsTest(BaseTestCase):
         self.assertIn("1", output)
         self.assertIn("10", output)
 
+    def test_get_cursor_link(self):
+        """Test the cursor link template tag replaces the page number"""
+        request = self.factory.get("/some-url?page=3&q=term")
+        context = Context({"request": request})
+
+        cursor_link = get_cursor_link(context, "abc")
+
+        self.assertEqual(cursor_link, "/some-url?q=term&cursor=abc")
+
+    def test_cursor_pagination(self):
+        """Test the cursor pagination template tag"""
+        CommentFactory.create_batch(3)
+        paginator = KeysetPaginator(Comment.objects.all(), 2)
+        page = paginator.get_page()
+        request = self.factory.get("/some-url")
+        context = Context({"request": request, "page_obj": page})
+
+        template = Template("{% load custom_filters %}{% cursor_pagination %}")
+        output = template.render(context)
+
+        self.assertIn(f"/some-url?cursor={page.next_cursor}", output)
+        self.assertNotIn("results", output)
+
+    def test_cursor_pagination_estimated_count(self):
+        """Test the cursor pagination template tag shows an estimated count"""
+        paginator = KeysetPaginator(Comment.objects.all(), 2, estimate=True)
+        paginator.count = 1000
+        request = self.factory.get("/some-url")
+        context = Context({"request": request, "page_obj": paginator.get_page()})
+
+        template = Template("{% load custom_filters %}{% cursor_pagination %}")
+        output = template.render(context)
+
+        self.assertIn("About 1000 results", output)
+
     def test_get_query_param(self):
         """Test query params template tag"""
         request = self.factory.get("/some-url?param=value")
@@ -138,3 +182,127 @@ class PaginationTagsTest(BaseTestCase):
         output = template.render(context)
 
         self.assertEqual(output.strip(), "value")
+
+
+@override_settings(FRAGMENT_CACHE_TIMEOUT=60)
+class CachedFragmentTagTest(BaseTestCase):
+    """Test cases for the 'cachedfragment' and 'uncached' template tags."""
+
+    def setUp(self):
+        """
+        Setup tests
+        """
+        super().setUp()
+        cache.clear()
+        caches["local"].clear()
+        self.request = RequestFactory().get("/")
+        self.request.user = AnonymousUser()
+        self.calls = 0
+        self.template = Template(
+            "{% load fragment_cache %}"
+            "{% cachedfragment 'fragment' value %}"
+            "{{ counter }}|{% uncached %}{{ slot }}{% enduncached %}"
+            "{% endcachedfragment %}"
+        )
+
+    def counter(self):
+        """Count how often the cached part of a fragment is rendered."""
+        self.calls += 1
+        return "cached"
+
+    def render(self, template=None, **context):
+        """Render a template with the request and counter in the context."""
+        context = {"request": self.request, "counter": self.counter, **context}
+        return (template or self.template).render(Context(context))
+
+    def test_fragment_is_cached_and_slots_are_not(self):
+        """Test that the fragment is rendered once while slots render on every call."""
+        self.assertEqual(self.render(slot="first"), "cached|first")
+        self.assertEqual(self.render(slot="second"), "cached|second")
+        self.assertEqual(self.calls, 1)
+
+    def test_vary_on_values(self):
+        """Test that extra vary values get their own cache entry."""
+        self.render(value=1)
+        self.render(value=2)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_authenticated_users_get_their_own_entry(self):
+        """Test that anonymous and authenticated users do not share fragments."""
+        self.render()
+        self.request.user = self.regular_user
+        self.render()
+
+        self.assertEqual(self.calls, 2)
+
+    def test_waffle_flags_vary_the_fragment(self):
+        """Test that the state of the listed waffle flags is part of the key."""
+        template = Template(
+            "{% load fragment_cache %}"
+            "{% cachedfragment 'flagged' flags='new_navbar' %}{{ counter }}"
+            "{% endcachedfragment %}"
+        )
+
+        with override_flag("new_navbar", active=False):
+            self.render(template)
+            self.render(template)
+        with override_flag("new_navbar", active=True):
+            self.render(template)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_depends_on_model_changes(self):
+        """Test that a fragment is rendered again when a model it depends on changes."""
+        template = Template(
+            "{% load fragment_cache %}"
+            "{% cachedfragment 'links' depends_on='main.SocialMediaLink' %}{{ counter }}"
+            "{% endcachedfragment %}"
+        )
+        self.render(template)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SocialMediaLink.objects.create(
+                platform_name="Example", profile_url="https://example.com"
+            )
+        self.render(template)
+
+        self.assertEqual(self.calls, 2)
+
+    def test_nested_fragments(self):
+        """Test that slots of a nested fragment are filled in on every render."""
+        template = Template(
+            "{% load fragment_cache %}"
+            "{% cachedfragment 'outer' %}{{ counter }}|"
+            "{% cachedfragment 'inner' %}{% uncached %}{{ slot }}{% enduncached %}"
+            "{% endcachedfragment %}{% endcachedfragment %}"
+        )
+
+        self.assertEqual(self.render(template, slot="first"), "cached|first")
+        self.assertEqual(self.render(template, slot="second"), "cached|second")
+        self.assertEqual(self.calls, 1)
+
+    def test_uncached_outside_fragment(self):
+        """Test that an uncached block on its own renders normally."""
+        template = Template(
+            "{% load fragment_cache %}{% uncached %}{{ slot }}{% enduncached %}"
+        )
+
+        self.assertEqual(self.render(template, slot="value"), "value")
+
+    def test_without_request(self):
+        """Test that fragments render outside of a request."""
+        template = Template(
+            "{% load fragment_cache %}"
+            "{% cachedfragment 'no_request' flags='new_navbar' %}{{ counter }}"
+            "{% endcachedfragment %}"
+        )
+
+        self.assertEqual(template.render(Context({"counter": self.counter})), "cached")
+
+    def test_name_is_required(self):
+        """Test that the tag needs a fragment name."""
+        with self.assertRaises(TemplateSyntaxError):
+            Template(
+                "{% load fragment_cache %}{% cachedfragment %}{% endcachedfragment %}"
+            )
@@ -2,12 +2,12 @@ from unittest import mock
 from unittest.mock import Mock
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
 from django.contrib.admin.sites import AdminSite
 
 from tests.factories.users import UserFactory, UserIPFactory, UserDeviceFactory
 from apps.users.admin import UserIPAdmin, UserAdmin
-from apps.users.models import UserDevice, UserIP
+from apps.users.models import IPAddressStats, UserDevice, UserIP
 
 User = get_user_model()
 
@@ -119,6 +119,46 @@ class UserIPAdminTest(TestCase):
             "Should be used by 1 user",
         )
 
+    def test_changelist_annotates_shared_user_count(self):
+        """
+        Test that the changelist queryset carries the shared user count and sorts by it
+        :return:
+        """
+        request = RequestFactory().get("/")
+        queryset = self.user_ip_admin.get_queryset(request)
+
+        with self.assertNumQueries(1):
+            rows = list(queryset.order_by("-shared_users", "pk"))
+            counts = [self.user_ip_admin.shared_user_count(row) for row in rows]
+
+        self.assertEqual(counts, [2, 2, 1])
+        self.assertEqual(rows[-1], self.user_ip3)
+
+    def test_shared_user_count_without_stats(self):
+        """
+        Test that addresses without stats count as unshared
+        :return:
+        """
+        IPAddressStats.objects.all().delete()
+
+        self.assertEqual(self.user_ip_admin.shared_user_count(self.user_ip1), 0)
+
+    def test_get_users_on_same_ip_is_truncated(self):
+        """
+        Test that heavily shared addresses only list the first users
+        :return:
+        """
+        for index in range(3):
+            UserIPFactory(
+                user=UserFactory(username=f"shared{index}"), ip_address="192.168.1.1"
+            )
+
+        with mock.patch("apps.users.admin.SHARED_IP_USERS_SHOWN", 2):
+            users = self.user_ip_admin.get_users_on_same_ip(self.user_ip1)
+
+        self.assertTrue(users.endswith(", and 2 more"))
+        self.assertEqual(users.count(","), 2)
+
     def test_get_users_on_same_ip(self):
         """
         Test the get_users_on_same_ip method of the UserIPAdmin
@@ -0,0 +1,149 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+
+from apps.users.blocklist import Blocklist, blocklist
+from apps.users.models import UserIP, UserDevice
+from tests.base import BaseTestCase
+from tests.factories.users import UserIPFactory, UserDeviceFactory
+
+
+@override_settings(BLOCKLIST_REFRESH_SECONDS=3600)
+class BlocklistTest(BaseTestCase):
+    """
+    Test the in-memory Blocklist.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        UserIPFactory(ip_address="10.0.0.1", is_blocked=True)
+        UserDeviceFactory(device_identifier="blocked-device", is_blocked=True)
+        self.blocklist = Blocklist()
+
+    def test_membership(self):
+        """
+        Test that blocked entries are found and others are not.
+        """
+        self.assertTrue(self.blocklist.is_ip_blocked("10.0.0.1"))
+        self.assertFalse(self.blocklist.is_ip_blocked("10.0.0.2"))
+        self.assertTrue(self.blocklist.is_device_blocked("blocked-device"))
+        self.assertFalse(self.blocklist.is_device_blocked("other-device"))
+        self.assertFalse(self.blocklist.is_ip_blocked(None))
+
+    def test_checks_do_not_query_once_loaded(self):
+        """
+        Test that membership checks are served from memory after the first load.
+        """
+        self.blocklist.is_ip_blocked("10.0.0.1")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.blocklist.is_ip_blocked("10.0.0.1")
+            self.blocklist.is_device_blocked("blocked-device")
+
+        self.assertEqual(len(queries), 0)
+
+    def test_version_change_triggers_reload(self):
+        """
+        Test that another process bumping the version makes this one reload.
+        """
+        self.assertFalse(self.blocklist.is_ip_blocked("10.0.0.3"))
+
+        UserIP.objects.filter(ip_address="10.0.0.1").update(ip_address="10.0.0.3")
+        with self.captureOnCommitCallbacks(execute=True):
+            Blocklist().invalidate()
+
+        self.assertTrue(self.blocklist.is_ip_blocked("10.0.0.3"))
+
+    def test_add_is_visible_without_reload(self):
+        """
+        Test that added entries are visible immediately in the same process.
+        """
+        self.blocklist.is_ip_blocked("10.0.0.1")
+        self.blocklist.add(ip_addresses=["10.0.0.9"], device_identifiers=["device9"])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(self.blocklist.is_ip_blocked("10.0.0.9"))
+            self.assertTrue(self.blocklist.is_device_blocked("device9"))
+
+        self.assertEqual(len(queries), 0)
+
+    def test_version_is_bumped_on_commit(self):
+        """
+        Test that other processes are only told to reload once the change commits.
+        """
+        self.blocklist.is_ip_blocked("10.0.0.1")
+        version = cache.get(Blocklist.VERSION_KEY)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.blocklist.add(ip_addresses=["10.0.0.9"])
+            self.blocklist.invalidate()
+            self.assertEqual(cache.get(Blocklist.VERSION_KEY), version)
+
+        self.assertNotEqual(cache.get(Blocklist.VERSION_KEY), version)
+
+    @override_settings(BLOCKLIST_REFRESH_SECONDS=0)
+    def test_refresh_interval_reloads(self):
+        """
+        Test that the blocklist reloads once the refresh interval has passed.
+        """
+        self.assertTrue(self.blocklist.is_ip_blocked("10.0.0.1"))
+
+        UserIP.objects.update(is_blocked=False)
+
+        self.assertFalse(self.blocklist.is_ip_blocked("10.0.0.1"))
+
+
+class BlocklistSyncTest(BaseTestCase):
+    """
+    Test that model changes keep the shared blocklist in sync.
+    """
+
+    def test_blocking_an_ip_in_the_admin(self):
+        """
+        Test that flipping is_blocked on a saved UserIP blocks it.
+        """
+        user_ip = UserIPFactory(ip_address="10.0.1.1")
+        self.assertFalse(blocklist.is_ip_blocked("10.0.1.1"))
+
+        user_ip.is_blocked = True
+        user_ip.save()
+
+        self.assertTrue(blocklist.is_ip_blocked("10.0.1.1"))
+
+    def test_unblocking_a_device(self):
+        """
+        Test that lifting a device block removes it from the blocklist.
+        """
+        device = UserDeviceFactory(device_identifier="device-x", is_blocked=True)
+        self.assertTrue(blocklist.is_device_blocked("device-x"))
+
+        device.is_blocked = False
+        device.save()
+
+        self.assertFalse(blocklist.is_device_blocked("device-x"))
+
+    def test_deleting_a_blocked_ip(self):
+        """
+        Test that deleting a blocked row removes it from the blocklist.
+        """
+        user_ip = UserIPFactory(ip_address="10.0.1.2", is_blocked=True)
+        self.assertTrue(blocklist.is_ip_blocked("10.0.1.2"))
+
+        user_ip.delete()
+
+        self.assertFalse(blocklist.is_ip_blocked("10.0.1.2"))
+
+    def test_user_block_ips_and_devices(self):
+        """
+        Test that blocking a user adds their IPs and devices.
+        """
+        UserIPFactory(user=self.regular_user, ip_address="10.0.1.3")
+        UserDeviceFactory(user=self.regular_user, device_identifier="device-y")
+
+        self.regular_user.block_user()
+
+        self.assertTrue(blocklist.is_ip_blocked("10.0.1.3"))
+        self.assertTrue(blocklist.is_device_blocked("device-y"))
+        self.assertTrue(UserDevice.objects.get(device_identifier="device-y").is_blocked)
@@ -1,4 +1,5 @@
 from unittest.mock import patch
+from django.test import override_settings
 from django.urls import reverse
 from django.contrib.messages import get_messages
 from apps.users.middleware import SecurityMiddleware, security_middleware_excluded_views
@@ -55,6 +56,40 @@ class SecurityMiddlewareTests(BaseTestCase):
             ).exists()
         )
 
+    @override_settings(USER_TRACKING_BUFFERED=True)
+    @patch("apps.users.middleware.tracking_buffer")
+    @patch("apps.users.middleware.get_client_ip")
+    @patch("apps.users.middleware.SecurityMiddleware.get_device_identifier")
+    def test_update_user_tracking_buffered(
+        self, mock_get_device, mock_get_ip, mock_buffer
+    ):
+        """
+        Test that buffered tracking queues the sighting instead of writing it.
+        """
+        mock_get_ip.return_value = ("192.168.1.2", True)
+        mock_get_device.return_value = "device456"
+
+        self.client.get("/")
+
+        mock_buffer.add.assert_called_once_with(
+            self.regular_user.pk, "192.168.1.2", "device456"
+        )
+        self.assertFalse(UserIP.objects.filter(user=self.regular_user).exists())
+
+    @patch("apps.users.middleware.should_track", return_value=False)
+    @patch("apps.users.middleware.get_client_ip")
+    def test_update_user_tracking_throttled(self, mock_get_ip, mock_should_track):
+        """
+        Test that a recently seen combination is not written again.
+        """
+        mock_get_ip.return_value = ("192.168.1.3", True)
+
+        self.client.get("/")
+
+        self.assertTrue(mock_should_track.called)
+        self.assertFalse(UserIP.objects.filter(user=self.regular_user).exists())
+        self.assertFalse(UserDevice.objects.filter(user=self.regular_user).exists())
+
     @patch("apps.users.middleware.UserIP.objects.is_ip_blocked")
     @patch("apps.users.middleware.UserDevice.objects.is_device_blocked")
     def test_is_ip_or_device_blocked(self, mock_device_blocked, mock_ip_blocked):
@@ -0,0 +1,45 @@
+from django.apps import apps
+from django.test import TestCase
+
+from apps.users.models import UserDevice, UserIP
+from tests.factories.users import UserFactory
+from tests.utils import load_migration, remove_constraints
+
+
+class RemoveDuplicateTrackingRowsTest(TestCase):
+    """
+    Test the data migration collapsing duplicate tracking rows.
+    """
+
+    def test_keeps_newest_row_and_blocked_flag(self):
+        """
+        Test that the newest duplicate is kept and inherits the blocked flag.
+        """
+        remove_constraints(UserIP, "unique_user_ip_address")
+        remove_constraints(UserDevice, "unique_user_device_identifier")
+        user = UserFactory()
+        UserIP.objects.bulk_create(
+            [
+                UserIP(user=user, ip_address="10.0.0.1", is_blocked=True),
+                UserIP(user=user, ip_address="10.0.0.1"),
+                UserIP(user=user, ip_address="10.0.0.2"),
+            ]
+        )
+        UserDevice.objects.bulk_create(
+            [
+                UserDevice(user=user, device_identifier="device1"),
+                UserDevice(user=user, device_identifier="device1"),
+            ]
+        )
+        newest = UserIP.objects.filter(ip_address="10.0.0.1").latest("id")
+
+        load_migration(
+            "users", "0003_unique_user_tracking"
+        ).remove_duplicate_tracking_rows(apps, None)
+
+        kept = UserIP.objects.get(ip_address="10.0.0.1")
+        self.assertEqual(kept.pk, newest.pk)
+        self.assertTrue(kept.is_blocked)
+        self.assertEqual(UserIP.objects.count(), 2)
+        self.assertEqual(UserDevice.objects.count(), 1)
+        self.assertFalse(UserDevice.objects.get().is_blocked)
@@ -6,7 +6,7 @@ from django.test import TestCase
 from tests.factories.users import UserFactory, UserDeviceFactory, UserIPFactory
 from tests.utils import create_mock_image
 
-from apps.users.models import User, UserIP, UserDevice
+from apps.users.models import IPAddressStats, User, UserIP, UserDevice
 
 
 class UserTest(TestCase):
@@ -166,6 +166,98 @@ class UserIPManagerTests(TestCase):
         self.assertIn(self.ip_address, ip_history.values_list("ip_address", flat=True))
 
 
+class IPAddressStatsTests(TestCase):
+    """
+    Test that the per-IP user counts follow the tracking pipeline
+    """
+
+    def setUp(self):
+        """
+        Create two users
+        :return:
+        """
+        self.user1 = UserFactory()
+        self.user2 = UserFactory()
+        self.ip_address = "10.0.0.1"
+
+    def get_count(self, ip_address):
+        """
+        Return the stored user count of an IP address
+        :param ip_address:
+        :return:
+        """
+        return IPAddressStats.objects.get(ip_address=ip_address).user_count
+
+    def test_count_follows_created_and_deleted_rows(self):
+        """
+        Test that creating and deleting UserIP rows refreshes the count
+        :return:
+        """
+        UserIPFactory(user=self.user1, ip_address=self.ip_address)
+        user_ip = UserIPFactory(user=self.user2, ip_address=self.ip_address)
+        self.assertEqual(self.get_count(self.ip_address), 2)
+
+        user_ip.delete()
+        self.assertEqual(self.get_count(self.ip_address), 1)
+
+    def test_count_follows_queryset_and_cascade_deletes(self):
+        """
+        Test that rows deleted without UserIP.delete() are uncounted too
+        :return:
+        """
+        UserIPFactory(user=self.user1, ip_address=self.ip_address)
+        UserIPFactory(user=self.user2, ip_address=self.ip_address)
+        UserIPFactory(user=self.user2, ip_address="10.0.0.2")
+
+        UserIP.objects.filter(user=self.user1).delete()
+        self.assertEqual(self.get_count(self.ip_address), 1)
+
+        self.user2.delete()
+        self.assertEqual(self.get_count(self.ip_address), 0)
+        self.assertEqual(self.get_count("10.0.0.2"), 0)
+
+    def test_refresh_recounts_stale_counts(self):
+        """
+        Test that refreshing overwrites a wrong count, including with 0
+        :return:
+        """
+        UserIPFactory(user=self.user1, ip_address=self.ip_address)
+        IPAddressStats.objects.update(user_count=5)
+        IPAddressStats.objects.create(ip_address="10.0.0.2", user_count=3)
+
+        IPAddressStats.objects.refresh([self.ip_address, "10.0.0.2"])
+
+        self.assertEqual(self.get_count(self.ip_address), 1)
+        self.assertEqual(self.get_count("10.0.0.2"), 0)
+
+    def test_bulk_track_refreshes_counts(self):
+        """
+        Test that a bulk upsert refreshes every address of the batch at once
+        :return:
+        """
+        UserIP.objects.bulk_track(
+            [
+                (self.user1.pk, self.ip_address),
+                (self.user2.pk, self.ip_address),
+                (self.user1.pk, "10.0.0.2"),
+            ]
+        )
+
+        self.assertEqual(self.get_count(self.ip_address), 2)
+        self.assertEqual(self.get_count("10.0.0.2"), 1)
+        self.assertEqual(
+            str(IPAddressStats.objects.get(ip_address="10.0.0.2")), "10.0.0.2 (1 users)"
+        )
+
+    def test_refresh_without_addresses(self):
+        """
+        Test that refreshing no addresses does not query the database
+        :return:
+        """
+        with self.assertNumQueries(0):
+            IPAddressStats.objects.refresh([])
+
+
 class UserDeviceManagerTests(TestCase):
     """
     Test the UserDeviceManager
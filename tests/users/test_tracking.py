@@ -0,0 +1,163 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import override_settings
+
+from apps.users.models import UserIP, UserDevice
+from apps.users.tracking import TrackingBuffer, should_track
+from tests.base import BaseTestCase
+from tests.factories.users import UserDeviceFactory, UserFactory, UserIPFactory
+
+
+class ShouldTrackTest(BaseTestCase):
+    """
+    Test the should_track throttle.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    @override_settings(USER_TRACKING_THROTTLE_SECONDS=300)
+    def test_repeat_sighting_is_throttled(self):
+        """
+        Test that the same combination is only tracked once within the window.
+        """
+        self.assertTrue(should_track(self.regular_user.pk, "10.0.0.1", "device"))
+        self.assertFalse(should_track(self.regular_user.pk, "10.0.0.1", "device"))
+
+    @override_settings(USER_TRACKING_THROTTLE_SECONDS=300)
+    def test_new_ip_is_tracked(self):
+        """
+        Test that a new IP for the same user is not throttled.
+        """
+        self.assertTrue(should_track(self.regular_user.pk, "10.0.0.1", "device"))
+        self.assertTrue(should_track(self.regular_user.pk, "10.0.0.2", "device"))
+
+    @override_settings(USER_TRACKING_THROTTLE_SECONDS=0)
+    def test_throttle_disabled(self):
+        """
+        Test that every sighting is tracked when the throttle is disabled.
+        """
+        self.assertTrue(should_track(self.regular_user.pk, "10.0.0.1", "device"))
+        self.assertTrue(should_track(self.regular_user.pk, "10.0.0.1", "device"))
+
+
+@override_settings(USER_TRACKING_BATCH_SIZE=3, USER_TRACKING_FLUSH_INTERVAL=3600)
+class TrackingBufferTest(BaseTestCase):
+    """
+    Test the TrackingBuffer write-behind buffer.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.buffer = TrackingBuffer()
+
+    def test_add_does_not_write_below_threshold(self):
+        """
+        Test that sightings stay in memory until a threshold is reached.
+        """
+        self.buffer.add(self.regular_user.pk, "10.0.0.1", None)
+
+        self.assertEqual(len(self.buffer), 1)
+        self.assertFalse(UserIP.objects.filter(user=self.regular_user).exists())
+
+    def test_add_flushes_at_batch_size(self):
+        """
+        Test that reaching the batch size writes every pending sighting once the
+        transaction commits.
+        """
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.buffer.add(self.regular_user.pk, "10.0.0.1", "device1")
+            self.buffer.add(self.superuser.pk, "10.0.0.2", None)
+            self.assertEqual(len(self.buffer), 3)
+
+        self.assertEqual(len(callbacks), 1)
+
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(UserIP.objects.count(), 2)
+        self.assertEqual(UserDevice.objects.count(), 1)
+
+    @override_settings(USER_TRACKING_FLUSH_INTERVAL=0)
+    def test_add_flushes_after_interval(self):
+        """
+        Test that sightings are written once the flush interval has passed.
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            self.buffer.add(self.regular_user.pk, None, "device1")
+
+        self.assertEqual(len(self.buffer), 0)
+        self.assertTrue(
+            UserDevice.objects.filter(
+                user=self.regular_user, device_identifier="device1"
+            ).exists()
+        )
+
+    def test_duplicate_sightings_are_collapsed(self):
+        """
+        Test that the same sighting queued twice only counts once.
+        """
+        self.buffer.add(self.regular_user.pk, "10.0.0.1", None)
+        self.buffer.add(self.regular_user.pk, "10.0.0.1", None)
+
+        self.assertEqual(len(self.buffer), 1)
+
+    def test_flush_updates_existing_rows(self):
+        """
+        Test that flushing upserts existing rows without touching the blocked flag.
+        """
+        user_ip = UserIPFactory(
+            user=self.regular_user, ip_address="10.0.0.1", is_blocked=True
+        )
+        device = UserDeviceFactory(user=self.regular_user, device_identifier="device1")
+        previous_last_seen = user_ip.last_seen
+
+        self.buffer.add(self.regular_user.pk, "10.0.0.1", "device1")
+        self.buffer.flush()
+
+        user_ip.refresh_from_db()
+        device.refresh_from_db()
+        self.assertEqual(UserIP.objects.filter(user=self.regular_user).count(), 1)
+        self.assertTrue(user_ip.is_blocked)
+        self.assertGreater(user_ip.last_seen, previous_last_seen)
+
+    def test_flush_empty_buffer(self):
+        """
+        Test that flushing an empty buffer does not touch the database.
+        """
+        with patch.object(UserIP.objects, "bulk_track") as mock_bulk_track:
+            self.buffer.flush()
+
+        mock_bulk_track.assert_not_called()
+
+    def test_flush_skips_deleted_users(self):
+        """
+        Test that sightings of users deleted since they were queued are dropped.
+        """
+        deleted = UserFactory()
+        self.buffer.add(deleted.pk, "10.0.0.1", "device1")
+        self.buffer.add(self.regular_user.pk, "10.0.0.2", None)
+        deleted.delete()
+
+        self.buffer.flush()
+
+        self.assertEqual(
+            list(UserIP.objects.values_list("user_id", flat=True)),
+            [self.regular_user.pk],
+        )
+        self.assertFalse(UserDevice.objects.exists())
+
+    @override_settings(USER_TRACKING_FLUSH_INTERVAL=0)
+    def test_failed_flush_does_not_fail_request(self):
+        """
+        Test that an error writing a batch is logged instead of raised.
+        """
+        with patch.object(
+            UserIP.objects, "bulk_track", side_effect=DatabaseError("failed")
+        ):
+            with self.assertLogs(level="ERROR"):
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.buffer.add(self.regular_user.pk, "10.0.0.1", None)
+
+        self.assertEqual(len(self.buffer), 0)
@@ -1,7 +1,10 @@
+import importlib
 from io import BytesIO
+from types import ModuleType
 
 from PIL import Image
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 
 
 def create_mock_image():
@@ -17,3 +20,27 @@ def create_mock_image():
     return SimpleUploadedFile(
         name="test_image.jpg", content=image_file.read(), content_type="image/jpeg"
     )
+
+
+def load_migration(app_label: str, name: str) -> ModuleType:
+    """
+    Import a migration module, whose name can't be written in an import statement.
+    :param app_label: The label of the app, e.g. "main".
+    :param name: The name of the migration, e.g. "0004_comment_reports_count".
+    :return: The migration module.
+    """
+    return importlib.import_module(f"apps.{app_label}.migrations.{name}")
+
+
+def remove_constraints(model, *names):
+    """
+    Drop constraints of a model, to create the rows a data migration cleans up before
+    adding them. The test's transaction rolls the change back.
+    :param model: The model of the constraints.
+    :param names: The names of the constraints.
+    :return:
+    """
+    with connection.schema_editor() as editor:
+        for constraint in model._meta.constraints:
+            if constraint.name in names:
+                editor.remove_constraint(model, constraint)